@@ -1,10 +1,65 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import codecs
+import mmap
+import os
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from letter_frequencies import RUSSIAN_LETTER_FREQUENCIES, caesar_score_shifts, letter_histogram
+import live_mode
 
 # Определяем русский алфавит
 # Включает все буквы от 'А' до 'Я', включая 'Ё'
 alphabet = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
 
+# Кэш таблиц перевода для шифра Цезаря.
+# Ключ - алфавит, значение - список таблиц str.maketrans для всех сдвигов (индекс списка = сдвиг).
+caesar_tables_cache = {}
+
+def build_caesar_tables(alphabet):
+    """
+    Строит таблицы перевода str.maketrans для всех сдвигов алфавита.
+
+    Каждая таблица переводит заглавные буквы в заглавные, а строчные - в строчные,
+    поэтому регистр символов сохраняется. Символов вне алфавита в таблице нет,
+    и str.translate оставляет их без изменений.
+
+    :param alphabet: Алфавит (строка заглавных букв).
+    :return: Список таблиц перевода, где индекс - величина сдвига (от 0 до len(alphabet) - 1).
+    """
+    tables = []
+    for shift in range(len(alphabet)):
+        source_chars = ""
+        target_chars = ""
+        for index, letter in enumerate(alphabet):
+            new_letter = alphabet[(index + shift) % len(alphabet)]
+            source_chars += letter
+            target_chars += new_letter
+            # Строчная буква переводится в строчную букву со сдвигом
+            if letter.lower() != letter:
+                source_chars += letter.lower()
+                target_chars += new_letter.lower()
+        tables.append(str.maketrans(source_chars, target_chars))
+    return tables
+
+def get_caesar_table(shift_value, alphabet):
+    """
+    Возвращает таблицу перевода для заданного сдвига из кэша.
+    При первом обращении к алфавиту строятся таблицы сразу для всех сдвигов.
+
+    :param shift_value: Величина сдвига (целое число, может быть отрицательным).
+    :param alphabet: Алфавит (строка).
+    :return: Таблица перевода для str.translate.
+    """
+    tables = caesar_tables_cache.get(alphabet)
+    if tables is None:
+        tables = build_caesar_tables(alphabet)
+        caesar_tables_cache[alphabet] = tables
+    # Операция % приводит любой сдвиг (в том числе отрицательный) к диапазону 0 .. len(alphabet) - 1
+    return tables[shift_value % len(alphabet)]
+
 # Функция для шифрования строки с помощью шифра Цезаря
 def caesar_cipher(text, shift_value, alphabet):
     """
@@ -15,38 +70,9 @@ def caesar_cipher(text, shift_value, alphabet):
     :param alphabet: Алфавит, используемый для шифрования (строка).
     :return: Зашифрованный текст (строка).
     """
-    # Преобразуем входной текст в верхний регистр для поиска в алфавите
-    text_upper = text.upper()
-
-    # Инициализируем строку для хранения результата
-    result_text = ""
-
-    # Проходим по каждой букве в верхнем регистре текста
-    for i, char in enumerate(text_upper):
-        # Проверяем, находится ли символ в алфавите
-        if char in alphabet:
-            # Находим индекс символа в алфавите
-            old_index = alphabet.index(char)
-
-            # Вычисляем новый индекс с учетом сдвига
-            # Используем операцию % (остаток от деления), чтобы обеспечить цикличность
-            new_index = (old_index + shift_value) % len(alphabet)
-
-            # Находим букву в алфавите по новому индексу
-            new_char_upper = alphabet[new_index]
-
-            # Сохраняем исходный регистр символа из оригинального текста
-            original_char = text[i]  # Берем символ из оригинального текста
-            if original_char.islower():
-                result_text += new_char_upper.lower()  # Если был нижний, добавляем нижний
-            else:
-                result_text += new_char_upper  # Если был верхний, добавляем верхний
-        else:
-            # Если символ не является буквой алфавита, оставляем его без изменений, включая регистр
-            result_text += text[i]
-
-    # Возвращаем зашифрованный текст
-    return result_text
+    # Весь текст переводится одним вызовом str.translate по готовой таблице сдвига.
+    # Регистр букв сохраняется, символы вне алфавита остаются без изменений.
+    return text.translate(get_caesar_table(shift_value, alphabet))
 
 # Функция для дешифрования строки, зашифрованной шифром Цезаря
 def caesar_decipher(text, shift_value, alphabet):
@@ -58,38 +84,202 @@ def caesar_decipher(text, shift_value, alphabet):
     :param alphabet: Алфавит, использованный при шифровании (строка).
     :return: Дешифрованный текст (строка).
     """
-    # Преобразуем входной текст в верхний регистр для поиска в алфавите
-    text_upper = text.upper()
+    # Дешифрование - это сдвиг в обратную сторону (влево) по той же таблице перевода
+    return text.translate(get_caesar_table(-shift_value, alphabet))
 
-    # Инициализируем строку для хранения результата
-    result_text = ""
+def caesar_cipher_batch(text, shift_values, alphabet):
+    """
+    Шифрует один и тот же текст сразу под несколькими ключами (сдвигами).
+    Удобно для генерации тестовых векторов и перебора ключей.
 
-    # Проходим по каждой букве в зашифрованном тексте в верхнем регистре
-    for i, char in enumerate(text_upper):
-        # Проверяем, находится ли символ в алфавите
-        if char in alphabet:
-            # Находим индекс символа в алфавите
-            old_index = alphabet.index(char)
+    :param text: Исходный текст (строка).
+    :param shift_values: Последовательность сдвигов (например, range(len(alphabet)) - все ключи).
+    :param alphabet: Алфавит (строка).
+    :return: Список зашифрованных текстов в порядке сдвигов.
+    """
+    # Таблицы всех сдвигов строятся один раз; каждый ключ - один проход str.translate по тексту
+    return [text.translate(get_caesar_table(shift_value, alphabet)) for shift_value in shift_values]
 
-            # Вычисляем индекс в исходном алфавите (сдвигаем влево)
-            # Используем % len(alphabet), чтобы обеспечить цикличность
-            new_index = (old_index - shift_value) % len(alphabet)
+# Размер блока (в байтах) при потоковой обработке файлов
+FILE_CHUNK_SIZE = 1024 * 1024
 
-            # Находим букву в алфавите по вычисленному индексу
-            new_char_upper = alphabet[new_index]
+def read_file_chunks(file_path, chunk_size=FILE_CHUNK_SIZE, use_mmap=False):
+    """
+    Читает файл блоками фиксированного размера (генератор).
 
-            # Сохраняем исходный регистр символа из зашифрованного текста
-            original_char = text[i]  # Берем символ из оригинального зашифрованного текста
-            if original_char.islower():
-                result_text += new_char_upper.lower()  # Если был нижний, добавляем нижний
-            else:
-                result_text += new_char_upper  # Если был верхний, добавляем верхний
+    :param file_path: Путь к файлу (строка).
+    :param chunk_size: Размер блока в байтах (целое число).
+    :param use_mmap: Читать файл через отображение в память (mmap) вместо обычного чтения.
+    :return: Генератор блоков (bytes).
+    """
+    with open(file_path, "rb") as f:
+        if use_mmap:
+            # Пустой файл нельзя отобразить в память, читать из него нечего
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            # Размер блока выравниваем по границе страниц, чтобы прочитанные страницы можно было освобождать
+            granularity = mmap.ALLOCATIONGRANULARITY
+            chunk_size = (chunk_size + granularity - 1) // granularity * granularity
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, len(mapped), chunk_size):
+                    yield mapped[offset:offset + chunk_size]
+                    # Уже обработанные страницы больше не нужны - иначе они копятся в памяти процесса
+                    if hasattr(mmap, "MADV_DONTNEED"):
+                        mapped.madvise(mmap.MADV_DONTNEED, offset, min(chunk_size, len(mapped) - offset))
         else:
-            # Если символ не является буквой алфавита, оставляем его без изменений, включая регистр
-            result_text += text[i]
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+def caesar_stream(chunks, shift_value, alphabet):
+    """
+    Потоково применяет шифр Цезаря к последовательности блоков байтов в кодировке UTF-8 (генератор).
+
+    Блоки декодируются инкрементальным декодером, поэтому символ, байты которого
+    попали на границу двух блоков, декодируется корректно.
+    Для дешифрования достаточно передать отрицательный сдвиг.
+
+    :param chunks: Итерируемая последовательность блоков (bytes).
+    :param shift_value: Величина сдвига (целое число).
+    :param alphabet: Алфавит (строка).
+    :return: Генератор обработанных фрагментов текста (строки).
+    """
+    table = get_caesar_table(shift_value, alphabet)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text_part = decoder.decode(chunk)
+        if text_part:
+            yield text_part.translate(table)
+    # Проверяем, что файл не оборвался посреди многобайтового символа
+    text_part = decoder.decode(b"", final=True)
+    if text_part:
+        yield text_part.translate(table)
+
+def caesar_transform_file(input_path, output_path, shift_value, alphabet, chunk_size=FILE_CHUNK_SIZE, use_mmap=False):
+    """
+    Применяет шифр Цезаря к файлу в кодировке UTF-8 и записывает результат в другой файл.
+    Файл обрабатывается блоками, поэтому расход памяти не зависит от размера файла.
+
+    :param input_path: Путь к исходному файлу (строка).
+    :param output_path: Путь к файлу результата (строка).
+    :param shift_value: Величина сдвига (целое число; отрицательный сдвиг - дешифрование).
+    :param alphabet: Алфавит (строка).
+    :param chunk_size: Размер блока чтения в байтах (целое число).
+    :param use_mmap: Читать исходный файл через mmap.
+    :return: Количество прочитанных байтов (целое число).
+    """
+    bytes_read = 0
+
+    def counted_chunks():
+        nonlocal bytes_read
+        for chunk in read_file_chunks(input_path, chunk_size, use_mmap):
+            bytes_read += len(chunk)
+            yield chunk
+
+    with open(output_path, "wb") as out_file:
+        for text_part in caesar_stream(counted_chunks(), shift_value, alphabet):
+            out_file.write(text_part.encode("utf-8"))
+    return bytes_read
+
+def caesar_cipher_file(input_path, output_path, shift_value, alphabet, chunk_size=FILE_CHUNK_SIZE, use_mmap=False):
+    """
+    Шифрует файл шифром Цезаря (потоково, блоками).
+
+    :return: Количество обработанных байтов (целое число).
+    """
+    return caesar_transform_file(input_path, output_path, shift_value, alphabet, chunk_size, use_mmap)
+
+def caesar_decipher_file(input_path, output_path, shift_value, alphabet, chunk_size=FILE_CHUNK_SIZE, use_mmap=False):
+    """
+    Дешифрует файл, зашифрованный шифром Цезаря (потоково, блоками).
+
+    :return: Количество обработанных байтов (целое число).
+    """
+    return caesar_transform_file(input_path, output_path, -shift_value, alphabet, chunk_size, use_mmap)
+
+# --- Двоичный режим: шифр Цезаря над байтами по модулю 256 ---
+
+def caesar_bytes_table(shift_value):
+    """
+    Строит таблицу для bytes.translate: байт b переходит в (b + shift_value) mod 256.
+
+    :param shift_value: Величина сдвига (целое число, может быть отрицательным).
+    :return: Таблица перевода (bytes длиной 256).
+    """
+    return bytes((byte + shift_value) % 256 for byte in range(256))
+
+def caesar_cipher_bytes(data, shift_value):
+    """
+    Шифрует произвольные двоичные данные шифром Цезаря по модулю 256.
+
+    :param data: Исходные данные (bytes или bytearray).
+    :param shift_value: Величина сдвига (целое число).
+    :return: Зашифрованные данные (bytes).
+    """
+    return bytes(data).translate(caesar_bytes_table(shift_value))
+
+def caesar_decipher_bytes(data, shift_value):
+    """
+    Дешифрует двоичные данные, зашифрованные шифром Цезаря по модулю 256.
+
+    :param data: Зашифрованные данные (bytes или bytearray).
+    :param shift_value: Величина сдвига, использованная при шифровании (целое число).
+    :return: Дешифрованные данные (bytes).
+    """
+    return bytes(data).translate(caesar_bytes_table(-shift_value))
+
+def caesar_transform_bytes_file(input_path, output_path, shift_value, chunk_size=FILE_CHUNK_SIZE, use_mmap=False):
+    """
+    Применяет шифр Цезаря по модулю 256 к любому файлу, блоками и без декодирования.
+
+    :param input_path: Путь к исходному файлу (строка).
+    :param output_path: Путь к файлу результата (строка).
+    :param shift_value: Величина сдвига (целое число; отрицательный сдвиг - дешифрование).
+    :param chunk_size: Размер блока чтения в байтах (целое число).
+    :param use_mmap: Читать исходный файл через mmap.
+    :return: Количество обработанных байтов (целое число).
+    """
+    table = caesar_bytes_table(shift_value)
+    bytes_read = 0
+    with open(output_path, "wb") as out_file:
+        for chunk in read_file_chunks(input_path, chunk_size, use_mmap):
+            bytes_read += len(chunk)
+            out_file.write(chunk.translate(table))
+    return bytes_read
+
+def caesar_cipher_bytes_file(input_path, output_path, shift_value, chunk_size=FILE_CHUNK_SIZE, use_mmap=False):
+    """
+    Шифрует файл шифром Цезаря по модулю 256 (двоичный режим).
+
+    :return: Количество обработанных байтов (целое число).
+    """
+    return caesar_transform_bytes_file(input_path, output_path, shift_value, chunk_size, use_mmap)
+
+def caesar_decipher_bytes_file(input_path, output_path, shift_value, chunk_size=FILE_CHUNK_SIZE, use_mmap=False):
+    """
+    Дешифрует файл, зашифрованный шифром Цезаря по модулю 256 (двоичный режим).
+
+    :return: Количество обработанных байтов (целое число).
+    """
+    return caesar_transform_bytes_file(input_path, output_path, -shift_value, chunk_size, use_mmap)
+
+def caesar_break(text_parts, alphabet, frequencies=RUSSIAN_LETTER_FREQUENCIES):
+    """
+    Взлом шифра Цезаря по одному шифротексту (частотный анализ).
 
-    # Возвращаем дешифрованный текст
-    return result_text
+    :param text_parts: Шифротекст (строка) или последовательность его фрагментов.
+    :param alphabet: Алфавит (строка).
+    :param frequencies: Эталонные частоты букв (словарь буква -> частота).
+    :return: Кортеж из двух списков (сдвиг, хи-квадрат, логарифм правдоподобия):
+             первый упорядочен по возрастанию хи-квадрат, второй - по убыванию правдоподобия.
+    """
+    histogram = letter_histogram(text_parts, alphabet)
+    scores = caesar_score_shifts(histogram, alphabet, frequencies)
+    by_chi_squared = sorted(scores, key=lambda item: item[1])
+    by_log_likelihood = sorted(scores, key=lambda item: item[2], reverse=True)
+    return by_chi_squared, by_log_likelihood
 
 def encrypt_action():
     """Обработчик кнопки 'Зашифровать'."""
@@ -137,6 +327,100 @@ def decrypt_action():
     output_text.insert(tk.END, f"Дешифрованное сообщение: {decrypted}\n")
 
 
+def break_action():
+    """Обработчик кнопки 'Взломать (частотный анализ)'."""
+    text = input_text.get()
+    if not text:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите шифротекст для взлома.")
+        return
+
+    by_chi_squared, by_log_likelihood = caesar_break(text, alphabet)
+    best_shift = by_chi_squared[0][0]
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение: {text}\n")
+    output_text.insert(tk.END, "Наиболее вероятные сдвиги (по критерию хи-квадрат):\n")
+    for shift, chi_squared, log_likelihood in by_chi_squared[:5]:
+        output_text.insert(tk.END, f"  сдвиг {shift}: хи-квадрат = {chi_squared:.2f}, "
+                                   f"лог. правдоподобие = {log_likelihood:.2f}, "
+                                   f"текст: {caesar_decipher(text, shift, alphabet)}\n")
+    output_text.insert(tk.END, f"Лучший сдвиг по правдоподобию: {by_log_likelihood[0][0]}\n")
+    output_text.insert(tk.END, f"Дешифрованное сообщение: {caesar_decipher(text, best_shift, alphabet)}\n")
+
+def process_file_action(decrypt):
+    """Общая часть обработчиков кнопок 'Зашифровать файл...' и 'Дешифровать файл...'."""
+    try:
+        shift = int(shift_entry.get())
+    except ValueError:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Ключ должен быть целым числом.")
+        return
+
+    input_path = filedialog.askopenfilename(title="Выберите исходный файл")
+    if not input_path:
+        return
+    output_path = filedialog.asksaveasfilename(title="Сохранить результат как")
+    if not output_path:
+        return
+
+    binary_mode = binary_var.get()
+    try:
+        if binary_mode and decrypt:
+            processed = caesar_decipher_bytes_file(input_path, output_path, shift)
+        elif binary_mode:
+            processed = caesar_cipher_bytes_file(input_path, output_path, shift)
+        elif decrypt:
+            processed = caesar_decipher_file(input_path, output_path, shift, alphabet)
+        else:
+            processed = caesar_cipher_file(input_path, output_path, shift, alphabet)
+    except (OSError, UnicodeDecodeError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при обработке файла: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Исходный файл: {input_path}\n")
+    output_text.insert(tk.END, f"Файл результата: {output_path}\n")
+    output_text.insert(tk.END, f"Ключ (величина сдвига): {shift}\n")
+    output_text.insert(tk.END, f"Режим: {'дешифрование' if decrypt else 'шифрование'}"
+                               f"{' (двоичный, по модулю 256)' if binary_mode else ''}\n")
+    output_text.insert(tk.END, f"Обработано байтов: {processed}\n")
+
+def encrypt_file_action():
+    """Обработчик кнопки 'Зашифровать файл...'."""
+    process_file_action(decrypt=False)
+
+def decrypt_file_action():
+    """Обработчик кнопки 'Дешифровать файл...'."""
+    process_file_action(decrypt=True)
+
+# --- Живой режим: результат шифрования обновляется по мере ввода текста ---
+
+def caesar_live_patch(old_text, new_text, shift_value, alphabet):
+    """
+    Перешифровывает только изменённый участок текста. Шифр Цезаря заменяет каждый символ
+    независимо от позиции, поэтому участок результата совпадает с участком текста.
+
+    :return: Кортеж (начало, конец, замена) участка результата.
+    """
+    start, old_end, new_end = live_mode.changed_span(old_text, new_text)
+    return start, old_end, caesar_cipher(new_text[start:new_end], shift_value, alphabet)
+
+def live_update():
+    """Обновляет результат живого режима по текущему тексту и ключу."""
+    text = input_text.get()
+    try:
+        shift = int(shift_entry.get())
+    except ValueError:
+        live_mode.show_live_error(live_state, "Ошибка: Ключ должен быть целым числом.")
+        return
+
+    patch = None
+    if live_mode.live_patch_possible(live_state, text, shift):
+        patch = caesar_live_patch(live_state['text'], text, shift, alphabet)
+    live_mode.show_live_output(live_state, text, shift, patch, lambda: caesar_cipher(text, shift, alphabet))
+
 # --- Создание графического интерфейса ---
 root = tk.Tk()
 root.title("Шифр Цезаря (Шифрование и Дешифрование)")
@@ -148,14 +432,16 @@ root.geometry("600x400") # Устанавливаем начальный раз
 input_label = ttk.Label(root, text="Введите текст:")
 input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
 
-input_text = ttk.Entry(root, width=50)
+input_var = tk.StringVar()
+input_text = ttk.Entry(root, width=50, textvariable=input_var)
 input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
 
 # Ввод ключа
 shift_label = ttk.Label(root, text="Введите ключ (целое число):")
 shift_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
 
-shift_entry = ttk.Entry(root, width=20)
+shift_var = tk.StringVar()
+shift_entry = ttk.Entry(root, width=20, textvariable=shift_var)
 shift_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
 
 # Кнопки
@@ -165,6 +451,29 @@ encrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
 decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
 decrypt_button.grid(row=4, column=1, padx=10, pady=5, sticky="e")
 
+# Кнопки для потоковой обработки файлов
+file_buttons_frame = ttk.Frame(root)
+file_buttons_frame.grid(row=4, column=0, padx=10, pady=5, sticky="w")
+
+encrypt_file_button = ttk.Button(file_buttons_frame, text="Зашифровать файл...", command=encrypt_file_action)
+encrypt_file_button.pack(side=tk.LEFT, padx=(0, 5))
+
+decrypt_file_button = ttk.Button(file_buttons_frame, text="Дешифровать файл...", command=decrypt_file_action)
+decrypt_file_button.pack(side=tk.LEFT)
+
+break_button = ttk.Button(file_buttons_frame, text="Взломать (частотный анализ)", command=break_action)
+break_button.pack(side=tk.LEFT, padx=(5, 0))
+
+# Флажок двоичного режима для файлов (сдвиг байтов по модулю 256 вместо букв алфавита)
+binary_var = tk.BooleanVar()
+binary_check = ttk.Checkbutton(file_buttons_frame, text="Файл как двоичные данные (mod 256)", variable=binary_var)
+binary_check.pack(side=tk.LEFT, padx=(5, 0))
+
+# Флажок живого режима: при изменении текста или ключа результат обновляется с задержкой
+live_var = tk.BooleanVar()
+live_check = ttk.Checkbutton(file_buttons_frame, text="Шифровать при вводе", variable=live_var, command=lambda: live_mode.live_mode_action(live_state))
+live_check.pack(side=tk.LEFT, padx=(5, 0))
+
 # Вывод результата
 output_label = ttk.Label(root, text="Результат:")
 output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
@@ -172,6 +481,10 @@ output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
 output_text = scrolledtext.ScrolledText(root, width=70, height=15)
 output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
 
+# Состояние живого режима (см. live_mode.py) и подписка на изменения полей ввода
+live_state = live_mode.create_live_state(root, output_text, live_var, live_update)
+live_mode.watch_variables(live_state, input_var, shift_var)
+
 # --- Настройка сетки ---
 root.grid_rowconfigure(6, weight=1) # Ряд с выводом растягивается
 root.grid_columnconfigure(0, weight=1) # Колонка с вводом растягивается
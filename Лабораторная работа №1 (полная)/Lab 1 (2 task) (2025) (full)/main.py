@@ -1,5 +1,18 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, filedialog
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import multiprocessing
+import os
+import random
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import background_task
+import live_mode
+from ngram_model import NGRAM_SIZE, RUSSIAN_SAMPLE_TEXT, build_ngram_model, build_ngram_table, score_indices, text_to_indices
 
 # Определяем русский алфавит
 alphabet = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
@@ -28,6 +41,75 @@ def generate_cipher_alphabet(keyword, original_alphabet):
 
     return cipher_alphabet
 
+def build_substitution_table(source_alphabet, target_alphabet):
+    """
+    Строит таблицу str.maketrans, переводящую буквы одного алфавита в буквы другого
+    с сохранением регистра. Символы вне алфавита в таблицу не попадают.
+
+    :param source_alphabet: Алфавит, буквы которого заменяются (строка заглавных букв).
+    :param target_alphabet: Алфавит замены той же длины (строка заглавных букв).
+    :return: Таблица перевода для str.translate.
+    """
+    source_chars = ""
+    target_chars = ""
+    for source_char, target_char in zip(source_alphabet, target_alphabet):
+        source_chars += source_char
+        target_chars += target_char
+        if source_char.lower() != source_char:
+            source_chars += source_char.lower()
+            target_chars += target_char.lower()
+    return str.maketrans(source_chars, target_chars)
+
+# Максимальное число скомпилированных ключей в кэше (вытесняются давно не использованные):
+# в живом режиме ключ компилируется при каждом изменении поля ключа
+SLOGAN_CACHE_SIZE = 64
+
+# Кэш скомпилированных ключей: (лозунг, алфавит) -> ключ (см. compile_slogan_key)
+slogan_keys_cache = OrderedDict()
+
+def lru_get(cache, key):
+    """
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении SLOGAN_CACHE_SIZE.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > SLOGAN_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def compile_slogan_key(keyword, original_alphabet):
+    """
+    Компилирует ключ лозунгового шифра: алфавит замены и прямую и обратную таблицы
+    str.translate (для заглавных и строчных букв). Ключ строится один раз на лозунг
+    и берётся из кэша при повторных вызовах.
+
+    :param keyword: Ключевое слово (лозунг) (строка).
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :return: Словарь с полями 'keyword', 'original_alphabet', 'cipher_alphabet',
+             'encrypt_table' и 'decrypt_table'.
+    """
+    cache_key = (keyword, original_alphabet)
+    slogan_key = lru_get(slogan_keys_cache, cache_key)
+    if slogan_key is None:
+        cipher_alphabet = generate_cipher_alphabet(keyword, original_alphabet)
+        slogan_key = {
+            'keyword': keyword,
+            'original_alphabet': original_alphabet,
+            'cipher_alphabet': cipher_alphabet,
+            'encrypt_table': build_substitution_table(original_alphabet, cipher_alphabet),
+            'decrypt_table': build_substitution_table(cipher_alphabet, original_alphabet),
+        }
+        lru_put(slogan_keys_cache, cache_key, slogan_key)
+    return slogan_key
+
 def slogan_cipher(text, keyword, original_alphabet):
     """
     Шифрует текст с помощью лозунгового шифра.
@@ -37,23 +119,9 @@ def slogan_cipher(text, keyword, original_alphabet):
     :param original_alphabet: Оригинальный алфавит (строка).
     :return: Зашифрованный текст (строка).
     """
-    cipher_alphabet = generate_cipher_alphabet(keyword, original_alphabet)
-    text_upper = text.upper()
-    encrypted_text = ""
-
-    for i, char in enumerate(text_upper):
-        if char in original_alphabet:
-            index_in_original = original_alphabet.index(char)
-            encrypted_char_upper = cipher_alphabet[index_in_original]
-            original_char = text[i]
-            if original_char.islower():
-                encrypted_text += encrypted_char_upper.lower()
-            else:
-                encrypted_text += encrypted_char_upper
-        else:
-            encrypted_text += text[i]
-
-    return encrypted_text
+    # Весь текст переводится одним вызовом str.translate по таблице скомпилированного ключа.
+    # Регистр сохраняется, символы вне алфавита остаются без изменений.
+    return text.translate(compile_slogan_key(keyword, original_alphabet)['encrypt_table'])
 
 def slogan_decipher(text, keyword, original_alphabet):
     """
@@ -64,31 +132,347 @@ def slogan_decipher(text, keyword, original_alphabet):
     :param original_alphabet: Оригинальный алфавит (строка).
     :return: Дешифрованный текст (строка).
     """
-    cipher_alphabet = generate_cipher_alphabet(keyword, original_alphabet)
-    text_upper = text.upper()
-    decrypted_text = ""
-
-    for i, char in enumerate(text_upper):
-        if char in original_alphabet: # Проверяем, есть ли символ в ОРИГИНАЛЬНОМ алфавите (для корректной обработки неалфавитных символов)
-            # Находим индекс символа шифротекста в АЛФАВИТЕ ЗАМЕНЫ
-            if char in cipher_alphabet: # Убедимся, что символ есть в cipher_alphabet
-                 index_in_cipher = cipher_alphabet.index(char)
-                 # Находим соответствующий символ в ОРИГИНАЛЬНОМ алфавите
-                 decrypted_char_upper = original_alphabet[index_in_cipher]
-                 # Сохраняем регистр
-                 original_char = text[i]
-                 if original_char.islower():
-                     decrypted_text += decrypted_char_upper.lower()
-                 else:
-                     decrypted_text += decrypted_char_upper
-            else:
-                 # Если символ шифротекста не найден в алфавите замены (хотя по логике должен быть, если он зашифрован правильно)
-                 # оставляем его как есть (вдруг это не буква, хотя проверка выше это учитывает)
-                 decrypted_text += text[i] # Это на всякий случай, если логика нарушена
+    # Обратная таблица переводит букву алфавита замены в букву оригинального алфавита
+    return text.translate(compile_slogan_key(keyword, original_alphabet)['decrypt_table'])
+
+def slogan_key_matrix(keywords, original_alphabet):
+    """
+    Строит матрицу ключей: по одной строке (алфавиту замены) на каждый лозунг.
+
+    :param keywords: Последовательность ключевых слов (лозунгов).
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :return: Список алфавитов замены (строки длины len(original_alphabet)).
+    """
+    return [generate_cipher_alphabet(keyword, original_alphabet) for keyword in keywords]
+
+def slogan_cipher_batch(text, keywords, original_alphabet):
+    """
+    Шифрует один и тот же текст сразу под множеством лозунгов.
+
+    :param text: Исходный текст (строка).
+    :param keywords: Последовательность ключевых слов (лозунгов).
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :return: Список зашифрованных текстов в порядке ключевых слов.
+    """
+    # Разные лозунги могут давать один и тот же алфавит замены (например, "ШИФР" и "шифр"),
+    # таблица перевода для такого алфавита строится только один раз
+    tables = {}
+    encrypted_texts = []
+    for cipher_alphabet in slogan_key_matrix(keywords, original_alphabet):
+        table = tables.get(cipher_alphabet)
+        if table is None:
+            table = build_substitution_table(original_alphabet, cipher_alphabet)
+            tables[cipher_alphabet] = table
+        encrypted_texts.append(text.translate(table))
+    return encrypted_texts
+
+# --- Криптоанализ: подбор ключа лозунгового шифра восхождением на холм ---
+
+# Состояние процесса-исполнителя (заполняется в init_slogan_solver_worker)
+solver_worker_state = {}
+
+def init_slogan_solver_worker(model, original_alphabet, shared_best_score, shared_best_key):
+    """
+    Инициализирует процесс-исполнитель: таблица квадграмм строится один раз на процесс,
+    а общий результат (лучшая оценка и лучший ключ) разделяется между всеми процессами.
+    """
+    solver_worker_state['table'] = build_ngram_table(model, original_alphabet)
+    solver_worker_state['alphabet'] = original_alphabet
+    solver_worker_state['best_score'] = shared_best_score
+    solver_worker_state['best_key'] = shared_best_key
+
+def publish_best_key(score, decrypt_key):
+    """
+    Записывает ключ в общий результат, если он лучше найденного другими процессами.
+    """
+    shared_best_score = solver_worker_state.get('best_score')
+    if shared_best_score is None:
+        return
+    with shared_best_score.get_lock():
+        if score > shared_best_score.value:
+            shared_best_score.value = score
+            solver_worker_state['best_key'][:] = decrypt_key
+
+def slogan_hill_climb(cipher_indices, restarts, seed):
+    """
+    Подбирает ключ восхождением на холм со случайными перезапусками.
+
+    Ключ - перестановка алфавита decrypt_key, где decrypt_key[c] - буква открытого текста
+    для буквы шифротекста c. Шаг - обмен двух букв ключа. При обмене меняются только
+    позиции текста, где стоят эти две буквы шифротекста, поэтому пересчитываются
+    лишь квадграммы, которые их накрывают.
+
+    :param cipher_indices: Шифротекст в виде индексов букв.
+    :param restarts: Количество перезапусков (целое число).
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Кортеж (лучшая оценка, лучший ключ decrypt_key).
+    """
+    table = solver_worker_state['table']
+    alphabet_size = len(solver_worker_state['alphabet'])
+    w1, w2, w3 = alphabet_size ** 3, alphabet_size ** 2, alphabet_size
+    text_length = len(cipher_indices)
+    rng = random.Random(seed)
+
+    # Для каждой буквы шифротекста - начала квадграмм, в которые она входит
+    windows_by_letter = [set() for _ in range(alphabet_size)]
+    positions_by_letter = [[] for _ in range(alphabet_size)]
+    for position, letter in enumerate(cipher_indices):
+        positions_by_letter[letter].append(position)
+        for start in range(max(0, position - 3), min(position, text_length - 4) + 1):
+            windows_by_letter[letter].add(start)
+
+    # Начальный ключ: буквы шифротекста по убыванию частоты сопоставляются
+    # буквам по убыванию частоты в эталонной модели (для первого перезапуска)
+    cipher_order = sorted(range(alphabet_size), key=lambda letter: -len(positions_by_letter[letter]))
+    plain_order = [solver_worker_state['alphabet'].index(letter) for letter in FREQUENCY_ORDER
+                   if letter in solver_worker_state['alphabet']]
+    plain_order += [index for index in range(alphabet_size) if index not in plain_order]
+
+    best_score = float('-inf')
+    best_key = None
+    for restart in range(restarts):
+        decrypt_key = [0] * alphabet_size
+        if restart == 0:
+            for cipher_letter, plain_letter in zip(cipher_order, plain_order):
+                decrypt_key[cipher_letter] = plain_letter
         else:
-            decrypted_text += text[i]
+            decrypt_key = list(range(alphabet_size))
+            rng.shuffle(decrypt_key)
+
+        plain = [decrypt_key[letter] for letter in cipher_indices]
+        score = score_indices(plain, table, alphabet_size)
+
+        improved = True
+        while improved:
+            improved = False
+            for a in range(alphabet_size):
+                for b in range(a + 1, alphabet_size):
+                    windows = windows_by_letter[a] | windows_by_letter[b]
+                    if not windows:
+                        # Обе буквы не встречаются в шифротексте - обмен ничего не меняет
+                        continue
+                    old_part = 0.0
+                    for i in windows:
+                        old_part += table[plain[i] * w1 + plain[i + 1] * w2 + plain[i + 2] * w3 + plain[i + 3]]
+                    key_a, key_b = decrypt_key[a], decrypt_key[b]
+                    for position in positions_by_letter[a]:
+                        plain[position] = key_b
+                    for position in positions_by_letter[b]:
+                        plain[position] = key_a
+                    new_part = 0.0
+                    for i in windows:
+                        new_part += table[plain[i] * w1 + plain[i + 1] * w2 + plain[i + 2] * w3 + plain[i + 3]]
+                    if new_part > old_part:
+                        decrypt_key[a], decrypt_key[b] = key_b, key_a
+                        score += new_part - old_part
+                        improved = True
+                    else:
+                        # Обмен не улучшил оценку - возвращаем буквы на место
+                        for position in positions_by_letter[a]:
+                            plain[position] = key_a
+                        for position in positions_by_letter[b]:
+                            plain[position] = key_b
+
+        if score > best_score:
+            best_score = score
+            best_key = decrypt_key[:]
+            publish_best_key(best_score, best_key)
+
+    return best_score, best_key
+
+# Буквы русского алфавита по убыванию частоты (для начального приближения ключа)
+FREQUENCY_ORDER = "ОЕАИНТСРВЛКМДПУЯЫЬГЗБЧЙХЖШЮЦЩЭФЪЁ"
+
+def decrypt_key_to_cipher_alphabet(decrypt_key, original_alphabet):
+    """
+    Переводит найденный ключ (буква шифротекста -> буква открытого текста)
+    в алфавит замены лозунгового шифра (буква открытого текста -> буква шифротекста).
+    """
+    cipher_alphabet = [''] * len(original_alphabet)
+    for cipher_letter, plain_letter in enumerate(decrypt_key):
+        cipher_alphabet[plain_letter] = original_alphabet[cipher_letter]
+    return "".join(cipher_alphabet)
+
+def guess_keyword_letters(cipher_alphabet, original_alphabet):
+    """
+    Выделяет буквы лозунга из алфавита замены: после букв лозунга
+    остальные буквы алфавита идут в исходном порядке.
+
+    :param cipher_alphabet: Алфавит замены (строка).
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :return: Вероятные буквы лозунга (строка, без повторов).
+    """
+    start = len(cipher_alphabet)
+    while start > 0 and (start == len(cipher_alphabet) or
+                         original_alphabet.index(cipher_alphabet[start - 1]) < original_alphabet.index(cipher_alphabet[start])):
+        start -= 1
+    return cipher_alphabet[:start]
+
+def slogan_solve(ciphertext, original_alphabet, model=None, workers=None, restarts_per_worker=8, seed=None):
+    """
+    Восстанавливает алфавит замены лозунгового шифра только по шифротексту.
+
+    Перезапуски восхождения на холм распределяются по процессам ProcessPoolExecutor;
+    каждый процесс записывает свой лучший ключ в общий результат.
+
+    :param ciphertext: Шифротекст (строка).
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :param model: Модель квадграмм; по умолчанию строится по RUSSIAN_SAMPLE_TEXT.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param restarts_per_worker: Количество перезапусков в каждом процессе.
+    :param seed: Начальное значение генератора случайных чисел (для воспроизводимости).
+    :return: Кортеж (алфавит замены, дешифрованный текст, оценка).
+    """
+    cipher_indices = text_to_indices(ciphertext, original_alphabet)
+    if len(cipher_indices) < NGRAM_SIZE:
+        raise ValueError("Шифротекст слишком короткий для анализа.")
+    if model is None:
+        model = build_ngram_model(RUSSIAN_SAMPLE_TEXT, original_alphabet)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    shared_best_score = multiprocessing.Value('d', float('-inf'))
+    shared_best_key = multiprocessing.Array('i', len(original_alphabet))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_slogan_solver_worker,
+                             initargs=(model, original_alphabet, shared_best_score, shared_best_key)) as executor:
+        futures = [executor.submit(slogan_hill_climb, cipher_indices, restarts_per_worker, seed + worker)
+                   for worker in range(workers)]
+        for future in futures:
+            future.result()
+
+    decrypt_key = list(shared_best_key)
+    cipher_alphabet = decrypt_key_to_cipher_alphabet(decrypt_key, original_alphabet)
+    decrypted = ciphertext.translate(build_substitution_table(cipher_alphabet, original_alphabet))
+    return cipher_alphabet, decrypted, shared_best_score.value
+
+# --- Криптоанализ: атака по словарю лозунгов ---
+
+# Сколько первых букв шифротекста используется для быстрой отсеивающей оценки кандидатов
+DICTIONARY_SAMPLE_LETTERS = 120
+
+def reduce_keyword(keyword, original_alphabet):
+    """
+    Оставляет в лозунге только первые вхождения букв алфавита (в верхнем регистре).
+    Лозунги с одинаковым результатом дают один и тот же алфавит замены.
+    """
+    unique_letters = ""
+    for char in keyword.upper():
+        if char in original_alphabet and char not in unique_letters:
+            unique_letters += char
+    return unique_letters
+
+def load_wordlist(file_path):
+    """
+    Читает словарь лозунгов: одно слово на строку, пустые строки пропускаются.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def build_keyword_trie(keywords, original_alphabet):
+    """
+    Строит префиксное дерево лозунгов. Узел - словарь {'children': {буква: узел}, 'words': [...]}.
+    Путь от корня до узла - уникальные буквы лозунга, поэтому лозунги с общим началом
+    проходят по общим узлам.
+    """
+    root = {'children': {}, 'words': []}
+    for keyword in keywords:
+        node = root
+        for letter in reduce_keyword(keyword, original_alphabet):
+            node = node['children'].setdefault(letter, {'children': {}, 'words': []})
+        node['words'].append(keyword)
+    return root
+
+def slogan_dictionary_worker(keywords, cipher_indices, top_count):
+    """
+    Обходит префиксное дерево части словаря и оценивает каждый алфавит замены
+    квадграммной моделью по первым буквам шифротекста.
+
+    Алфавит замены строится по мере спуска по дереву: префикс из букв лозунга
+    и множество уже использованных букв общие для всех слов поддерева.
+
+    :return: Список лучших кандидатов (оценка, алфавит замены, лозунги).
+    """
+    original_alphabet = solver_worker_state['alphabet']
+    table = solver_worker_state['table']
+    alphabet_size = len(original_alphabet)
+    index_of = {letter: index for index, letter in enumerate(original_alphabet)}
+    best = []
+    counter = 0
+
+    # Обход в глубину без рекурсии: (узел, префикс алфавита замены, множество букв префикса)
+    stack = [(build_keyword_trie(keywords, original_alphabet), "", frozenset())]
+    while stack:
+        node, prefix, seen = stack.pop()
+        if node['words']:
+            cipher_alphabet = prefix + "".join(letter for letter in original_alphabet if letter not in seen)
+            decrypt_key = [0] * alphabet_size
+            for plain_index, cipher_letter in enumerate(cipher_alphabet):
+                decrypt_key[index_of[cipher_letter]] = plain_index
+            score = score_indices([decrypt_key[letter] for letter in cipher_indices], table, alphabet_size)
+            counter += 1
+            item = (score, counter, cipher_alphabet, node['words'])
+            if len(best) < top_count:
+                heapq.heappush(best, item)
+            elif score > best[0][0]:
+                heapq.heapreplace(best, item)
+        for letter, child in node['children'].items():
+            stack.append((child, prefix + letter, seen | {letter}))
+
+    return [(score, cipher_alphabet, words) for score, _, cipher_alphabet, words in best]
+
+def slogan_dictionary_attack(ciphertext, keywords, original_alphabet, model=None, workers=None, top_count=10):
+    """
+    Атака по словарю на лозунговый шифр.
 
-    return decrypted_text
+    Словарь делится по первой букве лозунга на части, каждая часть обходится
+    как отдельное префиксное дерево в своём процессе. Кандидаты сначала оцениваются
+    по первым DICTIONARY_SAMPLE_LETTERS буквам, лучшие из них - по всему шифротексту.
+
+    :param ciphertext: Шифротекст (строка).
+    :param keywords: Последовательность лозунгов-кандидатов.
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :param model: Модель квадграмм; по умолчанию строится по RUSSIAN_SAMPLE_TEXT.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param top_count: Сколько лучших кандидатов вернуть.
+    :return: Список кортежей (оценка, алфавит замены, лозунги) по убыванию оценки.
+    """
+    cipher_indices = text_to_indices(ciphertext, original_alphabet)
+    if len(cipher_indices) < NGRAM_SIZE:
+        raise ValueError("Шифротекст слишком короткий для анализа.")
+    if model is None:
+        model = build_ngram_model(RUSSIAN_SAMPLE_TEXT, original_alphabet)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Части словаря по первой уникальной букве лозунга, распределённые по процессам
+    groups = {}
+    for keyword in keywords:
+        groups.setdefault(reduce_keyword(keyword, original_alphabet)[:1], []).append(keyword)
+    parts = [[] for _ in range(workers)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(parts, key=len).extend(group)
+
+    sample = cipher_indices[:DICTIONARY_SAMPLE_LETTERS]
+    candidates = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_slogan_solver_worker,
+                             initargs=(model, original_alphabet, None, None)) as executor:
+        futures = [executor.submit(slogan_dictionary_worker, part, sample, top_count) for part in parts if part]
+        for future in futures:
+            candidates.extend(future.result())
+
+    # Итоговая оценка лучших кандидатов по всему шифротексту
+    table = build_ngram_table(model, original_alphabet)
+    results = []
+    for _, cipher_alphabet, words in candidates:
+        decrypt_key = [0] * len(original_alphabet)
+        for plain_index, cipher_letter in enumerate(cipher_alphabet):
+            decrypt_key[original_alphabet.index(cipher_letter)] = plain_index
+        score = score_indices([decrypt_key[letter] for letter in cipher_indices], table, len(original_alphabet))
+        results.append((score, cipher_alphabet, words))
+    results.sort(key=lambda item: item[0], reverse=True)
+    return results[:top_count]
 
 def encrypt_action():
     text = input_text.get()
@@ -103,14 +487,14 @@ def encrypt_action():
         output_text.insert(tk.END, "Ошибка: Введите ключевое слово (лозунг).\n")
         return
 
-    cipher_alphabet_used = generate_cipher_alphabet(keyword, alphabet)
+    slogan_key = compile_slogan_key(keyword, alphabet)
     encrypted = slogan_cipher(text, keyword, alphabet)
 
     output_text.delete(1.0, tk.END)
     output_text.insert(tk.END, f"Исходное сообщение: {text}\n")
     output_text.insert(tk.END, f"Ключ (лозунг): {keyword}\n")
     output_text.insert(tk.END, f"Оригинальный алфавит: {alphabet}\n")
-    output_text.insert(tk.END, f"Алфавит замены (таблица шифрозамен): {cipher_alphabet_used}\n")
+    output_text.insert(tk.END, f"Алфавит замены (таблица шифрозамен): {slogan_key['cipher_alphabet']}\n")
     output_text.insert(tk.END, f"Зашифрованное сообщение: {encrypted}\n")
 
 def decrypt_action():
@@ -126,54 +510,161 @@ def decrypt_action():
         output_text.insert(tk.END, "Ошибка: Введите ключевое слово (лозунг), использованное при шифровании.\n")
         return
 
-    cipher_alphabet_used = generate_cipher_alphabet(keyword, alphabet)
+    slogan_key = compile_slogan_key(keyword, alphabet)
     decrypted = slogan_decipher(text, keyword, alphabet)
 
     output_text.delete(1.0, tk.END)
     output_text.insert(tk.END, f"Зашифрованное сообщение: {text}\n")
     output_text.insert(tk.END, f"Ключ (лозунг): {keyword}\n")
     output_text.insert(tk.END, f"Оригинальный алфавит: {alphabet}\n")
-    output_text.insert(tk.END, f"Алфавит замены (таблица шифрозамен): {cipher_alphabet_used}\n")
+    output_text.insert(tk.END, f"Алфавит замены (таблица шифрозамен): {slogan_key['cipher_alphabet']}\n")
     output_text.insert(tk.END, f"Дешифрованное сообщение: {decrypted}\n")
 
+def break_action():
+    ciphertext = input_text.get()
+
+    if not ciphertext:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите шифротекст для подбора ключа.\n")
+        return
+
+    # Подбор ключа запускает процессы и идёт секунды, поэтому выполняется в фоновом потоке
+    background_task.run_in_background(background_state, lambda: slogan_solve(ciphertext, alphabet),
+                                      lambda result: show_break_result(ciphertext, *result),
+                                      "Идёт подбор ключа", "при подборе ключа")
+
+def show_break_result(ciphertext, cipher_alphabet, decrypted, score):
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение: {ciphertext}\n")
+    output_text.insert(tk.END, f"Оригинальный алфавит: {alphabet}\n")
+    output_text.insert(tk.END, f"Найденный алфавит замены: {cipher_alphabet}\n")
+    output_text.insert(tk.END, f"Вероятные буквы лозунга: {guess_keyword_letters(cipher_alphabet, alphabet)}\n")
+    output_text.insert(tk.END, f"Оценка (сумма log10 вероятностей квадграмм): {score:.2f}\n")
+    output_text.insert(tk.END, f"Дешифрованное сообщение: {decrypted}\n")
+    output_text.insert(tk.END, "Примечание: редкие буквы на коротких текстах могут быть определены неверно.\n")
+
+def dictionary_attack_action():
+    ciphertext = input_text.get()
+
+    if not ciphertext:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите шифротекст для атаки по словарю.\n")
+        return
+
+    wordlist_path = filedialog.askopenfilename(title="Выберите словарь лозунгов (одно слово на строку)")
+    if not wordlist_path:
+        return
+
+    try:
+        keywords = load_wordlist(wordlist_path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при атаке по словарю: {e}\n")
+        return
+
+    # Атака запускает процессы и на большом словаре идёт долго, поэтому выполняется в фоновом потоке
+    background_task.run_in_background(background_state, lambda: slogan_dictionary_attack(ciphertext, keywords, alphabet),
+                                      lambda results: show_dictionary_result(ciphertext, keywords, results),
+                                      "Идёт атака по словарю", "при атаке по словарю")
+
+def show_dictionary_result(ciphertext, keywords, results):
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение: {ciphertext}\n")
+    output_text.insert(tk.END, f"Проверено лозунгов: {len(keywords)}\n")
+    output_text.insert(tk.END, "Лучшие кандидаты:\n")
+    for score, cipher_alphabet, words in results:
+        output_text.insert(tk.END, f"  {', '.join(words[:5])}: оценка {score:.2f}, алфавит замены {cipher_alphabet}\n")
+    if results:
+        best_keyword = results[0][2][0]
+        output_text.insert(tk.END, f"Дешифрованное сообщение (лозунг '{best_keyword}'): "
+                                   f"{slogan_decipher(ciphertext, best_keyword, alphabet)}\n")
+
+# --- Живой режим: результат шифрования обновляется по мере ввода текста ---
+
+def slogan_live_patch(old_text, new_text, keyword, original_alphabet):
+    """
+    Перешифровывает только изменённый участок текста. Лозунговый шифр заменяет каждый символ
+    независимо от позиции, поэтому участок результата совпадает с участком текста.
+
+    :return: Кортеж (начало, конец, замена) участка результата.
+    """
+    start, old_end, new_end = live_mode.changed_span(old_text, new_text)
+    return start, old_end, slogan_cipher(new_text[start:new_end], keyword, original_alphabet)
+
+def live_update():
+    """Обновляет результат живого режима по текущему тексту и лозунгу."""
+    text = input_text.get()
+    keyword = keyword_entry.get()
+    if not keyword:
+        live_mode.show_live_error(live_state, "Ошибка: Введите ключевое слово (лозунг).\n")
+        return
+
+    patch = None
+    if live_mode.live_patch_possible(live_state, text, keyword):
+        patch = slogan_live_patch(live_state['text'], text, keyword, alphabet)
+    live_mode.show_live_output(live_state, text, keyword, patch, lambda: slogan_cipher(text, keyword, alphabet))
+
 # --- Создание графического интерфейса ---
-root = tk.Tk()
-root.title("Лозунговый Шифр (Шифрование и Дешифрование)")
-root.geometry("700x500")
+# Окно создаётся только при запуске файла как программы: процессы-исполнители
+# ProcessPoolExecutor импортируют этот модуль повторно и не должны открывать своё окно.
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Лозунговый Шифр (Шифрование и Дешифрование)")
+    root.geometry("700x500")
+
+    # --- Виджеты ---
+
+    # Ввод текста
+    input_label = ttk.Label(root, text="Введите текст:")
+    input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+    input_var = tk.StringVar()
+    input_text = ttk.Entry(root, width=60, textvariable=input_var)
+    input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+
+    # Ввод ключа (лозунга)
+    keyword_label = ttk.Label(root, text="Введите ключевое слово (лозунг):")
+    keyword_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+
+    keyword_var = tk.StringVar()
+    keyword_entry = ttk.Entry(root, width=30, textvariable=keyword_var)
+    keyword_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
 
-# --- Виджеты ---
+    # Флажок живого режима: при изменении текста или лозунга результат обновляется с задержкой
+    live_var = tk.BooleanVar()
+    live_check = ttk.Checkbutton(root, text="Шифровать при вводе", variable=live_var, command=lambda: live_mode.live_mode_action(live_state))
+    live_check.grid(row=2, column=1, padx=10, pady=5, sticky="e")
 
-# Ввод текста
-input_label = ttk.Label(root, text="Введите текст:")
-input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+    # Кнопки
+    encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
+    encrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
 
-input_text = ttk.Entry(root, width=60)
-input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
+    decrypt_button.grid(row=4, column=1, padx=10, pady=5, sticky="e")
 
-# Ввод ключа (лозунга)
-keyword_label = ttk.Label(root, text="Введите ключевое слово (лозунг):")
-keyword_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+    break_button = ttk.Button(root, text="Подобрать ключ (криптоанализ)", command=break_action)
+    break_button.grid(row=4, column=0, padx=10, pady=5, sticky="w")
 
-keyword_entry = ttk.Entry(root, width=30)
-keyword_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+    dictionary_button = ttk.Button(root, text="Атака по словарю...", command=dictionary_attack_action)
+    dictionary_button.grid(row=5, column=1, padx=10, pady=5, sticky="e")
 
-# Кнопки
-encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
-encrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
+    # Вывод результата
+    output_label = ttk.Label(root, text="Результат:")
+    output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
 
-decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
-decrypt_button.grid(row=4, column=1, padx=10, pady=5, sticky="e")
+    output_text = scrolledtext.ScrolledText(root, width=80, height=20)
+    output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
 
-# Вывод результата
-output_label = ttk.Label(root, text="Результат:")
-output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+    # Состояние фоновых операций (см. background_task.py): пока идёт подбор или атака, их кнопки отключены
+    background_state = background_task.create_task_state(root, output_text, [break_button, dictionary_button])
 
-output_text = scrolledtext.ScrolledText(root, width=80, height=20)
-output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+    # Состояние живого режима (см. live_mode.py) и подписка на изменения полей ввода
+    live_state = live_mode.create_live_state(root, output_text, live_var, live_update)
+    live_mode.watch_variables(live_state, input_var, keyword_var)
 
-# --- Настройка сетки ---
-root.grid_rowconfigure(6, weight=1)
-root.grid_columnconfigure(0, weight=1)
+    # --- Настройка сетки ---
+    root.grid_rowconfigure(6, weight=1)
+    root.grid_columnconfigure(0, weight=1)
 
-# Запуск главного цикла
-root.mainloop()
+    # Запуск главного цикла
+    root.mainloop()
@@ -1,5 +1,14 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, filedialog
+from collections import OrderedDict
+from itertools import repeat
+import os
+import struct
+import sys
+
+# Общий код живого режима (live_mode.py) лежит в папке лабораторной работы, на уровень выше задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import live_mode
 
 # --- Параметры полибианского квадрата ---
 square_size = 6 # 6x6 квадрат
@@ -19,66 +28,394 @@ for i in range(square_size):
             row.append('') # Заглушка, не должна использоваться при длине 36
     polybius_square.append(row)
 
+# Объединяемые буквы: 'Ё' шифруется как 'Е', 'Й' - как 'И'
+FOLDED_LETTERS = {'Ё': 'Е', 'Й': 'И'}
+
+# Алфавиты квадратов по размеру и правила объединения букв по умолчанию
+SQUARE_ALPHABETS = {
+    5: "ABCDEFGHIKLMNOPQRSTUVWXYZ", # Латиница, 'J' объединяется с 'I'
+    6: alphabet_for_square_6x6,
+    7: "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ0123456789 .,-!?", # 33 + 10 + 6 = 49 символов
+}
+DEFAULT_FOLDING = {5: {'J': 'I'}, 6: FOLDED_LETTERS, 7: {}}
+
+# Известные алфавиты квадратов (номер записывается в заголовок упакованного файла)
+POLYBIUS_ALPHABETS = {1: SQUARE_ALPHABETS[6], 2: SQUARE_ALPHABETS[5], 3: SQUARE_ALPHABETS[7]}
+
+# Максимальное число скомпилированных квадратов в кэше (вытесняются давно не использованные)
+POLYBIUS_CACHE_SIZE = 64
+
+# Кэш скомпилированных кодеков (строка символов квадрата и правила объединения -> кодек)
+polybius_codecs_cache = OrderedDict()
+# Кэш квадратов по параметрам build_polybius_square
+polybius_squares_cache = OrderedDict()
+
+def lru_get(cache, key):
+    """
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении POLYBIUS_CACHE_SIZE.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > POLYBIUS_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def compile_polybius_codec(square, folding=FOLDED_LETTERS):
+    """
+    Компилирует полибианский квадрат в таблицы кодирования и декодирования.
+
+    :param square: Квадрат (список списков символов).
+    :param folding: Правило объединения букв (буква -> буква квадрата, которой она шифруется).
+    :return: Словарь с полями
+             'square' - сам квадрат,
+             'encode_map' - символ (в обоих регистрах, с учётом объединения) -> строка "строка+столбец" (1-based),
+             'decode_map' - строка из двух цифр -> символ квадрата.
+    """
+    cells = "".join("".join(row) for row in square)
+    key = (cells, len(square), tuple(sorted(folding.items())))
+    codec = lru_get(polybius_codecs_cache, key)
+    if codec is not None:
+        return codec
+
+    encode_map = {}
+    decode_map = {}
+    for r, row in enumerate(square):
+        for c, char in enumerate(row):
+            if not char or char in encode_map:
+                continue
+            coord_str = str(r + 1) + str(c + 1)
+            encode_map[char] = coord_str
+            encode_map[char.lower()] = coord_str
+            decode_map[coord_str] = char
+    for letter, folded in folding.items():
+        if folded in encode_map and letter not in encode_map:
+            encode_map[letter] = encode_map[folded]
+            encode_map[letter.lower()] = encode_map[folded]
+
+    codec = {'square': square, 'encode_map': encode_map, 'decode_map': decode_map}
+    lru_put(polybius_codecs_cache, key, codec)
+    return codec
+
+def build_polybius_square(size=square_size, keyword="", alphabet=None, folding=None):
+    """
+    Строит (или берёт из кэша) скомпилированный квадрат size x size с ключевым словом.
+
+    Квадрат заполняется буквами ключевого слова (без повторов, после объединения),
+    затем остальными символами алфавита; свободные клетки остаются пустыми.
+
+    :param size: Размер квадрата (5, 6 или 7 для стандартных алфавитов).
+    :param keyword: Ключевое слово (может быть пустым).
+    :param alphabet: Алфавит квадрата; по умолчанию SQUARE_ALPHABETS[size].
+    :param folding: Правило объединения букв; по умолчанию DEFAULT_FOLDING[size] для стандартного алфавита.
+    :return: Словарь с полями 'size', 'keyword', 'alphabet', 'alphabet_id', 'square', 'encode_map', 'decode_map'.
+    """
+    if alphabet is None:
+        if size not in SQUARE_ALPHABETS:
+            raise ValueError(f"Нет стандартного алфавита для квадрата {size}x{size}. Доступны: "
+                             f"{', '.join(str(n) for n in SQUARE_ALPHABETS)}.")
+        alphabet = SQUARE_ALPHABETS[size]
+        if folding is None:
+            folding = DEFAULT_FOLDING[size]
+    if folding is None:
+        folding = {}
+    if not 1 <= size <= 9:
+        raise ValueError("Размер квадрата должен быть от 1 до 9 (координаты - одна цифра).")
+    if len(alphabet) > size * size:
+        raise ValueError(f"Алфавит из {len(alphabet)} символов не помещается в квадрат {size}x{size}.")
+
+    key = (size, keyword, alphabet, tuple(sorted(folding.items())))
+    compiled = lru_get(polybius_squares_cache, key)
+    if compiled is not None:
+        return compiled
+
+    key_letters = ""
+    for char in keyword.upper():
+        char = folding.get(char, char)
+        if char in alphabet and char not in key_letters:
+            key_letters += char
+    cells = key_letters + "".join(char for char in alphabet if char not in key_letters)
+    square = [[cells[i * size + j] if i * size + j < len(cells) else '' for j in range(size)] for i in range(size)]
+
+    alphabet_ids = [number for number, known in POLYBIUS_ALPHABETS.items() if known == alphabet]
+    compiled = dict(compile_polybius_codec(square, folding))
+    compiled.update({'size': size, 'keyword': keyword, 'alphabet': alphabet,
+                     'alphabet_id': alphabet_ids[0] if alphabet_ids else 0})
+    lru_put(polybius_squares_cache, key, compiled)
+    return compiled
+
 def get_coordinates(char, square, alphabet):
     """
     Находит координаты (строка, столбец) символа в полибианском квадрате.
     Обрабатывает объединение 'Ё' с 'Е' и 'Й' с 'И'.
     """
-    processed_char = char.upper() # Приводим к верхнему регистру для поиска
-    if processed_char == 'Ё':
-        processed_char = 'Е'
-    elif processed_char == 'Й':
-        processed_char = 'И'
+    coord_str = compile_polybius_codec(square)['encode_map'].get(char.upper())
+    if coord_str is None:
+        return -1, -1
+    return int(coord_str[0]) - 1, int(coord_str[1]) - 1
 
-    for r in range(len(square)):
-        for c in range(len(square[r])):
-            if square[r][c] == processed_char:
-                return r, c
-    return -1, -1
+def polybius_encode(text, codec):
+    """
+    Шифрует текст скомпилированным квадратом (одним проходом по строке).
+    Символы, которых нет в квадрате, пропускаются.
+    """
+    encode_map = codec['encode_map']
+    return "".join(map(encode_map.get, text, repeat("", len(text))))
+
+def polybius_decode(coords, codec):
+    """
+    Дешифрует строку координат скомпилированным квадратом.
+    """
+    if len(coords) % 2 != 0:
+        raise ValueError("Длина строки координат должна быть чётной.")
+
+    decode_map = codec['decode_map']
+    # Пары цифр собираются срезами с шагом 2 и переводятся в символы одним проходом
+    try:
+        return "".join(map(decode_map.__getitem__, map(str.__add__, coords[0::2], coords[1::2])))
+    except KeyError:
+        raise ValueError(find_invalid_coordinate(coords, codec['square'])) from None
 
 def polybius_cipher(text, square):
     """
     Шифрует текст с помощью полибианского квадрата.
-    Возвращает строку координат.
-    """
-    encrypted_coords = ""
-    for char in text:
-        row, col = get_coordinates(char, square, alphabet_for_square_6x6)
-        if row != -1 and col != -1:
-            # Преобразуем индексы (0-based) в номера (1-based) и добавляем к результату
-            coord_str = str(row + 1) + str(col + 1)
-            encrypted_coords += coord_str
-        # else: # Символ не найден, пропускаем
-        #     pass # Пропускаем символ, не добавляя ничего к результату
-    return encrypted_coords
+    Возвращает строку координат. Символы, которых нет в квадрате, пропускаются.
+    """
+    return polybius_encode(text, compile_polybius_codec(square))
+
+def find_invalid_coordinate(coords, square):
+    """
+    Возвращает описание первой неверной пары координат (для сообщения об ошибке).
+    """
+    size = len(square)
+    for i in range(0, len(coords), 2):
+        coord_pair = coords[i:i+2]
+        if not (coord_pair.isdigit() and coord_pair.isascii()):
+            return f"Неверный формат координаты: '{coord_pair}'. Ожидаются цифры."
+        row_num, col_num = int(coord_pair[0]), int(coord_pair[1])
+        if not (1 <= row_num <= size) or not (1 <= col_num <= len(square[row_num - 1])):
+            return f"Координата ({row_num}, {col_num}) выходит за пределы квадрата {size}x{size}."
+        if not square[row_num - 1][col_num - 1]:
+            return f"Клетка ({row_num}, {col_num}) квадрата пуста."
+    return "Неверная строка координат."
 
 def polybius_decipher(coords, square):
     """
     Дешифрует строку координат с помощью полибианского квадрата.
     Возвращает исходный текст.
     """
+    return polybius_decode(coords, compile_polybius_codec(square))
+
+# --- Упакованный двоичный формат координат ---
+#
+# Файл: заголовок PACKED_HEADER (сигнатура, версия, размер квадрата, номер алфавита,
+# разрядность кода), затем коды пар координат.
+# 8-битный код - байт 0xRC (строка и столбец в полубайтах, 1-based), т.е. ровно
+# шестнадцатеричная запись пары цифр. 6-битный код - номер клетки (r-1)*N + (c-1),
+# четыре кода упаковываются в три байта; хвост группы дополняется кодом PACKED_PADDING_CODE.
+
+PACKED_MAGIC = b"PLBS"
+PACKED_VERSION = 1
+PACKED_HEADER = struct.Struct(">4sBBBB")
+PACKED_PADDING_CODE = 0x3F
+
+FILE_CHUNK_SIZE = 1024 * 1024 # Размер блока при чтении двоичного файла (байт)
+
+def bit_table(mask, shift):
+    """
+    Таблица для bytes.translate: байт x -> (x & mask), сдвинутый на shift бит (влево при shift > 0).
+    """
+    if shift >= 0:
+        return bytes(((x & mask) << shift) & 0xFF for x in range(256))
+    return bytes((x & mask) >> -shift for x in range(256))
+
+# Таблицы сдвигов для упаковки 4 x 6 бит <-> 3 x 8 бит
+PACK_TABLES = [bit_table(0x3F, 2), bit_table(0x30, -4), bit_table(0x0F, 4), bit_table(0x3C, -2), bit_table(0x03, 6)]
+UNPACK_TABLES = [bit_table(0xFC, -2), bit_table(0x03, 4), bit_table(0xF0, -4), bit_table(0x0F, 2), bit_table(0xC0, -6), bit_table(0x3F, 0)]
+
+def or_bytes(first, second):
+    """
+    Побитовое ИЛИ двух строк байт одинаковой длины (через целые числа, без цикла по байтам).
+    """
+    return (int.from_bytes(first, "big") | int.from_bytes(second, "big")).to_bytes(len(first), "big")
+
+def check_packed_format(square_size, code_bits):
+    """
+    Проверяет, что квадрат square_size x square_size можно записать кодами заданной разрядности.
+    6-битный код - номер клетки, код PACKED_PADDING_CODE занят дополнением,
+    поэтому 6-битными кодами записываются квадраты не больше 7x7 (49 клеток).
+    """
+    if code_bits not in (6, 8):
+        raise ValueError("Разрядность кода должна быть 6 или 8 бит.")
+    if not 1 <= square_size <= 9:
+        raise ValueError(f"Неподдерживаемый размер квадрата: {square_size}.")
+    if code_bits == 6 and square_size * square_size > PACKED_PADDING_CODE:
+        raise ValueError(f"Квадрат {square_size}x{square_size} не помещается в 6-битные коды "
+                         f"(не больше {PACKED_PADDING_CODE} клеток), используйте 8-битные коды.")
+
+def packed_code_bits(square_size):
+    """
+    Возвращает наименьшую разрядность кода, подходящую для квадрата: 6 или 8 бит.
+    """
+    return 6 if square_size * square_size <= PACKED_PADDING_CODE else 8
+
+def nibble_code_tables(square_size):
+    """
+    Таблицы перевода 8-битного кода 0xRC в номер клетки и обратно.
+    Неверные коды переводятся в 0xFF.
+    """
+    to_cell = bytearray(b"\xff" * 256)
+    to_nibble = bytearray(b"\xff" * 256)
+    for r in range(1, square_size + 1):
+        for c in range(1, square_size + 1):
+            cell = (r - 1) * square_size + (c - 1)
+            to_cell[r << 4 | c] = cell
+            to_nibble[cell] = r << 4 | c
+    return bytes(to_cell), bytes(to_nibble)
+
+def pack_coordinates(coords, square_size=square_size, code_bits=6):
+    """
+    Упаковывает строку координат (пары цифр, как возвращает polybius_cipher) в байты.
+
+    :param coords: Строка координат чётной длины.
+    :param square_size: Размер квадрата (цифры координат от 1 до square_size).
+    :param code_bits: Разрядность кода: 8 (байт на пару) или 6 (три байта на четыре пары).
+    :return: Упакованные коды (bytes). 6-битные коды дополняются до группы из четырёх.
+    """
+    check_packed_format(square_size, code_bits)
     if len(coords) % 2 != 0:
         raise ValueError("Длина строки координат должна быть чётной.")
+    valid_digits = "".join(str(n) for n in range(1, square_size + 1))
+    if coords.translate(str.maketrans("", "", valid_digits)):
+        raise ValueError(f"Строка координат должна состоять из цифр от 1 до {square_size}.")
 
-    deciphered_text = ""
-    # Разбиваем строку координат на пары
-    for i in range(0, len(coords), 2):
-        coord_pair = coords[i:i+2]
-        try:
-            row_num = int(coord_pair[0])
-            col_num = int(coord_pair[1])
-        except ValueError:
-            raise ValueError(f"Неверный формат координаты: '{coord_pair}'. Ожидаются цифры.")
+    nibbles = bytes.fromhex(coords)
+    if code_bits == 8:
+        return nibbles
+
+    codes = nibbles.translate(nibble_code_tables(square_size)[0])
+    codes += bytes([PACKED_PADDING_CODE]) * (-len(codes) % 4)
+    a, b, c, d = codes[0::4], codes[1::4], codes[2::4], codes[3::4]
+    packed = bytearray(len(a) * 3)
+    packed[0::3] = or_bytes(a.translate(PACK_TABLES[0]), b.translate(PACK_TABLES[1]))
+    packed[1::3] = or_bytes(b.translate(PACK_TABLES[2]), c.translate(PACK_TABLES[3]))
+    packed[2::3] = or_bytes(c.translate(PACK_TABLES[4]), d)
+    return bytes(packed)
+
+def unpack_coordinates(packed, square_size=square_size, code_bits=6):
+    """
+    Распаковывает коды, полученные pack_coordinates, обратно в строку координат.
+    """
+    check_packed_format(square_size, code_bits)
+    to_cell, to_nibble = nibble_code_tables(square_size)
+    if code_bits == 8:
+        nibbles = bytes(packed)
+        if b"\xff" in nibbles.translate(to_cell):
+            position = nibbles.translate(to_cell).index(0xFF)
+            raise ValueError(f"Неверный код пары координат в позиции {position}.")
+        return nibbles.hex()
+    if len(packed) % 3 != 0:
+        raise ValueError("Длина 6-битных данных должна быть кратна 3 байтам.")
+
+    b0, b1, b2 = packed[0::3], packed[1::3], packed[2::3]
+    codes = bytearray(len(b0) * 4)
+    codes[0::4] = b0.translate(UNPACK_TABLES[0])
+    codes[1::4] = or_bytes(b0.translate(UNPACK_TABLES[1]), b1.translate(UNPACK_TABLES[2]))
+    codes[2::4] = or_bytes(b1.translate(UNPACK_TABLES[3]), b2.translate(UNPACK_TABLES[4]))
+    codes[3::4] = b2.translate(UNPACK_TABLES[5])
+    # Дополнение может стоять только в конце последней группы
+    codes = bytes(codes).rstrip(bytes([PACKED_PADDING_CODE]))
+    nibbles = codes.translate(to_nibble)
+    if b"\xff" in nibbles:
+        raise ValueError(f"Неверный код пары координат в позиции {nibbles.index(0xFF)}.")
+    return nibbles.hex()
 
-        # Проверяем диапазон (1-based)
-        if not (1 <= row_num <= square_size) or not (1 <= col_num <= square_size):
-            raise ValueError(f"Координата ({row_num}, {col_num}) выходит за пределы квадрата {square_size}x{square_size}.")
+def write_packed_coordinates(file, coords_chunks, square_size=square_size, alphabet_id=1, code_bits=6):
+    """
+    Потоково записывает координаты в упакованном формате (с заголовком).
+
+    :param file: Файл, открытый для записи в двоичном режиме.
+    :param coords_chunks: Итерируемый набор фрагментов строки координат (границы фрагментов произвольны).
+    :param square_size: Размер квадрата.
+    :param alphabet_id: Номер алфавита квадрата (см. POLYBIUS_ALPHABETS).
+    :param code_bits: Разрядность кода: 6 или 8.
+    :return: Количество записанных пар координат.
+    """
+    check_packed_format(square_size, code_bits)
+    file.write(PACKED_HEADER.pack(PACKED_MAGIC, PACKED_VERSION, square_size, alphabet_id, code_bits))
+
+    group_digits = 8 if code_bits == 6 else 2 # Цифр в целой группе кодов
+    pending = ""
+    pairs_written = 0
+    for chunk in coords_chunks:
+        pending += chunk
+        complete = len(pending) - len(pending) % group_digits
+        if complete:
+            file.write(pack_coordinates(pending[:complete], square_size, code_bits))
+            pairs_written += complete // 2
+            pending = pending[complete:]
+    if pending:
+        file.write(pack_coordinates(pending, square_size, code_bits))
+        pairs_written += len(pending) // 2
+    return pairs_written
 
-        # Получаем символ по индексам (0-based)
-        char = square[row_num - 1][col_num - 1]
-        deciphered_text += char
+def read_packed_header(file):
+    """
+    Читает и проверяет заголовок упакованного файла.
 
-    return deciphered_text
+    :return: Словарь с полями 'square_size', 'alphabet_id', 'code_bits'.
+    """
+    raw = file.read(PACKED_HEADER.size)
+    if len(raw) != PACKED_HEADER.size:
+        raise ValueError("Файл слишком короткий: нет заголовка.")
+    magic, version, size, alphabet_id, code_bits = PACKED_HEADER.unpack(raw)
+    if magic != PACKED_MAGIC:
+        raise ValueError("Файл не является упакованным файлом координат.")
+    if version != PACKED_VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата: {version}.")
+    check_packed_format(size, code_bits)
+    return {'square_size': size, 'alphabet_id': alphabet_id, 'code_bits': code_bits}
+
+def read_packed_coordinates(file, header, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Потоково читает коды после заголовка и возвращает фрагменты строки координат (генератор).
+    Размер блока может быть любым: неполная группа кодов переносится в следующий блок.
+    """
+    group_bytes = 3 if header['code_bits'] == 6 else 1
+    pending = b""
+    while True:
+        block = file.read(chunk_size)
+        if not block:
+            break
+        pending += block
+        complete = len(pending) - len(pending) % group_bytes
+        if complete:
+            yield unpack_coordinates(pending[:complete], header['square_size'], header['code_bits'])
+            pending = pending[complete:]
+    if pending:
+        raise ValueError("Файл обрезан: неполная группа кодов в конце.")
+
+def current_square():
+    """
+    Возвращает скомпилированный квадрат по размеру и ключевому слову, выбранным в интерфейсе.
+    """
+    return build_polybius_square(int(size_var.get()), keyword_entry.get())
+
+def show_square(compiled):
+    output_text.insert(tk.END, f"Размер квадрата: {compiled['size']}x{compiled['size']}\n")
+    if compiled['keyword']:
+        output_text.insert(tk.END, f"Ключевое слово: {compiled['keyword']}\n")
+    output_text.insert(tk.END, f"Алфавит (и символы) для заполнения квадрата: {compiled['alphabet']}\n")
+    output_text.insert(tk.END, "Полибианский квадрат:\n")
+    for row in compiled['square']:
+        output_text.insert(tk.END, f"{row}\n")
 
 def encrypt_action():
     text = input_text.get()
@@ -88,14 +425,11 @@ def encrypt_action():
         return
 
     try:
-        encrypted_coords = polybius_cipher(text, polybius_square)
+        compiled = current_square()
+        encrypted_coords = polybius_encode(text, compiled)
         output_text.delete(1.0, tk.END)
         output_text.insert(tk.END, f"Исходное сообщение: {text}\n")
-        output_text.insert(tk.END, f"Размер квадрата: {square_size}x{square_size}\n")
-        output_text.insert(tk.END, f"Алфавит (и символы) для заполнения квадрата: {alphabet_for_square_6x6}\n")
-        output_text.insert(tk.END, "Полибианский квадрат:\n")
-        for row in polybius_square:
-            output_text.insert(tk.END, f"{row}\n")
+        show_square(compiled)
         output_text.insert(tk.END, f"Зашифрованное сообщение (координаты): {encrypted_coords}\n")
     except Exception as e:
         output_text.delete(1.0, tk.END)
@@ -113,14 +447,11 @@ def decrypt_action():
         if not coords.isdigit():
              raise ValueError("Строка координат должна содержать только цифры.")
 
-        deciphered_text = polybius_decipher(coords, polybius_square)
+        compiled = current_square()
+        deciphered_text = polybius_decode(coords, compiled)
         output_text.delete(1.0, tk.END)
         output_text.insert(tk.END, f"Зашифрованное сообщение (координаты): {coords}\n")
-        output_text.insert(tk.END, f"Размер квадрата: {square_size}x{square_size}\n")
-        output_text.insert(tk.END, f"Алфавит (и символы) для заполнения квадрата: {alphabet_for_square_6x6}\n")
-        output_text.insert(tk.END, "Полибианский квадрат:\n")
-        for row in polybius_square:
-            output_text.insert(tk.END, f"{row}\n")
+        show_square(compiled)
         output_text.insert(tk.END, f"Дешифрованное сообщение: {deciphered_text}\n")
     except ValueError as ve:
         output_text.delete(1.0, tk.END)
@@ -129,6 +460,89 @@ def decrypt_action():
         output_text.delete(1.0, tk.END)
         output_text.insert(tk.END, f"Неизвестная ошибка при дешифровании: {e}\n")
 
+def save_packed_action():
+    text = input_text.get()
+    if not text:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите текст для шифрования.\n")
+        return
+
+    output_path = filedialog.asksaveasfilename(title="Сохранить координаты в двоичный файл",
+                                               defaultextension=".plb")
+    if not output_path:
+        return
+
+    try:
+        compiled = current_square()
+        encrypted_coords = polybius_encode(text, compiled)
+        with open(output_path, "wb") as f:
+            code_bits = packed_code_bits(compiled['size'])
+            pairs_written = write_packed_coordinates(f, [encrypted_coords], compiled['size'], compiled['alphabet_id'], code_bits)
+    except (OSError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при сохранении: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Исходное сообщение: {text}\n")
+    output_text.insert(tk.END, f"Зашифрованное сообщение (координаты): {encrypted_coords}\n")
+    output_text.insert(tk.END, f"Записано пар координат: {pairs_written} ({code_bits} бит на пару), файл: {output_path}\n")
+
+def open_packed_action():
+    input_path = filedialog.askopenfilename(title="Открыть двоичный файл координат")
+    if not input_path:
+        return
+
+    try:
+        with open(input_path, "rb") as f:
+            header = read_packed_header(f)
+            alphabet = POLYBIUS_ALPHABETS.get(header['alphabet_id'])
+            if alphabet is None:
+                raise ValueError(f"Неизвестный алфавит квадрата №{header['alphabet_id']}.")
+            compiled = build_polybius_square(header['square_size'], keyword_entry.get(), alphabet,
+                                             DEFAULT_FOLDING.get(header['square_size']))
+            coords = "".join(read_packed_coordinates(f, header))
+        deciphered_text = polybius_decode(coords, compiled)
+    except (OSError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при чтении файла: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение (координаты): {coords}\n")
+    show_square(compiled)
+    output_text.insert(tk.END, f"Дешифрованное сообщение: {deciphered_text}\n")
+
+# --- Живой режим: результат шифрования обновляется по мере ввода текста ---
+
+def polybius_live_patch(old_text, new_text, old_output_length, codec):
+    """
+    Перешифровывает только изменённый участок текста. Каждый символ кодируется независимо
+    от позиции, но символы вне квадрата пропускаются, поэтому начало участка результата
+    находится по длине кода неизменённой части текста.
+
+    :return: Кортеж (начало, конец, замена) участка результата.
+    """
+    start, old_end, new_end = live_mode.changed_span(old_text, new_text)
+    output_start, output_end = live_mode.live_output_span(old_text, start, old_end, old_output_length,
+                                                          lambda part: len(polybius_encode(part, codec)))
+    return output_start, output_end, polybius_encode(new_text[start:new_end], codec)
+
+def live_update():
+    """Обновляет результат живого режима по текущему тексту и параметрам квадрата."""
+    text = input_text.get()
+    try:
+        compiled = current_square()
+    except Exception as e:
+        live_mode.show_live_error(live_state, f"Ошибка при шифровании: {e}\n")
+        return
+
+    key = (compiled['size'], compiled['keyword'])
+    patch = None
+    if live_mode.live_patch_possible(live_state, text, key):
+        patch = polybius_live_patch(live_state['text'], text, live_state['output_length'], compiled)
+    live_mode.show_live_output(live_state, text, key, patch, lambda: polybius_encode(text, compiled))
+
 # --- Создание графического интерфейса ---
 root = tk.Tk()
 root.title("Полибианский Квадрат (Шифрование и Дешифрование)")
@@ -140,25 +554,64 @@ root.geometry("800x600")
 input_label = ttk.Label(root, text="Введите текст для шифрования или координаты для дешифрования:")
 input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
 
-input_text = ttk.Entry(root, width=70)
+input_var = tk.StringVar()
+input_text = ttk.Entry(root, width=70, textvariable=input_var)
 input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
 
+# Параметры квадрата
+settings_frame = ttk.Frame(root)
+settings_frame.grid(row=2, column=0, padx=10, pady=5, sticky="w", columnspan=2)
+
+size_label = ttk.Label(settings_frame, text="Размер квадрата:")
+size_label.pack(side=tk.LEFT)
+
+size_var = tk.StringVar(value=str(square_size))
+size_combobox = ttk.Combobox(settings_frame, textvariable=size_var, width=3, state="readonly",
+                             values=[str(size) for size in SQUARE_ALPHABETS])
+size_combobox.pack(side=tk.LEFT, padx=(5, 20))
+
+keyword_label = ttk.Label(settings_frame, text="Ключевое слово (необязательно):")
+keyword_label.pack(side=tk.LEFT)
+
+keyword_var = tk.StringVar()
+keyword_entry = ttk.Entry(settings_frame, width=30, textvariable=keyword_var)
+keyword_entry.pack(side=tk.LEFT, padx=(5, 0))
+
+# Флажок живого режима: при изменении текста или параметров квадрата результат обновляется с задержкой
+live_var = tk.BooleanVar()
+live_check = ttk.Checkbutton(settings_frame, text="Шифровать при вводе", variable=live_var, command=lambda: live_mode.live_mode_action(live_state))
+live_check.pack(side=tk.LEFT, padx=(20, 0))
+
 # Кнопки
 encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
-encrypt_button.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+encrypt_button.grid(row=3, column=0, padx=10, pady=5, sticky="w")
 
 decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
-decrypt_button.grid(row=2, column=1, padx=10, pady=5, sticky="e")
+decrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
+
+# Кнопки работы с упакованным двоичным форматом
+file_buttons_frame = ttk.Frame(root)
+file_buttons_frame.grid(row=4, column=0, padx=10, pady=5, sticky="w", columnspan=2)
+
+save_packed_button = ttk.Button(file_buttons_frame, text="Зашифровать в двоичный файл...", command=save_packed_action)
+save_packed_button.pack(side=tk.LEFT, padx=(0, 10))
+
+open_packed_button = ttk.Button(file_buttons_frame, text="Дешифровать двоичный файл...", command=open_packed_action)
+open_packed_button.pack(side=tk.LEFT)
 
 # Вывод результата
 output_label = ttk.Label(root, text="Результат:")
-output_label.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
 
 output_text = scrolledtext.ScrolledText(root, width=90, height=30)
-output_text.grid(row=4, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+
+# Состояние живого режима (см. live_mode.py) и подписка на изменения полей ввода
+live_state = live_mode.create_live_state(root, output_text, live_var, live_update)
+live_mode.watch_variables(live_state, input_var, keyword_var, size_var)
 
 # --- Настройка сетки ---
-root.grid_rowconfigure(4, weight=1)
+root.grid_rowconfigure(6, weight=1)
 root.grid_columnconfigure(0, weight=1)
 
 # Запуск главного цикла
@@ -1,5 +1,18 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, filedialog
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import heapq
+import math
+import os
+import re
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import background_task
+import live_mode
 
 # Определяем русский алфавит
 alphabet = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
@@ -45,69 +58,381 @@ def get_coordinates_trisemus(char, table):
                 return r, c
     return -1, -1
 
-def trisemus_cipher(text, keyword, original_alphabet, table_rows=6, table_cols=6):
+# Максимальное число скомпилированных ключей в кэше (вытесняются давно не использованные):
+# в живом режиме ключ компилируется при каждом изменении поля ключа
+TRISEMUS_CACHE_SIZE = 64
+
+# Кэш скомпилированных ключей: (лозунг, алфавит, строки, столбцы) -> ключ
+trisemus_keys_cache = OrderedDict()
+
+def lru_get(cache, key):
     """
-    Шифрует текст с помощью шифра Трисемуса.
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении TRISEMUS_CACHE_SIZE.
     """
-    text_upper = text.upper()
-    trisemus_table = create_trisemus_table(keyword, original_alphabet, table_rows, table_cols)
-    encrypted_text = ""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > TRISEMUS_CACHE_SIZE:
+        cache.popitem(last=False)
 
-    for i, char in enumerate(text_upper):
-        row, col = get_coordinates_trisemus(char, trisemus_table)
+def compile_trisemus_key(keyword, original_alphabet, table_rows=6, table_cols=6):
+    """
+    Компилирует лозунг и размеры таблицы в таблицы замены для каждой фазы.
 
-        if row != -1 and col != -1:
-            # Определяем строку для шифрования текущего символа
-            encryption_row_index = i % len(trisemus_table)
-            # Берем символ из этой строки по столбцу исходного символа
-            encrypted_char_upper = trisemus_table[encryption_row_index][col]
+    Замена символа зависит только от его позиции по модулю числа строк (фазы),
+    поэтому для каждой фазы строится одна таблица str.translate.
 
-            # Сохраняем регистр
-            original_char = text[i]
-            if original_char.islower():
-                encrypted_text += encrypted_char_upper.lower()
-            else:
-                encrypted_text += encrypted_char_upper
-        else:
-            # Символ не найден, пропускаем
-            pass
+    :return: Словарь с полями
+             'table' - таблица Трисемуса (список списков),
+             'encrypt_tables' / 'decrypt_tables' - списки таблиц str.translate по фазам,
+             'cleanup' - регулярное выражение для удаления символов, которых нет в таблице.
+    """
+    cache_key = (keyword, original_alphabet, table_rows, table_cols)
+    key = lru_get(trisemus_keys_cache, cache_key)
+    if key is not None:
+        return key
+
+    table = create_trisemus_table(keyword, original_alphabet, table_rows, table_cols)
+    first_column = {}
+    for row in table:
+        for col, char in enumerate(row):
+            first_column.setdefault(char, col)
+
+    encrypt_tables = []
+    decrypt_tables = []
+    for row in table:
+        # Сначала строчные буквы, затем прописные: для символов без регистра ('-')
+        # побеждает прописной вариант, как и в посимвольной версии (islower() == False)
+        encrypt_map = {}
+        for case in (str.lower, str.upper):
+            for char, col in first_column.items():
+                encrypt_map[ord(case(char))] = case(row[col])
+        encrypt_tables.append(encrypt_map)
+
+        # Символы таблицы, которых нет в строке этой фазы, при дешифровании отбрасываются:
+        # помечаем их символом '\0', который затем удаляется вместе с прочими чужими символами
+        decrypt_map = {ord(case(char)): '\0' for case in (str.lower, str.upper) for char in first_column}
+        for case in (str.lower, str.upper):
+            for col in range(len(row) - 1, -1, -1):
+                decrypt_map[ord(case(row[col]))] = case(table[0][col])
+        decrypt_tables.append(decrypt_map)
+
+    table_chars = "".join(first_column)
+    cleanup = re.compile("[^" + re.escape(table_chars.lower() + table_chars.upper()) + "]+")
+
+    key = {'table': table, 'encrypt_tables': encrypt_tables, 'decrypt_tables': decrypt_tables, 'cleanup': cleanup}
+    lru_put(trisemus_keys_cache, cache_key, key)
+    return key
+
+def trisemus_apply_phase_tables(text, phase_tables, cleanup, start_phase=0):
+    """
+    Применяет таблицы фаз к срезам text[position::rows], собирает срезы обратно
+    в исходном порядке и удаляет символы, которых нет в таблице.
+    Первому символу текста соответствует фаза start_phase.
+    """
+    rows = len(phase_tables)
+    # Срезы собираются в буфер UTF-32 (по 4 байта на символ) через память с шагом rows
+    buffer = bytearray(4 * len(text))
+    code_points = memoryview(buffer).cast('I')
+    for position in range(min(rows, len(text))):
+        translated = text[position::rows].translate(phase_tables[(start_phase + position) % rows])
+        code_points[position::rows] = memoryview(translated.encode('utf-32-le')).cast('I')
+    return cleanup.sub("", buffer.decode('utf-32-le'))
 
-    return encrypted_text
+def trisemus_cipher(text, keyword, original_alphabet, table_rows=6, table_cols=6):
+    """
+    Шифрует текст с помощью шифра Трисемуса.
+    """
+    key = compile_trisemus_key(keyword, original_alphabet, table_rows, table_cols)
+    return trisemus_apply_phase_tables(text, key['encrypt_tables'], key['cleanup'])
 
 def trisemus_decipher(text, keyword, original_alphabet, table_rows=6, table_cols=6):
     """
     Дешифрует текст, зашифрованный с помощью шифра Трисемуса.
     """
-    text_upper = text.upper()
-    trisemus_table = create_trisemus_table(keyword, original_alphabet, table_rows, table_cols)
-    decrypted_text = ""
-
-    for i, char in enumerate(text_upper):
-        # Для дешифрования нужно найти строку шифрования, использованную для текущего символа
-        decryption_row_index = i % len(trisemus_table)
-        # Теперь ищем координаты текущего символа шифротекста в ЭТОЙ строке
-        # Мы ищем char в строке с индексом decryption_row_index
-        row_to_search = trisemus_table[decryption_row_index]
-        if char in row_to_search:
-             col = row_to_search.index(char)
-             # Находим символ в ПЕРВОЙ строке таблицы по найденному столбцу
-             decrypted_char_upper = trisemus_table[0][col] # Первая строка
-
-             # Сохраняем регистр
-             original_char = text[i]
-             if original_char.islower():
-                 decrypted_text += decrypted_char_upper.lower()
-             else:
-                 decrypted_text += decrypted_char_upper
+    key = compile_trisemus_key(keyword, original_alphabet, table_rows, table_cols)
+    return trisemus_apply_phase_tables(text, key['decrypt_tables'], key['cleanup'])
+
+
+# --- Параллельный режим: большой текст делится на части, которые шифруются в разных процессах ---
+
+# Однобайтовая кодировка, в которой текст передаётся через общую память, если он в ней представим
+SHARED_TEXT_CODEC = "cp1251"
+
+# Минимальная длина части текста (в символах), ради которой стоит запускать отдельный процесс
+PARALLEL_MIN_CHUNK = 4 * 1024 * 1024
+
+def split_text_chunks(length, workers, min_chunk=PARALLEL_MIN_CHUNK):
+    """
+    Делит позиции текста [0, length) на части примерно равной длины, по одной на процесс.
+
+    :param length: Длина текста (целое число).
+    :param workers: Количество процессов (целое число).
+    :param min_chunk: Минимальная длина части (целое число).
+    :return: Список пар (начало, конец).
+    """
+    count = max(1, min(workers, length // max(min_chunk, 1)))
+    bounds = [length * part // count for part in range(count + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+def encode_shared_text(text, result_chars):
+    """
+    Кодирует текст с постоянной шириной символа для передачи через общую память:
+    в SHARED_TEXT_CODEC (1 байт на символ), если в ней представимы и текст, и символы
+    результата, иначе в UTF-32 (4 байта на символ).
+
+    :return: Кортеж (данные, кодировка, байтов на символ).
+    """
+    try:
+        result_chars.encode(SHARED_TEXT_CODEC)
+        return text.encode(SHARED_TEXT_CODEC), SHARED_TEXT_CODEC, 1
+    except UnicodeEncodeError:
+        return text.encode('utf-32-le'), 'utf-32-le', 4
+
+def run_shared_chunks(data, width, chunks, worker, arguments, workers):
+    """
+    Копирует данные в общую память (multiprocessing.shared_memory) и обрабатывает части
+    в процессах ProcessPoolExecutor. Между процессами передаются только имена блоков
+    общей памяти и границы частей, а не сам текст.
+
+    Исполнитель вызывается как worker(input_name, output_name, width, start, end, phase, *arguments):
+    он читает символы [start, end) входного блока, записывает результат (не длиннее части)
+    в выходной блок с той же позиции и возвращает длину результата в байтах.
+
+    :param data: Текст в кодировке с постоянной шириной символа (bytes).
+    :param width: Количество байтов на символ (целое число).
+    :param chunks: Список троек (начало, конец, фаза) в символах.
+    :param worker: Функция-исполнитель (уровня модуля, чтобы её можно было передать в процесс).
+    :param arguments: Дополнительные аргументы исполнителя (кортеж).
+    :param workers: Количество процессов (целое число).
+    :return: Результаты частей, склеенные по порядку (bytes).
+    """
+    input_memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    output_memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        input_memory.buf[:len(data)] = data
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(worker, input_memory.name, output_memory.name, width, start, end, phase, *arguments)
+                       for start, end, phase in chunks]
+            lengths = [future.result() for future in futures]
+        return b"".join(output_memory.buf[start * width:start * width + length]
+                        for (start, _, _), length in zip(chunks, lengths))
+    finally:
+        input_memory.close()
+        input_memory.unlink()
+        output_memory.close()
+        output_memory.unlink()
+
+def trisemus_parallel_worker(input_name, output_name, width, start, end, phase, keyword, original_alphabet,
+                             table_rows, table_cols, decrypt, codec):
+    """
+    Исполнитель trisemus_transform_parallel: шифрует часть текста из общей памяти с фазы phase.
+    """
+    input_memory = shared_memory.SharedMemory(name=input_name)
+    output_memory = shared_memory.SharedMemory(name=output_name)
+    try:
+        chunk = bytes(input_memory.buf[start * width:end * width]).decode(codec)
+        key = compile_trisemus_key(keyword, original_alphabet, table_rows, table_cols)
+        result = trisemus_apply_phase_tables(chunk, key['decrypt_tables' if decrypt else 'encrypt_tables'],
+                                             key['cleanup'], phase).encode(codec)
+        output_memory.buf[start * width:start * width + len(result)] = result
+        return len(result)
+    finally:
+        input_memory.close()
+        output_memory.close()
+
+def trisemus_transform_parallel(text, keyword, original_alphabet, table_rows=6, table_cols=6, decrypt=False,
+                                workers=None, min_chunk=PARALLEL_MIN_CHUNK):
+    """
+    Шифрует (дешифрует) большой текст шифром Трисемуса в нескольких процессах.
+
+    Замена символа зависит только от его позиции по модулю числа строк таблицы, поэтому
+    текст делится на части, и часть, начинающаяся с символа start, шифруется с фазы
+    start mod rows. Символы вне таблицы удаляются в каждой части отдельно, а результаты
+    склеиваются по порядку. Результат совпадает с trisemus_cipher / trisemus_decipher.
+
+    :param text: Исходный текст (строка).
+    :param keyword: Лозунг (строка).
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :param table_rows: Количество строк таблицы.
+    :param table_cols: Количество столбцов таблицы.
+    :param decrypt: Дешифровать вместо шифрования.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param min_chunk: Минимальная длина части текста в символах (целое число).
+    :return: Зашифрованный (дешифрованный) текст (строка).
+    """
+    key = compile_trisemus_key(keyword, original_alphabet, table_rows, table_cols)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = split_text_chunks(len(text), workers, min_chunk)
+    if len(chunks) == 1:
+        # Короткий текст не стоит запуска процессов
+        return trisemus_apply_phase_tables(text, key['decrypt_tables' if decrypt else 'encrypt_tables'], key['cleanup'])
+
+    table_chars = "".join(char for row in key['table'] for char in row)
+    data, codec, width = encode_shared_text(text, table_chars.lower() + table_chars.upper())
+    rows = len(key['table'])
+    chunks = [(start, end, start % rows) for start, end in chunks]
+    result = run_shared_chunks(data, width, chunks, trisemus_parallel_worker,
+                               (keyword, original_alphabet, table_rows, table_cols, decrypt, codec), workers)
+    return result.decode(codec)
+
+
+# --- Криптоанализ: атака по словарю лозунгов ---
+
+# Относительные частоты букв русского языка (в процентах)
+RUSSIAN_LETTER_FREQUENCIES = {
+    'А': 8.01, 'Б': 1.59, 'В': 4.54, 'Г': 1.70, 'Д': 2.98, 'Е': 8.45, 'Ё': 0.04,
+    'Ж': 0.94, 'З': 1.65, 'И': 7.35, 'Й': 1.21, 'К': 3.49, 'Л': 4.40, 'М': 3.21,
+    'Н': 6.70, 'О': 10.97, 'П': 2.81, 'Р': 4.73, 'С': 5.47, 'Т': 6.26, 'У': 2.62,
+    'Ф': 0.26, 'Х': 0.97, 'Ц': 0.48, 'Ч': 1.44, 'Ш': 0.73, 'Щ': 0.36, 'Ъ': 0.04,
+    'Ы': 1.90, 'Ь': 1.74, 'Э': 0.32, 'Ю': 0.64, 'Я': 2.01,
+}
+
+# Штраф (log10) за символ шифротекста, который не может стоять на своей позиции при данной таблице
+MISMATCH_PENALTY = -6.0
+
+# Сколько первых символов шифротекста используется для оценки кандидатов
+DICTIONARY_SAMPLE_CHARS = 150
+
+def reduce_keyword(keyword, original_alphabet):
+    """
+    Оставляет в лозунге только первые вхождения букв алфавита (в верхнем регистре).
+    Лозунги с одинаковым результатом дают одну и ту же таблицу Трисемуса.
+    """
+    unique_letters = ""
+    for char in keyword.upper():
+        if char in original_alphabet and char not in unique_letters:
+            unique_letters += char
+    return unique_letters
+
+def load_wordlist(file_path):
+    """
+    Читает словарь лозунгов: одно слово на строку, пустые строки пропускаются.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def build_keyword_trie(keywords, original_alphabet):
+    """
+    Строит префиксное дерево лозунгов. Узел - словарь {'children': {буква: узел}, 'words': [...]}.
+    Путь от корня до узла - уникальные буквы лозунга, то есть начало строки таблицы.
+    """
+    root = {'children': {}, 'words': []}
+    for keyword in keywords:
+        node = root
+        for letter in reduce_keyword(keyword, original_alphabet):
+            node = node['children'].setdefault(letter, {'children': {}, 'words': []})
+        node['words'].append(keyword)
+    return root
+
+def score_trisemus_table(table_alphabet, ciphertext_sample, rows, cols, letter_probabilities):
+    """
+    Оценивает таблицу Трисемуса (в виде строки длины rows * cols) по шифротексту.
+
+    При шифровании символ на позиции i берётся из строки i % rows таблицы, а от буквы
+    открытого текста сохраняется только столбец. Поэтому для верной таблицы каждый
+    символ шифротекста лежит в строке i % rows, а вероятность позиции - это суммарная
+    частота букв его столбца. Несовпадение строки штрафуется MISMATCH_PENALTY.
+
+    :return: Оценка (сумма log10 вероятностей; чем больше, тем лучше).
+    """
+    cells = {}
+    for index, char in enumerate(table_alphabet):
+        if char not in cells:
+            cells[char] = (index // cols, index % cols)
+
+    column_scores = []
+    for col in range(cols):
+        probability = sum(letter_probabilities.get(table_alphabet[row * cols + col], 0.0) for row in range(rows))
+        column_scores.append(math.log10(probability) if probability > 0 else MISMATCH_PENALTY)
+
+    score = 0.0
+    for i, char in enumerate(ciphertext_sample):
+        cell = cells.get(char)
+        if cell is None or cell[0] != i % rows:
+            score += MISMATCH_PENALTY
         else:
-             # Символ шифротекста не найден в строке шифрования - ошибка или символ не из алфавита
-             # Для символов, не входящих в таблицу, можно оставить как есть, но в текущей логике шифрования
-             # такие символы не должны попасть в шифротекст.
-             # Если символ не найден, пропускаем или добавляем как есть (в реальной задаче это ошибка)
-             # print(f"Символ '{char}' из шифротекста не найден в строке шифрования {decryption_row_index}.")
-             pass # Пропускаем, так как это ошибка в данных или логике
+            score += column_scores[cell[1]]
+    return score
 
-    return decrypted_text
+def trisemus_dictionary_worker(keywords, ciphertext_sample, original_alphabet, rows, cols, top_count):
+    """
+    Обходит префиксное дерево части словаря и оценивает таблицу каждого лозунга.
+    Начало таблицы (буквы лозунга) и множество использованных букв накапливаются
+    при спуске по дереву и общие для всех слов поддерева.
+
+    :return: Список лучших кандидатов (оценка, строка таблицы, лозунги).
+    """
+    total = sum(RUSSIAN_LETTER_FREQUENCIES.values())
+    letter_probabilities = {letter: value / total for letter, value in RUSSIAN_LETTER_FREQUENCIES.items()}
+    best = []
+    counter = 0
+
+    stack = [(build_keyword_trie(keywords, original_alphabet), "", frozenset())]
+    while stack:
+        node, prefix, seen = stack.pop()
+        if node['words']:
+            table_alphabet = prefix + "".join(letter for letter in original_alphabet if letter not in seen)
+            table_alphabet = (table_alphabet + '-' * (rows * cols))[:rows * cols]
+            score = score_trisemus_table(table_alphabet, ciphertext_sample, rows, cols, letter_probabilities)
+            counter += 1
+            item = (score, counter, table_alphabet, node['words'])
+            if len(best) < top_count:
+                heapq.heappush(best, item)
+            elif score > best[0][0]:
+                heapq.heapreplace(best, item)
+        for letter, child in node['children'].items():
+            stack.append((child, prefix + letter, seen | {letter}))
+
+    return [(score, table_alphabet, words) for score, _, table_alphabet, words in best]
+
+def trisemus_dictionary_attack(ciphertext, keywords, original_alphabet, table_rows=6, table_cols=6, workers=None, top_count=10):
+    """
+    Атака по словарю на шифр Трисемуса.
+
+    Словарь делится по первой букве лозунга, каждая часть обходится как отдельное
+    префиксное дерево в своём процессе ProcessPoolExecutor.
+
+    :param ciphertext: Шифротекст (строка).
+    :param keywords: Последовательность лозунгов-кандидатов.
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :param table_rows: Количество строк таблицы.
+    :param table_cols: Количество столбцов таблицы.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param top_count: Сколько лучших кандидатов вернуть.
+    :return: Список кортежей (оценка, строка таблицы, лозунги) по убыванию оценки.
+    """
+    if not ciphertext:
+        raise ValueError("Шифротекст пуст.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    groups = {}
+    for keyword in keywords:
+        groups.setdefault(reduce_keyword(keyword, original_alphabet)[:1], []).append(keyword)
+    parts = [[] for _ in range(workers)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(parts, key=len).extend(group)
+
+    sample = ciphertext.upper()[:DICTIONARY_SAMPLE_CHARS]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(trisemus_dictionary_worker, part, sample, original_alphabet,
+                                   table_rows, table_cols, top_count) for part in parts if part]
+        for future in futures:
+            results.extend(future.result())
+
+    results.sort(key=lambda item: item[0], reverse=True)
+    return results[:top_count]
 
 
 def encrypt_action():
@@ -160,44 +485,136 @@ def decrypt_action():
         output_text.insert(tk.END, f"{row}\n")
     output_text.insert(tk.END, f"Дешифрованное сообщение: {decrypted}\n")
 
+def dictionary_attack_action():
+    ciphertext = input_text.get()
+
+    if not ciphertext:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите шифротекст для атаки по словарю.\n")
+        return
+
+    wordlist_path = filedialog.askopenfilename(title="Выберите словарь лозунгов (одно слово на строку)")
+    if not wordlist_path:
+        return
+
+    try:
+        keywords = load_wordlist(wordlist_path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при атаке по словарю: {e}\n")
+        return
+
+    # Атака запускает процессы и на большом словаре идёт долго, поэтому выполняется в фоновом потоке
+    background_task.run_in_background(background_state, lambda: trisemus_dictionary_attack(ciphertext, keywords, alphabet, 6, 6),
+                                      lambda results: show_dictionary_result(ciphertext, keywords, results),
+                                      "Идёт атака по словарю", "при атаке по словарю")
+
+def show_dictionary_result(ciphertext, keywords, results):
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение: {ciphertext}\n")
+    output_text.insert(tk.END, f"Проверено лозунгов: {len(keywords)}\n")
+    output_text.insert(tk.END, "Лучшие кандидаты:\n")
+    for score, table_alphabet, words in results:
+        output_text.insert(tk.END, f"  {', '.join(words[:5])}: оценка {score:.2f}, таблица {table_alphabet}\n")
+    if results:
+        best_keyword = results[0][2][0]
+        output_text.insert(tk.END, f"Дешифрованное сообщение (лозунг '{best_keyword}'): "
+                                   f"{trisemus_decipher(ciphertext, best_keyword, alphabet, 6, 6)}\n")
+
+# --- Живой режим: результат шифрования обновляется по мере ввода текста ---
+
+def trisemus_live_patch(old_text, new_text, old_output_length, key):
+    """
+    Перешифровывает только изменённый участок текста с фазы start mod rows. Если длина текста
+    изменилась не на кратное числу строк, фазы всего хвоста сдвигаются, и участок продолжается
+    до конца текста. Символы вне таблицы в результат не попадают, поэтому участок результата
+    находится по длине результата для неизменённой части текста.
+
+    :param key: Скомпилированный ключ (результат compile_trisemus_key).
+    :return: Кортеж (начало, конец, замена) участка результата.
+    """
+    start, old_end, new_end = live_mode.changed_span(old_text, new_text)
+    rows = len(key['encrypt_tables'])
+    if (len(new_text) - len(old_text)) % rows:
+        old_end, new_end = len(old_text), len(new_text)
+    cleanup = key['cleanup']
+    output_start, output_end = live_mode.live_output_span(old_text, start, old_end, old_output_length,
+                                                          lambda part: len(cleanup.sub("", part)))
+    replacement = trisemus_apply_phase_tables(new_text[start:new_end], key['encrypt_tables'], cleanup, start % rows)
+    return output_start, output_end, replacement
+
+def live_update():
+    """Обновляет результат живого режима по текущему тексту и лозунгу."""
+    text = input_text.get()
+    keyword = keyword_entry.get()
+    if not keyword:
+        live_mode.show_live_error(live_state, "Ошибка: Введите ключевое слово (лозунг).\n")
+        return
+
+    key = compile_trisemus_key(keyword, alphabet, 6, 6)
+    patch = None
+    if live_mode.live_patch_possible(live_state, text, keyword):
+        patch = trisemus_live_patch(live_state['text'], text, live_state['output_length'], key)
+    live_mode.show_live_output(live_state, text, keyword, patch, lambda: trisemus_cipher(text, keyword, alphabet, 6, 6))
+
 # --- Создание графического интерфейса ---
-root = tk.Tk()
-root.title("Шифр Трисемуса (Шифрование и Дешифрование)")
-root.geometry("800x600")
+# Окно создаётся только при запуске файла как программы: процессы-исполнители
+# ProcessPoolExecutor импортируют этот модуль повторно и не должны открывать своё окно.
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Шифр Трисемуса (Шифрование и Дешифрование)")
+    root.geometry("800x600")
+
+    # --- Виджеты ---
+
+    # Ввод текста
+    input_label = ttk.Label(root, text="Введите текст:")
+    input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+    input_var = tk.StringVar()
+    input_text = ttk.Entry(root, width=70, textvariable=input_var)
+    input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+
+    # Ввод ключа (лозунга)
+    keyword_label = ttk.Label(root, text="Введите ключевое слово (лозунг):")
+    keyword_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
 
-# --- Виджеты ---
+    keyword_var = tk.StringVar()
+    keyword_entry = ttk.Entry(root, width=30, textvariable=keyword_var)
+    keyword_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
 
-# Ввод текста
-input_label = ttk.Label(root, text="Введите текст:")
-input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+    # Флажок живого режима: при изменении текста или лозунга результат обновляется с задержкой
+    live_var = tk.BooleanVar()
+    live_check = ttk.Checkbutton(root, text="Шифровать при вводе", variable=live_var, command=lambda: live_mode.live_mode_action(live_state))
+    live_check.grid(row=2, column=1, padx=10, pady=5, sticky="e")
 
-input_text = ttk.Entry(root, width=70)
-input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    # Кнопки
+    encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
+    encrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
 
-# Ввод ключа (лозунга)
-keyword_label = ttk.Label(root, text="Введите ключевое слово (лозунг):")
-keyword_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+    decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
+    decrypt_button.grid(row=4, column=1, padx=10, pady=5, sticky="e")
 
-keyword_entry = ttk.Entry(root, width=30)
-keyword_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+    dictionary_button = ttk.Button(root, text="Атака по словарю...", command=dictionary_attack_action)
+    dictionary_button.grid(row=4, column=0, padx=10, pady=5, sticky="w")
 
-# Кнопки
-encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
-encrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
+    # Вывод результата
+    output_label = ttk.Label(root, text="Результат:")
+    output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
 
-decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
-decrypt_button.grid(row=4, column=1, padx=10, pady=5, sticky="e")
+    output_text = scrolledtext.ScrolledText(root, width=90, height=30)
+    output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
 
-# Вывод результата
-output_label = ttk.Label(root, text="Результат:")
-output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+    # Состояние фоновых операций (см. background_task.py): пока идёт атака, кнопка отключена
+    background_state = background_task.create_task_state(root, output_text, [dictionary_button])
 
-output_text = scrolledtext.ScrolledText(root, width=90, height=30)
-output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+    # Состояние живого режима (см. live_mode.py) и подписка на изменения полей ввода
+    live_state = live_mode.create_live_state(root, output_text, live_var, live_update)
+    live_mode.watch_variables(live_state, input_var, keyword_var)
 
-# --- Настройка сетки ---
-root.grid_rowconfigure(6, weight=1)
-root.grid_columnconfigure(0, weight=1)
+    # --- Настройка сетки ---
+    root.grid_rowconfigure(6, weight=1)
+    root.grid_columnconfigure(0, weight=1)
 
-# Запуск главного цикла
-root.mainloop()
+    # Запуск главного цикла
+    root.mainloop()
@@ -1,5 +1,19 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, filedialog
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import math
+import multiprocessing
+import os
+import random
+import re
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import background_task
+from ngram_model import NGRAM_SIZE, RUSSIAN_SAMPLE_TEXT, build_ngram_model, build_ngram_table, score_indices, text_to_indices
 
 # Определяем русский алфавит
 alphabet = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
@@ -78,46 +92,146 @@ def process_bigram(bigram, table, mode='encrypt'):
 
     return processed_char1 + processed_char2
 
-def prepare_text_for_playfair(text, filler_char='Я'):
+# Размер фрагмента (в символах) при потоковой обработке файлов
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Символ, за которым сразу следует такой же (перед повтором вставляется заполнитель)
+DOUBLED_CHAR_PATTERN = re.compile(r"(.)(?=\1)", re.DOTALL)
+
+def prepare_text_for_playfair_stream(chunks, filler_char='Я'):
     """
-    Подготавливает текст для шифрования/дешифрования Playfair.
+    Потоковая подготовка текста для Playfair (генератор).
+
+    Для каждого фрагмента текста возвращает список готовых биграмм. Между
+    фрагментами переносятся последний символ (для проверки повтора на границе)
+    и непарный символ, ожидающий пару. Результат совпадает с prepare_text_for_playfair
+    для склеенного текста при любом разбиении на фрагменты.
+
+    :param chunks: Итерируемый набор фрагментов текста.
+    :param filler_char: Символ-заполнитель.
     """
-    text_upper = text.upper()
-    prepared_chars = []
-    i = 0
-    while i < len(text_upper):
-        current_char = text_upper[i]
-        prepared_chars.append(current_char)
-
-        if i + 1 < len(text_upper):
-            next_char = text_upper[i + 1]
-            if current_char == next_char:
-                prepared_chars.append(filler_char)
-            i += 1
+    filler_replacement = r"\g<1>" + filler_char.replace("\\", "\\\\")
+    previous_char = ""
+    pending = ""
+    for chunk in chunks:
+        chunk_upper = chunk.upper()
+        if not chunk_upper:
+            continue
+        prepared = DOUBLED_CHAR_PATTERN.sub(filler_replacement, chunk_upper)
+        if previous_char == chunk_upper[0]:
+            prepared = filler_char + prepared
+        previous_char = chunk_upper[-1]
+
+        prepared = pending + prepared
+        if len(prepared) % 2 != 0:
+            prepared, pending = prepared[:-1], prepared[-1]
         else:
-            i += 1
+            pending = ""
+        yield list(map(str.__add__, prepared[0::2], prepared[1::2]))
 
-    prepared_string = "".join(prepared_chars)
-    if len(prepared_string) % 2 != 0:
-        prepared_string += filler_char
+    if pending:
+        tail = pending + filler_char
+        yield [tail[j:j+2] for j in range(0, len(tail), 2)]
 
+def prepare_text_for_playfair(text, filler_char='Я'):
+    """
+    Подготавливает текст для шифрования/дешифрования Playfair.
+    """
     bigrams = []
-    for j in range(0, len(prepared_string), 2):
-        bigram = prepared_string[j:j+2]
-        bigrams.append(bigram)
-
+    for chunk_bigrams in prepare_text_for_playfair_stream([text], filler_char):
+        bigrams.extend(chunk_bigrams)
     return bigrams
 
+# Максимальное число скомпилированных ключей в кэше (вытесняются давно не использованные)
+PLAYFAIR_CACHE_SIZE = 64
+
+# Кэш скомпилированных ключей: (ключевое слово, алфавит) -> ключ
+playfair_keys_cache = OrderedDict()
+
+def lru_get(cache, key):
+    """
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении PLAYFAIR_CACHE_SIZE.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > PLAYFAIR_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def playfair_bigram_cells(cell1, cell2, rows, cols, shift):
+    """
+    Преобразует пару номеров клеток таблицы по правилам Playfair (как process_bigram).
+    """
+    row1, col1 = divmod(cell1, cols)
+    row2, col2 = divmod(cell2, cols)
+    if row1 == row2:
+        return row1 * cols + (col1 + shift) % cols, row2 * cols + (col2 + shift) % cols
+    if col1 == col2:
+        return (row1 + shift) % rows * cols + col1, (row2 + shift) % rows * cols + col2
+    return row1 * cols + col2, row2 * cols + col1
+
+def compile_playfair_key(keyword, original_alphabet, rows=6, cols=6):
+    """
+    Компилирует ключевое слово в полные таблицы биграмм (для таблицы 6x6 - 36 x 36).
+
+    :return: Словарь с полями
+             'table' - таблица Playfair (список списков),
+             'cells' - строка символов таблицы по порядку клеток,
+             'cell_of' - символ -> номер клетки (первое вхождение, как в get_coordinates_playfair),
+             'encrypt_map' / 'decrypt_map' - биграмма -> биграмма результата.
+    """
+    cache_key = (keyword, original_alphabet, rows, cols)
+    key = lru_get(playfair_keys_cache, cache_key)
+    if key is not None:
+        return key
+
+    table = create_playfair_table(keyword, original_alphabet, rows, cols)
+    cells = "".join("".join(row) for row in table)
+    size = rows * cols
+    cell_of = {}
+    for cell, char in enumerate(cells):
+        cell_of.setdefault(char, cell)
+
+    # Плоские таблицы пар клеток: c1 * rows*cols + c2 -> номер пары клеток результата
+    encrypt_flat = [0] * (size * size)
+    decrypt_flat = [0] * (size * size)
+    for cell1 in range(size):
+        for cell2 in range(size):
+            out1, out2 = playfair_bigram_cells(cell1, cell2, rows, cols, 1)
+            encrypt_flat[cell1 * size + cell2] = out1 * size + out2
+            out1, out2 = playfair_bigram_cells(cell1, cell2, rows, cols, -1)
+            decrypt_flat[cell1 * size + cell2] = out1 * size + out2
+
+    encrypt_map = {}
+    decrypt_map = {}
+    for char1, cell1 in cell_of.items():
+        for char2, cell2 in cell_of.items():
+            code = encrypt_flat[cell1 * size + cell2]
+            encrypt_map[char1 + char2] = cells[code // size] + cells[code % size]
+            code = decrypt_flat[cell1 * size + cell2]
+            decrypt_map[char1 + char2] = cells[code // size] + cells[code % size]
+
+    key = {'table': table, 'cells': cells, 'cell_of': cell_of,
+           'encrypt_map': encrypt_map, 'decrypt_map': decrypt_map}
+    lru_put(playfair_keys_cache, cache_key, key)
+    return key
+
 def playfair_cipher(text, keyword, original_alphabet, filler_char='Я'):
     """
     Шифрует текст с помощью шифра Playfair.
     """
-    playfair_table = create_playfair_table(keyword, original_alphabet, 6, 6)
+    encrypt_map = compile_playfair_key(keyword, original_alphabet)['encrypt_map']
     bigrams = prepare_text_for_playfair(text, filler_char)
-    encrypted_text = ""
-    for bigram in bigrams:
-        encrypted_bigram = process_bigram(bigram, playfair_table, mode='encrypt')
-        encrypted_text += encrypted_bigram
+    # Биграммы с символами не из таблицы остаются без изменений (как в process_bigram)
+    encrypted_text = "".join(map(encrypt_map.get, bigrams, bigrams))
     return encrypted_text, bigrams # Возвращаем также подготовленные биграммы для отладки
 
 def playfair_decipher(text, keyword, original_alphabet, filler_char='Я'):
@@ -125,26 +239,512 @@ def playfair_decipher(text, keyword, original_alphabet, filler_char='Я'):
     Дешифрует текст, зашифрованный с помощью шифра Playfair.
     Возвращаемый текст будет включать вставленные filler_char.
     """
-    playfair_table = create_playfair_table(keyword, original_alphabet, 6, 6)
-    # Для дешифрования текст должен быть разбит на биграммы так же, как и при шифровании
-    # Т.е. он должен быть длиной, кратной 2, и не содержать пар одинаковых символов (до шифрования)
-    # Предполагаем, что входной 'text' - это корректный шифротекст (чётная длина, только символы из таблицы)
-    # Разобьём его на биграммы
-    cipher_bigrams = []
-    for j in range(0, len(text), 2):
-        bigram = text[j:j+2]
-        if len(bigram) == 2: # Убедимся, что биграмма полная
-             cipher_bigrams.append(bigram)
-
-    deciphered_text = ""
-    for bigram in cipher_bigrams:
-        deciphered_bigram = process_bigram(bigram, playfair_table, mode='decrypt')
-        deciphered_text += deciphered_bigram
-
+    decrypt_map = compile_playfair_key(keyword, original_alphabet)['decrypt_map']
+    # Текст разбивается на полные биграммы (последний непарный символ отбрасывается)
+    cipher_bigrams = list(map(str.__add__, text[0::2], text[1::2]))
     # Возвращаем дешифрованный текст (включая вставленные filler_char)
     # Пользователь должен вручную удалить лишние filler_char ('Я'), если они были вставлены.
-    return deciphered_text
+    return "".join(map(decrypt_map.get, cipher_bigrams, cipher_bigrams))
+
+def playfair_cipher_stream(chunks, keyword, original_alphabet, filler_char='Я'):
+    """
+    Потоково шифрует текст, заданный фрагментами (генератор зашифрованных фрагментов).
+    Склейка результата совпадает с первым элементом результата playfair_cipher.
+    """
+    encrypt_map = compile_playfair_key(keyword, original_alphabet)['encrypt_map']
+    for bigrams in prepare_text_for_playfair_stream(chunks, filler_char):
+        yield "".join(map(encrypt_map.get, bigrams, bigrams))
+
+def read_text_chunks(file_path, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Читает текстовый файл (UTF-8) фрагментами по chunk_size символов (генератор).
+    """
+    with open(file_path, encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+def playfair_cipher_file(input_path, output_path, keyword, original_alphabet, filler_char='Я', chunk_size=FILE_CHUNK_SIZE):
+    """
+    Шифрует текстовый файл потоково: в памяти одновременно находится только один фрагмент.
+
+    :return: Количество записанных символов шифротекста.
+    """
+    written = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        for encrypted_chunk in playfair_cipher_stream(read_text_chunks(input_path, chunk_size), keyword,
+                                                      original_alphabet, filler_char):
+            out.write(encrypted_chunk)
+            written += len(encrypted_chunk)
+    return written
+
+
+# Состояние процесса-исполнителя (заполняется в init_playfair_worker)
+playfair_worker_state = {}
+
+def init_playfair_worker(model, original_alphabet, shared_best_score=None, shared_best_cells=None):
+    """
+    Инициализирует процесс-исполнитель: таблица квадграмм строится один раз на процесс.
+    Для подбора ключа отжигом также передаётся общий результат (лучшая оценка и лучшая таблица).
+    """
+    playfair_worker_state['table'] = build_ngram_table(model, original_alphabet)
+    playfair_worker_state['alphabet'] = original_alphabet
+    playfair_worker_state['model'] = model
+    playfair_worker_state['best_score'] = shared_best_score
+    playfair_worker_state['best_cells'] = shared_best_cells
+
+# --- Криптоанализ: атака по словарю ключевых слов ---
+
+# Сколько первых символов шифротекста используется для отсеивающей оценки кандидатов
+DICTIONARY_SAMPLE_CHARS = 160
+
+def reduce_keyword(keyword, original_alphabet):
+    """
+    Оставляет в ключевом слове только первые вхождения букв алфавита (в верхнем регистре).
+    Ключевые слова с одинаковым результатом дают одну и ту же таблицу Playfair.
+    """
+    unique_letters = ""
+    for char in keyword.upper():
+        if char in original_alphabet and char not in unique_letters:
+            unique_letters += char
+    return unique_letters
+
+def load_wordlist(file_path):
+    """
+    Читает словарь ключевых слов: одно слово на строку, пустые строки пропускаются.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def build_keyword_trie(keywords, original_alphabet):
+    """
+    Строит префиксное дерево ключевых слов. Узел - словарь {'children': {буква: узел}, 'words': [...]}.
+    Путь от корня до узла - начало таблицы Playfair, общее для всех слов поддерева.
+    """
+    root = {'children': {}, 'words': []}
+    for keyword in keywords:
+        node = root
+        for letter in reduce_keyword(keyword, original_alphabet):
+            node = node['children'].setdefault(letter, {'children': {}, 'words': []})
+        node['words'].append(keyword)
+    return root
+
+def playfair_decrypt_with_table_alphabet(ciphertext, table_alphabet, cols=6):
+    """
+    Дешифрует текст по таблице Playfair, заданной строкой длины rows * cols
+    (те же правила, что и в process_bigram с mode='decrypt').
+    """
+    rows = len(table_alphabet) // cols
+    cells = {}
+    for index, char in enumerate(table_alphabet):
+        if char not in cells:
+            cells[char] = (index // cols, index % cols)
+
+    result = []
+    for j in range(0, len(ciphertext) - 1, 2):
+        char1, char2 = ciphertext[j], ciphertext[j + 1]
+        cell1, cell2 = cells.get(char1), cells.get(char2)
+        if cell1 is None or cell2 is None:
+            result.append(char1 + char2)
+            continue
+        (row1, col1), (row2, col2) = cell1, cell2
+        if row1 == row2:
+            result.append(table_alphabet[row1 * cols + (col1 - 1) % cols] + table_alphabet[row2 * cols + (col2 - 1) % cols])
+        elif col1 == col2:
+            result.append(table_alphabet[(row1 - 1) % rows * cols + col1] + table_alphabet[(row2 - 1) % rows * cols + col2])
+        else:
+            result.append(table_alphabet[row1 * cols + col2] + table_alphabet[row2 * cols + col1])
+    return "".join(result)
+
+def playfair_dictionary_worker(keywords, ciphertext_sample, top_count, rows=6, cols=6):
+    """
+    Обходит префиксное дерево части словаря и оценивает квадграммной моделью
+    дешифрование образца шифротекста по таблице каждого ключевого слова.
+
+    :return: Список лучших кандидатов (оценка, строка таблицы, ключевые слова).
+    """
+    original_alphabet = playfair_worker_state['alphabet']
+    table = playfair_worker_state['table']
+    best = []
+    counter = 0
+
+    stack = [(build_keyword_trie(keywords, original_alphabet), "", frozenset())]
+    while stack:
+        node, prefix, seen = stack.pop()
+        if node['words']:
+            table_alphabet = prefix + "".join(letter for letter in original_alphabet if letter not in seen)
+            table_alphabet = (table_alphabet + '-' * (rows * cols))[:rows * cols]
+            decrypted = playfair_decrypt_with_table_alphabet(ciphertext_sample, table_alphabet, cols)
+            score = score_indices(text_to_indices(decrypted, original_alphabet), table, len(original_alphabet))
+            counter += 1
+            item = (score, counter, table_alphabet, node['words'])
+            if len(best) < top_count:
+                heapq.heappush(best, item)
+            elif score > best[0][0]:
+                heapq.heapreplace(best, item)
+        for letter, child in node['children'].items():
+            stack.append((child, prefix + letter, seen | {letter}))
+
+    return [(score, table_alphabet, words) for score, _, table_alphabet, words in best]
+
+def playfair_dictionary_attack(ciphertext, keywords, original_alphabet, model=None, workers=None, top_count=10):
+    """
+    Атака по словарю на шифр Playfair.
+
+    Словарь делится по первой букве ключевого слова, каждая часть обходится как
+    отдельное префиксное дерево в своём процессе. Кандидаты отбираются по первым
+    DICTIONARY_SAMPLE_CHARS символам, лучшие из них переоцениваются по всему шифротексту.
+
+    :param ciphertext: Шифротекст (строка чётной длины).
+    :param keywords: Последовательность ключевых слов-кандидатов.
+    :param original_alphabet: Оригинальный алфавит (строка).
+    :param model: Модель квадграмм; по умолчанию строится по RUSSIAN_SAMPLE_TEXT.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param top_count: Сколько лучших кандидатов вернуть.
+    :return: Список кортежей (оценка, строка таблицы, ключевые слова) по убыванию оценки.
+    """
+    ciphertext = ciphertext.upper()
+    if len(ciphertext) < NGRAM_SIZE:
+        raise ValueError("Шифротекст слишком короткий для анализа.")
+    if model is None:
+        model = build_ngram_model(RUSSIAN_SAMPLE_TEXT, original_alphabet)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    groups = {}
+    for keyword in keywords:
+        groups.setdefault(reduce_keyword(keyword, original_alphabet)[:1], []).append(keyword)
+    parts = [[] for _ in range(workers)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(parts, key=len).extend(group)
+
+    sample = ciphertext[:DICTIONARY_SAMPLE_CHARS]
+    candidates = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_playfair_worker,
+                             initargs=(model, original_alphabet)) as executor:
+        futures = [executor.submit(playfair_dictionary_worker, part, sample, top_count) for part in parts if part]
+        for future in futures:
+            candidates.extend(future.result())
+
+    table = build_ngram_table(model, original_alphabet)
+    results = []
+    for _, table_alphabet, words in candidates:
+        decrypted = playfair_decrypt_with_table_alphabet(ciphertext, table_alphabet)
+        results.append((score_indices(text_to_indices(decrypted, original_alphabet), table, len(original_alphabet)),
+                        table_alphabet, words))
+    results.sort(key=lambda item: item[0], reverse=True)
+    return results[:top_count]
+
+
+# --- Криптоанализ: подбор таблицы методом имитации отжига ---
+
+# Размеры таблицы Playfair и символ пустых клеток (как в create_playfair_table)
+PLAYFAIR_ROWS = 6
+PLAYFAIR_COLS = 6
+PLAYFAIR_EMPTY_CELL = '-'
+
+# Пара клеток -> пара клеток при дешифровании (зависит только от положения клеток, не от ключа)
+PLAYFAIR_DECRYPT_CELLS = [playfair_bigram_cells(cell1, cell2, PLAYFAIR_ROWS, PLAYFAIR_COLS, -1)
+                          for cell1 in range(PLAYFAIR_ROWS * PLAYFAIR_COLS)
+                          for cell2 in range(PLAYFAIR_ROWS * PLAYFAIR_COLS)]
+
+# Доли ходов отжига (границы для одного случайного числа из [0, 1)): обмен двух клеток,
+# обмен строк, обмен столбцов (остальное - транспонирование); сейчас 90% / 4% / 4% / 2%
+ANNEALING_SWAP_SHARE = 0.9
+ANNEALING_ROW_SHARE = 0.94
+ANNEALING_COLUMN_SHARE = 0.98
+
+# Начальная и конечная температура отжига (в единицах log10 оценки) для текста длины
+# ANNEALING_REFERENCE_LENGTH; изменение оценки при ходе растёт с длиной текста,
+# поэтому температура масштабируется пропорционально длине
+ANNEALING_START_TEMPERATURE = 30.0
+ANNEALING_END_TEMPERATURE = 3.0
+ANNEALING_REFERENCE_LENGTH = 400
+
+# Раз в столько ходов цепочка публикует свой лучший результат и, если другие процессы
+# нашли таблицу лучше, продолжает отжиг с неё
+ANNEALING_SYNC_INTERVAL = 50000
+
+def publish_best_cells(score, cells):
+    """
+    Записывает таблицу в общий результат, если она лучше найденной другими процессами.
+    """
+    shared_best_score = playfair_worker_state.get('best_score')
+    if shared_best_score is None:
+        return
+    with shared_best_score.get_lock():
+        if score > shared_best_score.value:
+            shared_best_score.value = score
+            playfair_worker_state['best_cells'][:] = cells
+
+def fetch_best_cells():
+    """
+    Возвращает лучший общий результат (оценка, таблица) или None, если общего результата нет.
+    """
+    shared_best_score = playfair_worker_state.get('best_score')
+    if shared_best_score is None:
+        return None
+    with shared_best_score.get_lock():
+        return shared_best_score.value, list(playfair_worker_state['best_cells'])
+
+def playfair_structural_move(cells, move, rng):
+    """
+    Возвращает новую таблицу после крупного хода: обмена двух строк, обмена двух столбцов
+    или транспонирования. Вид хода выбирается по тому же случайному числу move, по которому
+    отжиг решил сделать крупный ход (move >= ANNEALING_SWAP_SHARE).
+    """
+    new_cells = cells[:]
+    if move < ANNEALING_ROW_SHARE:
+        row1, row2 = rng.sample(range(PLAYFAIR_ROWS), 2)
+        for col in range(PLAYFAIR_COLS):
+            new_cells[row1 * PLAYFAIR_COLS + col] = cells[row2 * PLAYFAIR_COLS + col]
+            new_cells[row2 * PLAYFAIR_COLS + col] = cells[row1 * PLAYFAIR_COLS + col]
+    elif move < ANNEALING_COLUMN_SHARE:
+        col1, col2 = rng.sample(range(PLAYFAIR_COLS), 2)
+        for row in range(PLAYFAIR_ROWS):
+            new_cells[row * PLAYFAIR_COLS + col1] = cells[row * PLAYFAIR_COLS + col2]
+            new_cells[row * PLAYFAIR_COLS + col2] = cells[row * PLAYFAIR_COLS + col1]
+    else:
+        for row in range(PLAYFAIR_ROWS):
+            for col in range(PLAYFAIR_COLS):
+                new_cells[row * PLAYFAIR_COLS + col] = cells[col * PLAYFAIR_COLS + row]
+    return new_cells
+
+def normalize_playfair_cells(cells, empty_symbol):
+    """
+    Циклический сдвиг строк и столбцов не меняет шифр Playfair. Если среди сдвигов
+    найденной таблицы есть такой, где пустые клетки стоят в конце (как в create_playfair_table),
+    возвращает его; иначе - таблицу без изменений.
+    """
+    empty_count = cells.count(empty_symbol)
+    for row_shift in range(PLAYFAIR_ROWS):
+        for col_shift in range(PLAYFAIR_COLS):
+            shifted = [cells[(row + row_shift) % PLAYFAIR_ROWS * PLAYFAIR_COLS + (col + col_shift) % PLAYFAIR_COLS]
+                       for row in range(PLAYFAIR_ROWS) for col in range(PLAYFAIR_COLS)]
+            if shifted[len(shifted) - empty_count:].count(empty_symbol) == empty_count:
+                return shifted
+    return cells
+
+def playfair_anneal(cipher_pairs, chains, iterations, seed):
+    """
+    Подбирает таблицу Playfair имитацией отжига.
+
+    Таблица - список cells символов (индексы букв алфавита, пустая клетка - len(alphabet)).
+    Основной ход - обмен двух клеток: при нём заново дешифруются только биграммы,
+    в которых встречаются эти символы или результат которых попадает в эти клетки,
+    и пересчитываются только квадграммы, накрывающие изменённые позиции текста.
+    Обмены строк, столбцов и транспонирование оцениваются полным пересчётом.
+    Пустые клетки двигаются наравне с буквами: так у ключа остаются все 36 равноценных
+    циклических сдвигов, и отжиг находит один из них заметно быстрее.
+
+    :param cipher_pairs: Биграммы шифротекста в виде пар индексов символов.
+    :param chains: Количество независимых запусков отжига.
+    :param iterations: Количество ходов в каждом запуске.
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Кортеж (лучшая оценка, лучшая таблица cells).
+    """
+    original_alphabet = playfair_worker_state['alphabet']
+    if 'symbol_table' not in playfair_worker_state:
+        # Квадграммы с пустой клеткой получают минимальную оценку
+        playfair_worker_state['symbol_table'] = build_ngram_table(playfair_worker_state['model'],
+                                                                  original_alphabet + PLAYFAIR_EMPTY_CELL)
+    table = playfair_worker_state['symbol_table']
+    empty_symbol = len(original_alphabet)
+    symbol_count = empty_symbol + 1
+    cell_count = PLAYFAIR_ROWS * PLAYFAIR_COLS
+    w1, w2, w3 = symbol_count ** 3, symbol_count ** 2, symbol_count
+    decrypt_cells = PLAYFAIR_DECRYPT_CELLS
+    rng = random.Random(seed)
+
+    pair_count = len(cipher_pairs)
+    text_length = 2 * pair_count
+    pairs_by_symbol = [[] for _ in range(symbol_count)]
+    for k, (symbol1, symbol2) in enumerate(cipher_pairs):
+        pairs_by_symbol[symbol1].append(k)
+        if symbol2 != symbol1:
+            pairs_by_symbol[symbol2].append(k)
+    windows_by_pair = [tuple(range(max(0, 2 * k - 3), min(2 * k + 1, text_length - 4) + 1)) for k in range(pair_count)]
+
+    def quadgram_scores(plain, windows):
+        return [table[plain[i] * w1 + plain[i + 1] * w2 + plain[i + 2] * w3 + plain[i + 3]] for i in windows]
+
+    def symbol_positions(cells):
+        # Символ шифротекста ищется по первому вхождению (как в get_coordinates_playfair)
+        position = [0] * symbol_count
+        for cell in range(cell_count - 1, -1, -1):
+            position[cells[cell]] = cell
+        return position
+
+    best_score = float('-inf')
+    best_cells = None
+    for _ in range(chains):
+        cells = list(range(empty_symbol)) + [empty_symbol] * (cell_count - empty_symbol)
+        rng.shuffle(cells)
+
+        start_temperature = ANNEALING_START_TEMPERATURE * text_length / ANNEALING_REFERENCE_LENGTH
+        temperature_ratio = ANNEALING_END_TEMPERATURE / ANNEALING_START_TEMPERATURE
+        rebuild = True
+        for iteration in range(iterations):
+            if rebuild:
+                # Полное дешифрование: положение символов, результат каждой биграммы, текст
+                position = symbol_positions(cells)
+                outputs = [decrypt_cells[position[symbol1] * cell_count + position[symbol2]]
+                           for symbol1, symbol2 in cipher_pairs]
+                pairs_by_output = [set() for _ in range(cell_count)]
+                plain = [0] * text_length
+                for k, (cell1, cell2) in enumerate(outputs):
+                    pairs_by_output[cell1].add(k)
+                    pairs_by_output[cell2].add(k)
+                    plain[2 * k] = cells[cell1]
+                    plain[2 * k + 1] = cells[cell2]
+                # Оценка каждой квадграммы хранится отдельно: старая часть оценки берётся из списка
+                window_scores = quadgram_scores(plain, range(text_length - 3))
+                score = sum(window_scores)
+                rebuild = False
+
+            if iteration and iteration % ANNEALING_SYNC_INTERVAL == 0:
+                publish_best_cells(best_score, best_cells)
+                shared = fetch_best_cells()
+                if shared is not None and shared[0] > best_score:
+                    cells = shared[1]
+                    rebuild = True
+                    continue
+
+            temperature = start_temperature * temperature_ratio ** (iteration / iterations)
+
+            move = rng.random()
+            if move >= ANNEALING_SWAP_SHARE:
+                new_cells = playfair_structural_move(cells, move, rng)
+                new_position = symbol_positions(new_cells)
+                new_plain = [0] * text_length
+                for k, (symbol1, symbol2) in enumerate(cipher_pairs):
+                    cell1, cell2 = decrypt_cells[new_position[symbol1] * cell_count + new_position[symbol2]]
+                    new_plain[2 * k] = new_cells[cell1]
+                    new_plain[2 * k + 1] = new_cells[cell2]
+                delta = score_indices(new_plain, table, symbol_count) - score
+                if delta >= 0 or rng.random() < math.exp(delta / temperature):
+                    cells = new_cells
+                    rebuild = True
+                    if score + delta > best_score:
+                        best_score, best_cells = score + delta, cells[:]
+                continue
+
+            cell_a = int(rng.random() * cell_count)
+            cell_b = int(rng.random() * (cell_count - 1))
+            if cell_b >= cell_a:
+                cell_b += 1
+            symbol_a, symbol_b = cells[cell_a], cells[cell_b]
+            if symbol_a == symbol_b:
+                continue # Обмен двух пустых клеток ничего не меняет
+            affected = set(pairs_by_symbol[symbol_a])
+            affected.update(pairs_by_symbol[symbol_b], pairs_by_output[cell_a], pairs_by_output[cell_b])
+            windows = set()
+            for k in affected:
+                windows.update(windows_by_pair[k])
+            old_part = sum(map(window_scores.__getitem__, windows))
+
+            cells[cell_a], cells[cell_b] = symbol_b, symbol_a
+            old_position_a, old_position_b = position[symbol_a], position[symbol_b]
+            position[symbol_a], position[symbol_b] = cell_b, cell_a
+            if empty_symbol in (symbol_a, symbol_b):
+                position[empty_symbol] = cells.index(empty_symbol)
+            saved = []
+            for k in affected:
+                symbol1, symbol2 = cipher_pairs[k]
+                cell1, cell2 = new_output = decrypt_cells[position[symbol1] * cell_count + position[symbol2]]
+                saved.append((k, outputs[k], new_output))
+                outputs[k] = new_output
+                plain[2 * k] = cells[cell1]
+                plain[2 * k + 1] = cells[cell2]
+            new_scores = quadgram_scores(plain, windows)
+            delta = sum(new_scores) - old_part
+
+            if delta >= 0 or rng.random() < math.exp(delta / temperature):
+                score += delta
+                for i, window_score in zip(windows, new_scores):
+                    window_scores[i] = window_score
+                for k, old_output, new_output in saved:
+                    pairs_by_output[old_output[0]].discard(k)
+                    pairs_by_output[old_output[1]].discard(k)
+                for k, old_output, new_output in saved:
+                    pairs_by_output[new_output[0]].add(k)
+                    pairs_by_output[new_output[1]].add(k)
+                if score > best_score:
+                    best_score, best_cells = score, cells[:]
+            else:
+                # Ход отклонён - возвращаем клетки, результаты биграмм и текст
+                cells[cell_a], cells[cell_b] = symbol_a, symbol_b
+                position[symbol_a], position[symbol_b] = old_position_a, old_position_b
+                for k, old_output, new_output in saved:
+                    outputs[k] = old_output
+                    plain[2 * k] = cells[old_output[0]]
+                    plain[2 * k + 1] = cells[old_output[1]]
+
+        publish_best_cells(best_score, best_cells)
 
+    return best_score, best_cells
+
+def guess_playfair_keyword(table_alphabet, original_alphabet):
+    """
+    Выделяет вероятные буквы ключевого слова из строки таблицы: после них
+    остальные буквы алфавита идут в исходном порядке.
+    """
+    letters = table_alphabet.replace(PLAYFAIR_EMPTY_CELL, "")
+    start = len(letters)
+    while start > 1 and original_alphabet.index(letters[start - 2]) < original_alphabet.index(letters[start - 1]):
+        start -= 1
+    return letters[:start - 1] if start > 1 else ""
+
+def playfair_solve(ciphertext, original_alphabet, model=None, workers=None, chains_per_worker=1,
+                   iterations=400000, seed=None):
+    """
+    Восстанавливает таблицу Playfair только по шифротексту.
+
+    Независимые цепочки отжига распределяются по процессам ProcessPoolExecutor;
+    каждый процесс записывает лучшую найденную таблицу в общий результат.
+    Биграммы шифротекста с символами не из таблицы (пробелы, знаки) пропускаются.
+
+    :param ciphertext: Шифротекст (строка).
+    :param original_alphabet: Оригинальный алфавит (строка из 33 букв).
+    :param model: Модель квадграмм; по умолчанию строится по RUSSIAN_SAMPLE_TEXT.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param chains_per_worker: Количество цепочек отжига в каждом процессе.
+    :param iterations: Количество ходов в каждой цепочке.
+    :param seed: Начальное значение генератора случайных чисел (для воспроизводимости).
+    :return: Кортеж (строка таблицы, дешифрованный текст, оценка).
+    """
+    symbols = original_alphabet + PLAYFAIR_EMPTY_CELL
+    if len(original_alphabet) > PLAYFAIR_ROWS * PLAYFAIR_COLS:
+        raise ValueError("Алфавит не помещается в таблицу Playfair.")
+    symbol_index = {symbol: index for index, symbol in enumerate(symbols)}
+    ciphertext_upper = ciphertext.upper()
+    cipher_pairs = [(symbol_index[char1], symbol_index[char2])
+                    for char1, char2 in zip(ciphertext_upper[0::2], ciphertext_upper[1::2])
+                    if char1 in symbol_index and char2 in symbol_index]
+    if 2 * len(cipher_pairs) < NGRAM_SIZE:
+        raise ValueError("Шифротекст слишком короткий для анализа.")
+    if model is None:
+        model = build_ngram_model(RUSSIAN_SAMPLE_TEXT, original_alphabet)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    shared_best_score = multiprocessing.Value('d', float('-inf'))
+    shared_best_cells = multiprocessing.Array('i', PLAYFAIR_ROWS * PLAYFAIR_COLS)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_playfair_worker,
+                             initargs=(model, original_alphabet, shared_best_score, shared_best_cells)) as executor:
+        futures = [executor.submit(playfair_anneal, cipher_pairs, chains_per_worker, iterations, seed + worker)
+                   for worker in range(workers)]
+        for future in futures:
+            future.result()
+
+    best_cells = normalize_playfair_cells(list(shared_best_cells), len(original_alphabet))
+    table_alphabet = "".join(symbols[symbol] for symbol in best_cells)
+    decrypted = playfair_decrypt_with_table_alphabet(ciphertext_upper, table_alphabet, PLAYFAIR_COLS)
+    return table_alphabet, decrypted, shared_best_score.value
 
 def encrypt_action():
     text = input_text.get()
@@ -227,52 +827,164 @@ def decrypt_action():
     output_text.insert(tk.END, f"Их нужно вручную удалить для получения осмысленного текста.\n")
 
 
+def encrypt_file_action():
+    keyword = keyword_entry.get()
+    filler = filler_entry.get()
+
+    if not keyword:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите ключевое слово.\n")
+        return
+    if len(filler) != 1 or filler not in alphabet:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Заполнитель должен быть одной буквой из алфавита.\n")
+        return
+
+    input_path = filedialog.askopenfilename(title="Выберите текстовый файл для шифрования")
+    if not input_path:
+        return
+    output_path = filedialog.asksaveasfilename(title="Сохранить зашифрованный файл как")
+    if not output_path:
+        return
+
+    try:
+        written = playfair_cipher_file(input_path, output_path, keyword, alphabet, filler)
+    except (OSError, UnicodeDecodeError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при шифровании файла: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Файл зашифрован: {input_path} -> {output_path}\n")
+    output_text.insert(tk.END, f"Ключ: {keyword}\n")
+    output_text.insert(tk.END, f"Заполнитель: {filler}\n")
+    output_text.insert(tk.END, f"Записано символов шифротекста: {written}\n")
+
+def break_action():
+    ciphertext = input_text.get()
+
+    if not ciphertext:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите шифротекст для подбора таблицы.\n")
+        return
+
+    # Отжиг идёт десятки секунд, поэтому выполняется в фоновом потоке (см. background_task.py)
+    background_task.run_in_background(background_state, lambda: playfair_solve(ciphertext, alphabet),
+                                      lambda result: show_break_result(ciphertext, *result),
+                                      "Идёт подбор таблицы (отжиг)", "при подборе таблицы")
+
+def show_break_result(ciphertext, table_alphabet, decrypted, score):
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение: {ciphertext}\n")
+    output_text.insert(tk.END, "Найденная таблица Playfair:\n")
+    for row in range(PLAYFAIR_ROWS):
+        output_text.insert(tk.END, f"{list(table_alphabet[row * PLAYFAIR_COLS:(row + 1) * PLAYFAIR_COLS])}\n")
+    output_text.insert(tk.END, f"Вероятные буквы ключевого слова: {guess_playfair_keyword(table_alphabet, alphabet)}\n")
+    output_text.insert(tk.END, f"Оценка (сумма log10 вероятностей квадграмм): {score:.2f}\n")
+    output_text.insert(tk.END, f"Дешифрованное сообщение (включая заполнители): {decrypted}\n")
+    output_text.insert(tk.END, "Примечание: таблица может отличаться от исходной циклическим сдвигом строк и столбцов; "
+                               "на коротких текстах результат может быть неточным.\n")
+
+def dictionary_attack_action():
+    ciphertext = input_text.get()
+
+    if not ciphertext:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите шифротекст для атаки по словарю.\n")
+        return
+
+    wordlist_path = filedialog.askopenfilename(title="Выберите словарь ключевых слов (одно слово на строку)")
+    if not wordlist_path:
+        return
+
+    try:
+        keywords = load_wordlist(wordlist_path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при атаке по словарю: {e}\n")
+        return
+
+    # Атака запускает процессы и на большом словаре идёт долго, поэтому выполняется в фоновом потоке
+    background_task.run_in_background(background_state, lambda: playfair_dictionary_attack(ciphertext, keywords, alphabet),
+                                      lambda results: show_dictionary_result(ciphertext, keywords, results),
+                                      "Идёт атака по словарю", "при атаке по словарю")
+
+def show_dictionary_result(ciphertext, keywords, results):
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение: {ciphertext}\n")
+    output_text.insert(tk.END, f"Проверено ключевых слов: {len(keywords)}\n")
+    output_text.insert(tk.END, "Лучшие кандидаты:\n")
+    for score, table_alphabet, words in results:
+        output_text.insert(tk.END, f"  {', '.join(words[:5])}: оценка {score:.2f}, таблица {table_alphabet}\n")
+    if results:
+        best_keyword = results[0][2][0]
+        output_text.insert(tk.END, f"Дешифрованное сообщение (ключ '{best_keyword}'): "
+                                   f"{playfair_decipher(ciphertext, best_keyword, alphabet)}\n")
+
 # --- Создание графического интерфейса ---
-root = tk.Tk()
-root.title("Шифр Playfair (Шифрование и Дешифрование)")
-root.geometry("850x650")
+# Окно создаётся только при запуске файла как программы: процессы-исполнители
+# ProcessPoolExecutor импортируют этот модуль повторно и не должны открывать своё окно.
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Шифр Playfair (Шифрование и Дешифрование)")
+    root.geometry("850x650")
+
+    # --- Виджеты ---
+
+    # Ввод текста
+    input_label = ttk.Label(root, text="Введите текст:")
+    input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+    input_text = ttk.Entry(root, width=70)
+    input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+
+    # Ввод ключа
+    keyword_label = ttk.Label(root, text="Введите ключевое слово:")
+    keyword_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+
+    keyword_entry = ttk.Entry(root, width=30)
+    keyword_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
 
-# --- Виджеты ---
+    # Ввод заполнителя
+    filler_label = ttk.Label(root, text="Введите символ-заполнитель (по умолчанию 'Я'):")
+    filler_label.grid(row=2, column=1, padx=10, pady=5, sticky="w")
 
-# Ввод текста
-input_label = ttk.Label(root, text="Введите текст:")
-input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+    filler_entry = ttk.Entry(root, width=5)
+    filler_entry.insert(0, "Я") # Значение по умолчанию
+    filler_entry.grid(row=3, column=1, padx=10, pady=5, sticky="w")
 
-input_text = ttk.Entry(root, width=70)
-input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    # Кнопки
+    encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
+    encrypt_button.grid(row=4, column=0, padx=10, pady=10, sticky="w")
 
-# Ввод ключа
-keyword_label = ttk.Label(root, text="Введите ключевое слово:")
-keyword_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+    decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
+    decrypt_button.grid(row=4, column=1, padx=10, pady=10, sticky="e")
 
-keyword_entry = ttk.Entry(root, width=30)
-keyword_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+    extra_buttons_frame = ttk.Frame(root)
+    extra_buttons_frame.grid(row=5, column=1, padx=10, pady=5, sticky="e")
 
-# Ввод заполнителя
-filler_label = ttk.Label(root, text="Введите символ-заполнитель (по умолчанию 'Я'):")
-filler_label.grid(row=2, column=1, padx=10, pady=5, sticky="w")
+    encrypt_file_button = ttk.Button(extra_buttons_frame, text="Зашифровать файл...", command=encrypt_file_action)
+    encrypt_file_button.pack(side=tk.LEFT, padx=(0, 10))
 
-filler_entry = ttk.Entry(root, width=5)
-filler_entry.insert(0, "Я") # Значение по умолчанию
-filler_entry.grid(row=3, column=1, padx=10, pady=5, sticky="w")
+    dictionary_button = ttk.Button(extra_buttons_frame, text="Атака по словарю...", command=dictionary_attack_action)
+    dictionary_button.pack(side=tk.LEFT, padx=(0, 10))
 
-# Кнопки
-encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
-encrypt_button.grid(row=4, column=0, padx=10, pady=10, sticky="w")
+    break_button = ttk.Button(extra_buttons_frame, text="Подобрать таблицу (отжиг)", command=break_action)
+    break_button.pack(side=tk.LEFT)
 
-decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
-decrypt_button.grid(row=4, column=1, padx=10, pady=10, sticky="e")
+    # Вывод результата
+    output_label = ttk.Label(root, text="Результат:")
+    output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
 
-# Вывод результата
-output_label = ttk.Label(root, text="Результат:")
-output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+    output_text = scrolledtext.ScrolledText(root, width=100, height=35)
+    output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
 
-output_text = scrolledtext.ScrolledText(root, width=100, height=35)
-output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+    # Состояние фоновых операций (см. background_task.py): пока идёт подбор или атака, их кнопки отключены
+    background_state = background_task.create_task_state(root, output_text, [break_button, dictionary_button])
 
-# --- Настройка сетки ---
-root.grid_rowconfigure(6, weight=1)
-root.grid_columnconfigure(0, weight=1)
+    # --- Настройка сетки ---
+    root.grid_rowconfigure(6, weight=1)
+    root.grid_columnconfigure(0, weight=1)
 
-# Запуск главного цикла
-root.mainloop()
+    # Запуск главного цикла
+    root.mainloop()
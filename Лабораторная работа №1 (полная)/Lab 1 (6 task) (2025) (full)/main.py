@@ -1,6 +1,20 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, filedialog
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from math import lcm
+import math
+import multiprocessing
+import os
 import random
+import re
+import struct
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import background_task
+from ngram_model import NGRAM_SIZE, RUSSIAN_SAMPLE_TEXT, build_ngram_model, build_ngram_table
 
 # Определяем русский алфавит
 alphabet = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
@@ -29,55 +43,548 @@ def omophonic_cipher(text, homophonic_table, use_random=False):
     """
     Шифрует текст с помощью системы омофонов.
     """
-    text_upper = text.upper()
-    encrypted_text_parts = []
-    cycle_counter = 0
+    key = compile_homophonic_key(homophonic_table)
+    codes = omophonic_encode_codes(text, key, use_random)
+    # Каждый код превращается в "NNN " одним проходом translate, последний пробел отбрасывается
+    return codes.translate(key['code_tokens'])[:-1]
 
-    for char in text_upper:
-        if char in homophonic_table:
-            available_omophones = homophonic_table[char]
-            selected_omoph = None
-            if use_random:
-                selected_omoph = random.choice(available_omophones)
-            else:
-                selected_omoph = available_omophones[cycle_counter % len(available_omophones)]
-                cycle_counter += 1
-            encrypted_text_parts.append(str(selected_omoph))
-        # else: # Символ не найден, пропускаем
-        #     pass
+# Количество возможных трёхзначных шифрозамен (коды 0..999, используются 100..999)
+OMOPHONE_SLOTS = 1000
 
-    encrypted_text = " ".join(encrypted_text_parts)
-    return encrypted_text
+# Максимальное число скомпилированных ключей в кэше (вытесняются давно не использованные):
+# каждое нажатие 'Сгенерировать новую таблицу' даёт новую таблицу и новый ключ
+HOMOPHONIC_CACHE_SIZE = 16
 
-def omophonic_decipher(encrypted_text, homophonic_table):
+# Кэш скомпилированных ключей: содержимое таблицы омофонов -> ключ
+homophonic_keys_cache = OrderedDict()
+
+def lru_get(cache, key):
     """
-    Дешифрует текст, зашифрованный с помощью системы омофонов.
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
     """
-    # Разбиваем строку шифротекста по пробелам
-    omophones_list = encrypted_text.split()
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении HOMOPHONIC_CACHE_SIZE.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > HOMOPHONIC_CACHE_SIZE:
+        cache.popitem(last=False)
+
+# Наибольшее число фаз (НОК длин списков омофонов), при котором работает пакетное шифрование
+MAX_ENCODE_PHASES = 64
+
+def compile_homophonic_key(homophonic_table):
+    """
+    Компилирует таблицу омофонов для дешифрования.
+
+    :param homophonic_table: Таблица омофонов (буква -> список шифрозамен).
+    :return: Словарь с полями
+             'letters' - список длины OMOPHONE_SLOTS: код -> буква ('' для неиспользуемых кодов),
+             'token_map' - строка кода (как её выводит omophonic_cipher) -> буква,
+             'char_map' - символ с кодом омофона -> буква (для двоичного формата),
+             'code_tokens' - таблица translate: код -> "NNN ",
+             'phases' - НОК длин списков омофонов (период циклического выбора),
+             'letter_indices', 'letter_filter', 'phase_codes', 'bulk' - данные для пакетного шифрования.
+    """
+    cache_key = tuple((letter, tuple(omophones)) for letter, omophones in homophonic_table.items())
+    key = lru_get(homophonic_keys_cache, cache_key)
+    if key is not None:
+        return key
 
-    deciphered_text = ""
-    # Создаём обратный словарь: омофон -> буква
-    # Это ускоряет поиск
-    reverse_table = {}
+    letters = [''] * OMOPHONE_SLOTS
     for letter, omophones in homophonic_table.items():
         for omophone in omophones:
-            reverse_table[omophone] = letter
+            letters[omophone] = letter
+    token_map = {str(code): letter for code, letter in enumerate(letters) if letter}
+
+    # Данные для пакетного шифрования. Буква кодируется номером (один байт), номер фазы
+    # выбора омофона - вторым байтом; пара байтов читается как один символ UTF-16, который
+    # translate сразу переводит в символ с кодом омофона.
+    key_letters = "".join(homophonic_table)
+    phases = lcm(*(len(omophones) for omophones in homophonic_table.values())) if homophonic_table else 1
+    phase_codes = {}
+    for letter_index, (letter, omophones) in enumerate(homophonic_table.items()):
+        for phase in range(phases):
+            phase_codes[letter_index + (phase << 8)] = chr(omophones[phase % len(omophones)])
+
+    key = {
+        'letters': letters,
+        'token_map': token_map,
+        'char_map': {chr(code): letter for code, letter in enumerate(letters) if letter},
+        'code_tokens': {code: f"{code} " for code, letter in enumerate(letters) if letter},
+        'phases': phases,
+        'letter_indices': {ord(letter): letter_index for letter_index, letter in enumerate(key_letters)},
+        'letter_filter': re.compile(f"[^{re.escape(key_letters)}]") if key_letters else re.compile(r"(?s:.)"),
+        'phase_codes': phase_codes,
+        'bulk': len(key_letters) <= 256 and phases <= MAX_ENCODE_PHASES,
+    }
+    lru_put(homophonic_keys_cache, cache_key, key)
+    return key
+
+def random_phases(count, phases, rng=random):
+    """
+    Возвращает count случайных равновероятных номеров фаз 0..phases-1 (по байту на номер).
+    Байты, нарушающие равномерность (не меньше наибольшего кратного phases), отбрасываются.
+    """
+    limit = 256 - 256 % phases
+    rejected = bytes(range(limit, 256))
+    reduce_table = bytes(value % phases for value in range(256))
+    drawn = b""
+    while len(drawn) < count:
+        drawn += rng.randbytes(count - len(drawn) + (count >> 3) + 16).translate(None, rejected)
+    return drawn[:count].translate(reduce_table)
+
+def omophonic_encode_codes(text, key, use_random=False, start=0, rng=random):
+    """
+    Пакетно шифрует текст и возвращает строку, где каждый символ - код омофона (ord(символ) = код).
 
-    for omophone_str in omophones_list:
+    :param text: Исходный текст (символы вне таблицы пропускаются).
+    :param key: Ключ из compile_homophonic_key.
+    :param use_random: Случайный выбор омофона вместо циклического.
+    :param start: Значение cycle_counter перед первой буквой (для потокового шифрования).
+    :param rng: Генератор случайных чисел для случайного режима.
+    """
+    letters_only = key['letter_filter'].sub("", text.upper())
+    count = len(letters_only)
+    phases = key['phases']
+    if not key['bulk']:
+        # Слишком много фаз для двухбайтовой схемы - по одной букве
+        letter_indices = key['letter_indices']
+        phase_codes = key['phase_codes']
+        return "".join(
+            phase_codes[letter_indices[ord(char)] + ((rng.randrange(phases) if use_random else (start + i) % phases) << 8)]
+            for i, char in enumerate(letters_only))
+
+    if use_random:
+        phase_bytes = random_phases(count, phases, rng)
+    else:
+        period = bytes(range(phases))
+        offset = start % phases
+        phase_bytes = (period[offset:] + period * (count // phases + 1))[:count]
+
+    pairs = bytearray(2 * count)
+    pairs[0::2] = letters_only.translate(key['letter_indices']).encode("latin-1")
+    pairs[1::2] = phase_bytes
+    return pairs.decode("utf-16-le").translate(key['phase_codes'])
+
+def omophonic_decode_tokens(omophones_list, key):
+    """
+    Переводит список кодов-строк в текст, проверяя каждый код.
+    Медленный путь omophonic_decipher: принимает любую запись числа, которую понимает int(),
+    и сообщает позицию (с 1) первого неверного кода.
+    """
+    letters = key['letters']
+    deciphered_chars = []
+    for position, omophone_str in enumerate(omophones_list, start=1):
         try:
             # Пытаемся преобразовать строку в число
             omophone_int = int(omophone_str)
         except ValueError:
-            raise ValueError(f"Неверный формат омофона: '{omophone_str}'. Ожидаются числа, разделённые пробелами.")
+            raise ValueError(f"Неверный формат омофона: '{omophone_str}' (позиция {position}). "
+                             f"Ожидаются числа, разделённые пробелами.")
 
         # Ищем букву, соответствующую омофону
-        if omophone_int in reverse_table:
-            deciphered_text += reverse_table[omophone_int]
-        else:
-            raise ValueError(f"Омофон '{omophone_int}' не найден в текущей таблице омофонов.")
+        letter = letters[omophone_int] if 0 <= omophone_int < OMOPHONE_SLOTS else ''
+        if not letter:
+            raise ValueError(f"Омофон '{omophone_int}' (позиция {position}) не найден в текущей таблице омофонов.")
+        deciphered_chars.append(letter)
+    return "".join(deciphered_chars)
+
+def omophonic_decipher(encrypted_text, homophonic_table):
+    """
+    Дешифрует текст, зашифрованный с помощью системы омофонов.
+    """
+    key = compile_homophonic_key(homophonic_table)
+    # Разбиваем строку шифротекста по пробелам
+    omophones_list = encrypted_text.split()
+    # Быстрый путь: все коды записаны так же, как их выводит omophonic_cipher
+    try:
+        return "".join(map(key['token_map'].__getitem__, omophones_list))
+    except KeyError:
+        return omophonic_decode_tokens(omophones_list, key)
+
+# Двоичный формат шифротекста: заголовок HOMOPHONIC_HEADER (сигнатура, версия),
+# затем коды омофонов по два байта (uint16, little-endian) - вдвое меньше текстового вида "NNN ".
+HOMOPHONIC_MAGIC = b"OMPH"
+HOMOPHONIC_VERSION = 1
+HOMOPHONIC_HEADER = struct.Struct(">4sB")
+
+FILE_CHUNK_SIZE = 1024 * 1024 # Размер блока при чтении/записи файла (символов или байт)
+
+def omophonic_decode_codes(codes, key, offset=0):
+    """
+    Дешифрует строку кодов (ord(символ) = код) в текст.
+
+    :param offset: Число кодов перед этим фрагментом (для номера позиции в сообщении об ошибке).
+    """
+    try:
+        return "".join(map(key['char_map'].__getitem__, codes))
+    except KeyError:
+        for position, code_char in enumerate(codes, start=offset + 1):
+            if code_char not in key['char_map']:
+                raise ValueError(f"Омофон '{ord(code_char)}' (позиция {position}) не найден в текущей таблице омофонов.")
+        raise
+
+def write_homophonic_codes(file, text_chunks, homophonic_table, use_random=False, rng=random):
+    """
+    Потоково шифрует текст и записывает коды омофонов в двоичном формате (с заголовком).
+
+    :param file: Файл, открытый для записи в двоичном режиме.
+    :param text_chunks: Итерируемый набор фрагментов исходного текста.
+    :return: Количество записанных кодов.
+    """
+    key = compile_homophonic_key(homophonic_table)
+    file.write(HOMOPHONIC_HEADER.pack(HOMOPHONIC_MAGIC, HOMOPHONIC_VERSION))
+    codes_written = 0
+    for chunk in text_chunks:
+        codes = omophonic_encode_codes(chunk, key, use_random, codes_written, rng)
+        file.write(codes.encode("utf-16-le"))
+        codes_written += len(codes)
+    return codes_written
+
+def read_homophonic_header(file):
+    """
+    Читает и проверяет заголовок двоичного файла омофонов.
+    """
+    raw = file.read(HOMOPHONIC_HEADER.size)
+    if len(raw) != HOMOPHONIC_HEADER.size:
+        raise ValueError("Файл слишком короткий: нет заголовка.")
+    magic, version = HOMOPHONIC_HEADER.unpack(raw)
+    if magic != HOMOPHONIC_MAGIC:
+        raise ValueError("Файл не является двоичным файлом омофонов.")
+    if version != HOMOPHONIC_VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата: {version}.")
+
+def read_homophonic_text(file, homophonic_table, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Потоково читает коды после заголовка и возвращает фрагменты дешифрованного текста (генератор).
+    """
+    key = compile_homophonic_key(homophonic_table)
+    chunk_size -= chunk_size % 2
+    codes_read = 0
+    while True:
+        block = file.read(chunk_size)
+        if not block:
+            break
+        if len(block) % 2:
+            tail = file.read(1)
+            if not tail:
+                raise ValueError("Файл обрезан: неполный код в конце.")
+            block += tail
+        codes = block.decode("utf-16-le", "surrogatepass")
+        yield omophonic_decode_codes(codes, key, codes_read)
+        codes_read += len(codes)
+
+# --- Модель квадграмм русского языка (для оценки вариантов дешифрования) ---
+
+def letter_log_probs(model, original_alphabet):
+    """
+    Возвращает список log10 вероятностей букв алфавита, полученных из модели квадграмм
+    (по первой букве квадграммы).
+    """
+    index_of = {letter: index for index, letter in enumerate(original_alphabet)}
+    weights = [0.0] * len(original_alphabet)
+    for gram, log_prob in model['log_probs'].items():
+        weights[index_of[gram[0]]] += 10 ** log_prob
+    total = sum(weights)
+    floor = 10 ** model['floor']
+    return [math.log10(max(weight, floor) / total) for weight in weights]
+
+# Состояние процесса-исполнителя (заполняется в init_homophonic_worker)
+homophonic_worker_state = {}
+
+def init_homophonic_worker(model, original_alphabet, shared_best_score=None, shared_best_assignment=None):
+    """
+    Инициализирует процесс-исполнитель: таблица квадграмм строится один раз на процесс.
+    """
+    homophonic_worker_state['table'] = build_ngram_table(model, original_alphabet)
+    homophonic_worker_state['letter_log_probs'] = letter_log_probs(model, original_alphabet)
+    homophonic_worker_state['alphabet'] = original_alphabet
+    homophonic_worker_state['best_score'] = shared_best_score
+    homophonic_worker_state['best_assignment'] = shared_best_assignment
+
+# --- Криптоанализ: отжиг по назначению букв кодам омофонов ---
+
+# Доля ходов "код получает другую букву" (остальные - обмен букв двух кодов)
+HOMOPHONIC_REASSIGN_SHARE = 0.7
+
+# Начальная и конечная температура отжига (в единицах log10 оценки) для текста длины
+# HOMOPHONIC_REFERENCE_LENGTH; масштабируются пропорционально длине, как в шифре Playfair
+HOMOPHONIC_START_TEMPERATURE = 10.0
+HOMOPHONIC_END_TEMPERATURE = 1.0
+HOMOPHONIC_REFERENCE_LENGTH = 400
+
+# Вес оценки частот букв относительно оценки квадграмм
+HOMOPHONIC_LETTER_WEIGHT = 1.0
+
+# Раз в столько ходов цепочка публикует свой лучший результат и продолжает
+# с лучшего общего, если другой процесс нашёл назначение лучше
+HOMOPHONIC_SYNC_INTERVAL = 50000
+
+def publish_best_assignment(score, assignment):
+    """
+    Записывает назначение в общий результат, если оно лучше найденного другими процессами.
+    """
+    shared_best_score = homophonic_worker_state.get('best_score')
+    if shared_best_score is None:
+        return
+    with shared_best_score.get_lock():
+        if score > shared_best_score.value:
+            shared_best_score.value = score
+            homophonic_worker_state['best_assignment'][:] = assignment
 
-    return deciphered_text
+def fetch_best_assignment():
+    """
+    Возвращает лучший общий результат (оценка, назначение) или None, если общего результата нет.
+    """
+    shared_best_score = homophonic_worker_state.get('best_score')
+    if shared_best_score is None:
+        return None
+    with shared_best_score.get_lock():
+        return shared_best_score.value, list(homophonic_worker_state['best_assignment'])
+
+def homophonic_anneal(cipher_indices, code_classes, capacity, chains, iterations, seed):
+    """
+    Подбирает букву для каждого встреченного кода омофона имитацией отжига.
+
+    Коды разбиты на классы (при циклическом выборе омофонов класс - номер фазы, в которой
+    встречается код; иначе класс один). В каждом классе у буквы может быть не больше
+    capacity кодов - так выглядит любая таблица create_omophonic_table, и это не даёт
+    отжигу свести текст к нескольким самым частым буквам.
+
+    Для каждого кода заранее собраны позиции его вхождений в шифротекст и квадграммы,
+    которые их накрывают. При смене буквы кода (или обмене букв двух кодов одного класса)
+    меняются только эти позиции и пересчитываются только эти квадграммы.
+    К оценке добавляется log10 вероятности частот букв текста по полиномиальному
+    распределению; она меняется только у двух букв и пересчитывается за O(1).
+
+    :param cipher_indices: Шифротекст в виде списка номеров кодов 0..len(code_classes)-1.
+    :param code_classes: Номер класса для каждого кода.
+    :param capacity: Наибольшее число кодов одной буквы в одном классе.
+    :param chains: Количество независимых запусков отжига.
+    :param iterations: Количество ходов в каждом запуске.
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Кортеж (лучшая оценка, лучшее назначение: номер кода -> номер буквы).
+    """
+    table = homophonic_worker_state['table']
+    log_probs = homophonic_worker_state['letter_log_probs']
+    alphabet_size = len(homophonic_worker_state['alphabet'])
+    w1, w2, w3 = alphabet_size ** 3, alphabet_size ** 2, alphabet_size
+    rng = random.Random(seed)
+
+    code_count = len(code_classes)
+    class_count = max(code_classes) + 1
+    codes_by_class = [[] for _ in range(class_count)]
+    for code_index, code_class in enumerate(code_classes):
+        codes_by_class[code_class].append(code_index)
+
+    text_length = len(cipher_indices)
+    last_window = text_length - NGRAM_SIZE
+    positions_by_code = [[] for _ in range(code_count)]
+    for position, code_index in enumerate(cipher_indices):
+        positions_by_code[code_index].append(position)
+    occurrences = [len(positions) for positions in positions_by_code]
+    windows_by_code = []
+    for positions in positions_by_code:
+        windows = set()
+        for position in positions:
+            windows.update(range(max(0, position - NGRAM_SIZE + 1), min(position, last_window) + 1))
+        windows_by_code.append(tuple(sorted(windows)))
+
+    def quadgram_scores(plain, windows):
+        return [table[plain[i] * w1 + plain[i + 1] * w2 + plain[i + 2] * w3 + plain[i + 3]] for i in windows]
+
+    def letter_score(letter, count):
+        # Вклад буквы в log10 полиномиальной вероятности: count * log10 p - log10 count!
+        return HOMOPHONIC_LETTER_WEIGHT * (count * log_probs[letter] - math.lgamma(count + 1) / math.log(10))
+
+    start_temperature = HOMOPHONIC_START_TEMPERATURE * text_length / HOMOPHONIC_REFERENCE_LENGTH
+    temperature_ratio = HOMOPHONIC_END_TEMPERATURE / HOMOPHONIC_START_TEMPERATURE
+
+    best_score = float('-inf')
+    best_assignment = None
+    for _ in range(chains):
+        # Начальное назначение: каждый класс раскладывается по свободным местам букв
+        assignment = [0] * code_count
+        for class_codes in codes_by_class:
+            slots = rng.sample(range(alphabet_size * capacity), len(class_codes))
+            for code_index, slot in zip(class_codes, slots):
+                assignment[code_index] = slot % alphabet_size
+        rebuild = True
+        for iteration in range(iterations):
+            if rebuild:
+                plain = [assignment[code_index] for code_index in cipher_indices]
+                # Оценка каждой квадграммы хранится отдельно: старая часть оценки берётся из списка
+                window_scores = quadgram_scores(plain, range(last_window + 1))
+                letter_counts = [0] * alphabet_size
+                class_slots = [[0] * alphabet_size for _ in range(class_count)]
+                for code_index, letter in enumerate(assignment):
+                    letter_counts[letter] += occurrences[code_index]
+                    class_slots[code_classes[code_index]][letter] += 1
+                score = sum(window_scores) + sum(letter_score(letter, count) for letter, count in enumerate(letter_counts))
+                rebuild = False
+
+            if iteration and iteration % HOMOPHONIC_SYNC_INTERVAL == 0:
+                publish_best_assignment(best_score, best_assignment)
+                shared = fetch_best_assignment()
+                if shared is not None and shared[0] > best_score:
+                    assignment = shared[1]
+                    rebuild = True
+                    continue
+
+            temperature = start_temperature * temperature_ratio ** (iteration / iterations)
+
+            code_a = int(rng.random() * code_count)
+            letter_a = assignment[code_a]
+            slots = class_slots[code_classes[code_a]]
+            if rng.random() < HOMOPHONIC_REASSIGN_SHARE:
+                # Код code_a получает букву letter_b, если у неё в этом классе есть свободное место
+                code_b = None
+                letter_b = int(rng.random() * (alphabet_size - 1))
+                if letter_b >= letter_a:
+                    letter_b += 1
+                if slots[letter_b] >= capacity:
+                    continue
+                moved = occurrences[code_a]
+                windows = windows_by_code[code_a]
+            else:
+                # Коды code_a и code_b одного класса обмениваются буквами
+                class_codes = codes_by_class[code_classes[code_a]]
+                code_b = class_codes[int(rng.random() * len(class_codes))]
+                letter_b = assignment[code_b]
+                if letter_a == letter_b:
+                    continue
+                moved = occurrences[code_a] - occurrences[code_b]
+                windows = set(windows_by_code[code_a])
+                windows.update(windows_by_code[code_b])
+            count_a, count_b = letter_counts[letter_a], letter_counts[letter_b]
+            letter_delta = (letter_score(letter_a, count_a - moved) + letter_score(letter_b, count_b + moved)
+                            - letter_score(letter_a, count_a) - letter_score(letter_b, count_b))
+
+            old_part = sum(map(window_scores.__getitem__, windows))
+            for position in positions_by_code[code_a]:
+                plain[position] = letter_b
+            if code_b is not None:
+                for position in positions_by_code[code_b]:
+                    plain[position] = letter_a
+            new_scores = quadgram_scores(plain, windows)
+            delta = sum(new_scores) - old_part + letter_delta
+
+            if delta >= 0 or rng.random() < math.exp(delta / temperature):
+                score += delta
+                for i, window_score in zip(windows, new_scores):
+                    window_scores[i] = window_score
+                assignment[code_a] = letter_b
+                if code_b is None:
+                    slots[letter_a] -= 1
+                    slots[letter_b] += 1
+                else:
+                    assignment[code_b] = letter_a
+                letter_counts[letter_a] = count_a - moved
+                letter_counts[letter_b] = count_b + moved
+                if score > best_score:
+                    best_score, best_assignment = score, assignment[:]
+            else:
+                # Ход отклонён - возвращаем буквы в текст
+                for position in positions_by_code[code_a]:
+                    plain[position] = letter_a
+                if code_b is not None:
+                    for position in positions_by_code[code_b]:
+                        plain[position] = letter_b
+
+        publish_best_assignment(best_score, best_assignment)
+
+    return best_score, best_assignment
+
+def homophonic_code_classes(cipher_indices, code_count, homophones_per_letter):
+    """
+    Определяет классы кодов для отжига.
+
+    При циклическом выборе омофонов (omophonic_cipher без use_random) j-й омофон буквы
+    стоит только на позициях с номером j по модулю homophones_per_letter. Если каждый код
+    встречается только в одной такой фазе, класс кода - номер фазы, и у каждой буквы
+    в классе один код. Иначе класс один, и у буквы до homophones_per_letter кодов.
+
+    :return: Кортеж (класс каждого кода, наибольшее число кодов буквы в классе).
+    """
+    code_phases = [None] * code_count
+    for position, code_index in enumerate(cipher_indices):
+        phase = position % homophones_per_letter
+        if code_phases[code_index] is None:
+            code_phases[code_index] = phase
+        elif code_phases[code_index] != phase:
+            return [0] * code_count, homophones_per_letter
+    return code_phases, 1
+
+def homophonic_solve(encrypted_text, original_alphabet, model=None, workers=None, chains_per_worker=1,
+                     iterations=300000, seed=None, homophones_per_letter=2):
+    """
+    Восстанавливает таблицу омофонов только по шифротексту.
+
+    Независимые цепочки отжига распределяются по процессам ProcessPoolExecutor;
+    каждый процесс записывает лучшее найденное назначение в общий результат.
+
+    :param encrypted_text: Шифротекст - коды омофонов, разделённые пробелами.
+    :param original_alphabet: Оригинальный алфавит (строка из 33 букв).
+    :param model: Модель квадграмм; по умолчанию строится по RUSSIAN_SAMPLE_TEXT.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param chains_per_worker: Количество цепочек отжига в каждом процессе.
+    :param iterations: Количество ходов в каждой цепочке.
+    :param seed: Начальное значение генератора случайных чисел (для воспроизводимости).
+    :param homophones_per_letter: Число омофонов на букву в таблице (как в create_omophonic_table).
+    :return: Кортеж (найденная таблица омофонов: буква -> список кодов, дешифрованный текст, оценка).
+             Коды, не встретившиеся в шифротексте, в таблицу не попадают.
+    """
+    tokens = encrypted_text.split()
+    codes = []
+    for position, token in enumerate(tokens, start=1):
+        try:
+            codes.append(int(token))
+        except ValueError:
+            raise ValueError(f"Неверный формат омофона: '{token}' (позиция {position}). "
+                             f"Ожидаются числа, разделённые пробелами.")
+    if len(codes) < NGRAM_SIZE:
+        raise ValueError("Шифротекст слишком короткий для анализа.")
+    # Коды нумеруются в порядке убывания частоты
+    distinct_codes = [code for code, _ in Counter(codes).most_common()]
+    code_index = {code: index for index, code in enumerate(distinct_codes)}
+    cipher_indices = [code_index[code] for code in codes]
+    code_classes, capacity = homophonic_code_classes(cipher_indices, len(distinct_codes), homophones_per_letter)
+    for code_class in set(code_classes):
+        if code_classes.count(code_class) > capacity * len(original_alphabet):
+            raise ValueError(f"Слишком много разных кодов для таблицы с {homophones_per_letter} "
+                             f"омофонами на букву.")
+    if model is None:
+        model = build_ngram_model(RUSSIAN_SAMPLE_TEXT, original_alphabet)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    shared_best_score = multiprocessing.Value('d', float('-inf'))
+    shared_best_assignment = multiprocessing.Array('i', len(distinct_codes))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_homophonic_worker,
+                             initargs=(model, original_alphabet, shared_best_score, shared_best_assignment)) as executor:
+        futures = [executor.submit(homophonic_anneal, cipher_indices, code_classes, capacity, chains_per_worker,
+                                   iterations, seed + worker)
+                   for worker in range(workers)]
+        for future in futures:
+            future.result()
+
+    assignment = list(shared_best_assignment)
+    # Коды буквы перечисляются по классам: при циклическом выборе это порядок фаз,
+    # и найденная таблица шифрует так же, как исходная
+    recovered_table = {letter: [] for letter in original_alphabet}
+    for code_class, code, letter_index in sorted(zip(code_classes, distinct_codes, assignment)):
+        recovered_table[original_alphabet[letter_index]].append(code)
+    decrypted = "".join(original_alphabet[assignment[index]] for index in cipher_indices)
+    return recovered_table, decrypted, shared_best_score.value
 
 # --- Глобальная переменная для хранения текущей таблицы ---
 current_homophonic_table = create_omophonic_table(alphabet, 2)
@@ -142,45 +649,131 @@ def generate_new_table():
         output_text.insert(tk.END, f"  '{letter}': {omophones}\n")
 
 
+def save_binary_action():
+    text = input_text.get()
+    use_random = random_var.get()
+    if not text:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите текст для шифрования.\n")
+        return
+
+    output_path = filedialog.asksaveasfilename(title="Сохранить омофоны в двоичный файл",
+                                               defaultextension=".omph")
+    if not output_path:
+        return
+
+    try:
+        with open(output_path, "wb") as f:
+            codes_written = write_homophonic_codes(f, [text], current_homophonic_table, use_random)
+    except (OSError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при сохранении: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Исходное сообщение: {text}\n")
+    output_text.insert(tk.END, f"Используется случайный выбор омофонов: {use_random}\n")
+    output_text.insert(tk.END, f"Записано омофонов: {codes_written} (2 байта на омофон), файл: {output_path}\n")
+
+def open_binary_action():
+    input_path = filedialog.askopenfilename(title="Открыть двоичный файл омофонов")
+    if not input_path:
+        return
+
+    try:
+        with open(input_path, "rb") as f:
+            read_homophonic_header(f)
+            deciphered = "".join(read_homophonic_text(f, current_homophonic_table))
+    except (OSError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при чтении файла: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Файл: {input_path}\n")
+    output_text.insert(tk.END, f"Дешифрованное сообщение: {deciphered}\n")
+
+def break_action():
+    encrypted_text = input_text.get()
+
+    if not encrypted_text:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите омофоны для подбора таблицы.\n")
+        return
+
+    # Отжиг идёт десятки секунд, поэтому выполняется в фоновом потоке (см. background_task.py)
+    background_task.run_in_background(background_state, lambda: homophonic_solve(encrypted_text, alphabet),
+                                      lambda result: show_break_result(encrypted_text, *result),
+                                      "Идёт подбор таблицы (отжиг)", "при подборе таблицы")
+
+def show_break_result(encrypted_text, recovered_table, deciphered, score):
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение (омофоны): {encrypted_text}\n")
+    output_text.insert(tk.END, "Найденная таблица шифрозамен (только встретившиеся омофоны):\n")
+    for letter, omophones in recovered_table.items():
+        output_text.insert(tk.END, f"  '{letter}': {omophones}\n")
+    output_text.insert(tk.END, f"Оценка (log10 вероятности квадграмм и частот букв): {score:.2f}\n")
+    output_text.insert(tk.END, f"Дешифрованное сообщение: {deciphered}\n")
+    output_text.insert(tk.END, "Примечание: на коротких текстах часть редких омофонов может быть определена неверно.\n")
+
 # --- Создание графического интерфейса ---
-root = tk.Tk()
-root.title("Система Омофонов (Шифрование и Дешифрование)")
-root.geometry("900x700")
+# Окно создаётся только при запуске файла как программы: процессы-исполнители
+# ProcessPoolExecutor импортируют этот модуль повторно и не должны открывать своё окно.
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Система Омофонов (Шифрование и Дешифрование)")
+    root.geometry("900x700")
+
+    # --- Виджеты ---
+
+    # Ввод текста (для шифрования) или омофонов (для дешифрования)
+    input_label = ttk.Label(root, text="Введите текст для шифрования или омофоны для дешифрования (разделённые пробелом):")
+    input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+    input_text = ttk.Entry(root, width=80)
+    input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+
+    # Флажок для случайного выбора омофонов
+    random_var = tk.BooleanVar()
+    random_check = ttk.Checkbutton(root, text="Использовать случайный выбор омофонов (при шифровании)", variable=random_var)
+    random_check.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+
+    # Кнопки
+    encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
+    encrypt_button.grid(row=3, column=0, padx=10, pady=5, sticky="w")
 
-# --- Виджеты ---
+    decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
+    decrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
 
-# Ввод текста (для шифрования) или омофонов (для дешифрования)
-input_label = ttk.Label(root, text="Введите текст для шифрования или омофоны для дешифрования (разделённые пробелом):")
-input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+    generate_button = ttk.Button(root, text="Сгенерировать новую таблицу", command=generate_new_table)
+    generate_button.grid(row=4, column=0, padx=10, pady=5, sticky="w")
 
-input_text = ttk.Entry(root, width=80)
-input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    # Кнопки работы с двоичным файлом омофонов
+    file_buttons_frame = ttk.Frame(root)
+    file_buttons_frame.grid(row=4, column=1, padx=10, pady=5, sticky="e")
 
-# Флажок для случайного выбора омофонов
-random_var = tk.BooleanVar()
-random_check = ttk.Checkbutton(root, text="Использовать случайный выбор омофонов (при шифровании)", variable=random_var)
-random_check.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+    save_binary_button = ttk.Button(file_buttons_frame, text="Зашифровать в двоичный файл...", command=save_binary_action)
+    save_binary_button.pack(side=tk.LEFT, padx=(0, 10))
 
-# Кнопки
-encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
-encrypt_button.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+    open_binary_button = ttk.Button(file_buttons_frame, text="Дешифровать двоичный файл...", command=open_binary_action)
+    open_binary_button.pack(side=tk.LEFT, padx=(0, 10))
 
-decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
-decrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
+    break_button = ttk.Button(file_buttons_frame, text="Подобрать таблицу (отжиг)", command=break_action)
+    break_button.pack(side=tk.LEFT)
 
-generate_button = ttk.Button(root, text="Сгенерировать новую таблицу", command=generate_new_table)
-generate_button.grid(row=4, column=0, padx=10, pady=5, sticky="w")
+    # Вывод результата
+    output_label = ttk.Label(root, text="Результат:")
+    output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
 
-# Вывод результата
-output_label = ttk.Label(root, text="Результат:")
-output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+    output_text = scrolledtext.ScrolledText(root, width=100, height=35)
+    output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
 
-output_text = scrolledtext.ScrolledText(root, width=100, height=35)
-output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+    # Состояние фоновых операций (см. background_task.py): пока идёт подбор, кнопка отключена
+    background_state = background_task.create_task_state(root, output_text, [break_button])
 
-# --- Настройка сетки ---
-root.grid_rowconfigure(6, weight=1)
-root.grid_columnconfigure(0, weight=1)
+    # --- Настройка сетки ---
+    root.grid_rowconfigure(6, weight=1)
+    root.grid_columnconfigure(0, weight=1)
 
-# Запуск главного цикла
-root.mainloop()
+    # Запуск главного цикла
+    root.mainloop()
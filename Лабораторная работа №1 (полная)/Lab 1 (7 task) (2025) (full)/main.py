@@ -1,65 +1,639 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, filedialog
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import math
+import os
+import re
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from letter_frequencies import RUSSIAN_LETTER_FREQUENCIES, caesar_score_shifts, letter_histogram
+import live_mode
 
 # Определяем русский алфавит
 alphabet = "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
 # Мощность алфавита N
 N = len(alphabet)
 
-def vigenere_cipher(text, key, alphabet):
+# Максимальное число скомпилированных ключей в кэше (вытесняются давно не использованные):
+# в живом режиме ключ компилируется при каждом изменении поля ключа
+VIGENERE_CACHE_SIZE = 64
+
+# Кэш скомпилированных ключей: (ключ, алфавит) -> ключ
+vigenere_keys_cache = OrderedDict()
+
+def lru_get(cache, key):
     """
-    Шифрует текст с помощью шифра Виженера.
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
     """
-    text_upper = text.upper()
-    key_upper = key.upper()
-    encrypted_text = ""
-
-    for i, char in enumerate(text_upper):
-        if char in alphabet:
-            plaintext_char_index = alphabet.index(char)
-            key_char_index = alphabet.index(key_upper[i % len(key_upper)])
-            # C_i = (P_i + K_i) mod N
-            encrypted_char_index = (plaintext_char_index + key_char_index) % N
-            encrypted_char_upper = alphabet[encrypted_char_index]
-
-            # Сохраняем регистр
-            original_char = text[i]
-            if original_char.islower():
-                encrypted_text += encrypted_char_upper.lower()
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении VIGENERE_CACHE_SIZE.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > VIGENERE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+# Однобайтовая кодировка для быстрого пути: текст из её символов шифруется
+# таблицами bytes.translate (как в двоичном режиме), а не таблицами str.translate
+VIGENERE_BYTE_CODEC = "cp1251"
+
+def compile_vigenere_key(key, alphabet):
+    """
+    Компилирует ключевое слово в таблицы замены для каждой позиции ключа.
+
+    Буква ключа переводится в сдвиг один раз (vigenere_key_offsets); для каждого
+    сдвига строится таблица str.translate, которая сдвигает только буквы алфавита
+    (прописные и строчные, сохраняя регистр), а прочие символы оставляет как есть.
+
+    :return: Словарь с полями
+             'alphabet' - алфавит,
+             'offsets' - список сдвигов ключа,
+             'encrypt_tables' / 'decrypt_tables' - таблицы str.translate по позициям ключа,
+             'letters_delete' - таблица str.translate, удаляющая буквы алфавита,
+             'encrypt_byte_tables' / 'decrypt_byte_tables' - то же для текста в кодировке
+             VIGENERE_BYTE_CODEC (None, если алфавит в ней не представим); символы вне алфавита
+             эти таблицы сразу переводят в верхний регистр,
+             'unsafe_bytes' - байты, верхний регистр которых так не получить.
+    """
+    cache_key = (key, alphabet)
+    compiled = lru_get(vigenere_keys_cache, cache_key)
+    if compiled is not None:
+        return compiled
+
+    offsets = vigenere_key_offsets(key, alphabet)
+    size = len(alphabet)
+    tables_by_shift = {}
+    for shift in {offset for offset in offsets} | {-offset for offset in offsets}:
+        table = {}
+        for index, char in enumerate(alphabet):
+            # C_i = (P_i + K_i) mod N при шифровании, P_i = (C_i - K_i + N) mod N при дешифровании
+            shifted = alphabet[(index + shift) % size]
+            table[ord(char)] = shifted
+            table[ord(char.lower())] = shifted.lower()
+        tables_by_shift[shift] = table
+
+    compiled = {
+        'alphabet': alphabet,
+        'offsets': offsets,
+        'encrypt_tables': [tables_by_shift[offset] for offset in offsets],
+        'decrypt_tables': [tables_by_shift[-offset] for offset in offsets],
+        'letters_delete': dict.fromkeys(map(ord, alphabet + alphabet.lower())),
+        'encrypt_byte_tables': None,
+        'decrypt_byte_tables': None,
+        'unsafe_bytes': None,
+    }
+    try:
+        # Верхний регистр символов вне алфавита; байты, у которых он не однобайтовый
+        # или попадает в алфавит, обрабатываются медленным путём
+        upper_table = bytearray(range(256))
+        unsafe_bytes = bytearray()
+        for byte in range(256):
+            char = bytes([byte]).decode(VIGENERE_BYTE_CODEC, 'replace')
+            char_upper = char.upper()
+            if char_upper == char or ord(char) in compiled['letters_delete']:
+                continue
+            upper_bytes = char_upper.encode(VIGENERE_BYTE_CODEC, 'replace')
+            if len(upper_bytes) == 1 and upper_bytes.decode(VIGENERE_BYTE_CODEC) == char_upper and char_upper not in alphabet:
+                upper_table[byte] = upper_bytes[0]
             else:
-                encrypted_text += encrypted_char_upper
-        else:
-            encrypted_text += char
+                unsafe_bytes.append(byte)
+
+        byte_tables_by_shift = {}
+        for shift, table in tables_by_shift.items():
+            byte_table = bytearray(upper_table)
+            for code, char in table.items():
+                byte_table[chr(code).encode(VIGENERE_BYTE_CODEC)[0]] = char.encode(VIGENERE_BYTE_CODEC)[0]
+            byte_tables_by_shift[shift] = bytes(byte_table)
+    except UnicodeEncodeError:
+        pass
+    else:
+        compiled['unsafe_bytes'] = bytes(unsafe_bytes)
+        compiled['encrypt_byte_tables'] = [byte_tables_by_shift[offset] for offset in offsets]
+        compiled['decrypt_byte_tables'] = [byte_tables_by_shift[-offset] for offset in offsets]
+    lru_put(vigenere_keys_cache, cache_key, compiled)
+    return compiled
+
+def vigenere_prepare_text(text, alphabet, letters_delete):
+    """
+    Приводит текст к виду, который посимвольная версия шифрует "как есть":
+    символы вне алфавита переводятся в верхний регистр, буквы алфавита сохраняют регистр.
+    Позиция ключа считается по text.upper(), поэтому результат имеет ту же длину.
+    """
+    others = text.translate(letters_delete)
+    if others == others.upper():
+        # Обычный случай: верхний регистр меняет только буквы алфавита
+        return text
+    upper_map = {}
+    for char in set(others):
+        char_upper = char.upper()
+        if len(char_upper) != 1:
+            # Верхний регистр меняет длину текста (например, 'ß') - сдвигаются и позиции ключа
+            text_upper = text.upper()
+            return "".join(char.lower() if char in alphabet and text[i].islower() else char
+                           for i, char in enumerate(text_upper))
+        if char_upper in alphabet and char.islower():
+            char_upper = char_upper.lower()
+        if char_upper != char:
+            upper_map[ord(char)] = char_upper
+    return text.translate(upper_map)
+
+def vigenere_apply_phase_tables(text, phase_tables, start_phase=0):
+    """
+    Применяет таблицы позиций ключа к срезам text[position::len(key)] и собирает срезы
+    обратно в исходном порядке. Позиция ключа сдвигается на каждом символе текста,
+    включая символы вне алфавита; первому символу соответствует позиция start_phase.
+    """
+    key_length = len(phase_tables)
+    # Срезы собираются в буфер UTF-32 (по 4 байта на символ) через память с шагом key_length
+    buffer = bytearray(4 * len(text))
+    code_points = memoryview(buffer).cast('I')
+    for position in range(min(key_length, len(text))):
+        translated = text[position::key_length].translate(phase_tables[(start_phase + position) % key_length])
+        code_points[position::key_length] = memoryview(translated.encode('utf-32-le')).cast('I')
+    return buffer.decode('utf-32-le')
+
+def vigenere_byte_path_allowed(data, compiled):
+    """
+    Проверяет, можно ли шифровать текст, закодированный в VIGENERE_BYTE_CODEC,
+    таблицами bytes.translate (в нём нет байтов, верхний регистр которых не однобайтовый).
+    """
+    return compiled['encrypt_byte_tables'] is not None and len(data.translate(None, compiled['unsafe_bytes'])) == len(data)
 
-    return encrypted_text
+def vigenere_transform_text(text, compiled, decrypt=False, start_phase=0):
+    """
+    Общая часть vigenere_cipher и vigenere_decipher.
+
+    Если текст представим в кодировке VIGENERE_BYTE_CODEC (и его верхний регистр тоже),
+    текст шифруется как байты теми же срезами с шагом длины ключа
+    (vigenere_transform_bytes); иначе - таблицами str.translate.
+    start_phase - позиция ключа, соответствующая первому символу текста.
+    """
+    byte_tables = compiled['decrypt_byte_tables' if decrypt else 'encrypt_byte_tables']
+    if byte_tables is not None:
+        try:
+            data = text.encode(VIGENERE_BYTE_CODEC)
+        except UnicodeEncodeError:
+            data = None
+        if data is not None and vigenere_byte_path_allowed(data, compiled):
+            return vigenere_transform_bytes(data, byte_tables, start_phase).decode(VIGENERE_BYTE_CODEC)
+    prepared = vigenere_prepare_text(text, compiled['alphabet'], compiled['letters_delete'])
+    return vigenere_apply_phase_tables(prepared, compiled['decrypt_tables' if decrypt else 'encrypt_tables'], start_phase)
+
+def vigenere_cipher(text, key, alphabet):
+    """
+    Шифрует текст с помощью шифра Виженера.
+    """
+    return vigenere_transform_text(text, compile_vigenere_key(key, alphabet))
 
 def vigenere_decipher(text, key, alphabet):
     """
     Дешифрует текст, зашифрованный с помощью шифра Виженера.
     """
-    text_upper = text.upper()
-    key_upper = key.upper()
-    decrypted_text = ""
-
-    for i, char in enumerate(text_upper):
-        if char in alphabet:
-            encrypted_char_index = alphabet.index(char)
-            key_char_index = alphabet.index(key_upper[i % len(key_upper)])
-            # P_i = (C_i - K_i + N) mod N
-            decrypted_char_index = (encrypted_char_index - key_char_index + len(alphabet)) % len(alphabet)
-            decrypted_char_upper = alphabet[decrypted_char_index]
-
-            # Сохраняем регистр
-            original_char = text[i]
-            if original_char.islower():
-                decrypted_text += decrypted_char_upper.lower()
-            else:
-                decrypted_text += decrypted_char_upper
+    return vigenere_transform_text(text, compile_vigenere_key(key, alphabet), decrypt=True)
+
+# --- Двоичный режим: шифр Виженера над байтами по модулю 256 ---
+
+# Размер блока (в байтах) при обработке файлов
+FILE_CHUNK_SIZE = 1024 * 1024
+
+def vigenere_key_offsets(key, alphabet):
+    """
+    Переводит ключевое слово в список сдвигов (индексов букв ключа в алфавите).
+    Это та же обработка ключа, что и в текстовом режиме.
+
+    :param key: Ключевое слово (строка из букв алфавита).
+    :param alphabet: Алфавит (строка).
+    :return: Список сдвигов (целые числа).
+    :raises ValueError: Если ключевое слово пустое.
+    """
+    if not key:
+        raise ValueError("Ключевое слово не должно быть пустым.")
+    return [alphabet.index(char) for char in key.upper()]
+
+def vigenere_bytes_tables(key_offsets, decrypt=False):
+    """
+    Строит по одной таблице bytes.translate на каждую позицию ключа:
+    байт b переходит в (b + K) mod 256 при шифровании и в (b - K) mod 256 при дешифровании.
+
+    :param key_offsets: Список сдвигов ключа (результат vigenere_key_offsets).
+    :param decrypt: Строить таблицы для дешифрования.
+    :return: Список таблиц перевода (bytes длиной 256).
+    """
+    sign = -1 if decrypt else 1
+    tables_by_offset = {}
+    tables = []
+    for offset in key_offsets:
+        # Одинаковые буквы ключа используют одну и ту же таблицу
+        if offset not in tables_by_offset:
+            tables_by_offset[offset] = bytes((byte + sign * offset) % 256 for byte in range(256))
+        tables.append(tables_by_offset[offset])
+    return tables
+
+def vigenere_transform_bytes(data, tables, start_phase=0):
+    """
+    Применяет шифр Виженера по модулю 256 к блоку байтов.
+
+    Ключ не размножается на длину данных: байты с одинаковой позицией ключа
+    выбираются срезом с шагом len(tables) и переводятся одним вызовом bytes.translate.
+
+    :param data: Блок данных (bytes или bytearray).
+    :param tables: Таблицы перевода (результат vigenere_bytes_tables).
+    :param start_phase: Позиция ключа, соответствующая первому байту блока.
+    :return: Обработанный блок (bytes).
+    """
+    key_length = len(tables)
+    result = bytearray(len(data))
+    for position in range(min(key_length, len(data))):
+        table = tables[(start_phase + position) % key_length]
+        result[position::key_length] = data[position::key_length].translate(table)
+    return bytes(result)
+
+def vigenere_cipher_bytes(data, key, alphabet):
+    """
+    Шифрует двоичные данные шифром Виженера по модулю 256.
+
+    :param data: Исходные данные (bytes или bytearray).
+    :param key: Ключевое слово (строка).
+    :param alphabet: Алфавит, по которому буквы ключа переводятся в сдвиги (строка).
+    :return: Зашифрованные данные (bytes).
+    """
+    return vigenere_transform_bytes(data, vigenere_bytes_tables(vigenere_key_offsets(key, alphabet)))
+
+def vigenere_decipher_bytes(data, key, alphabet):
+    """
+    Дешифрует двоичные данные, зашифрованные шифром Виженера по модулю 256.
+
+    :param data: Зашифрованные данные (bytes или bytearray).
+    :param key: Ключевое слово, использованное при шифровании (строка).
+    :param alphabet: Алфавит (строка).
+    :return: Дешифрованные данные (bytes).
+    """
+    return vigenere_transform_bytes(data, vigenere_bytes_tables(vigenere_key_offsets(key, alphabet), decrypt=True))
+
+def vigenere_transform_bytes_file(input_path, output_path, key, alphabet, decrypt=False, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Применяет шифр Виженера по модулю 256 к любому файлу, блоками и без декодирования.
+    Позиция ключа переносится между блоками, поэтому размер блока может быть любым.
+
+    :param input_path: Путь к исходному файлу (строка).
+    :param output_path: Путь к файлу результата (строка).
+    :param key: Ключевое слово (строка).
+    :param alphabet: Алфавит (строка).
+    :param decrypt: Дешифровать вместо шифрования.
+    :param chunk_size: Размер блока чтения в байтах (целое число).
+    :return: Количество обработанных байтов (целое число).
+    """
+    tables = vigenere_bytes_tables(vigenere_key_offsets(key, alphabet), decrypt)
+    bytes_read = 0
+    with open(input_path, "rb") as in_file, open(output_path, "wb") as out_file:
+        while True:
+            chunk = in_file.read(chunk_size)
+            if not chunk:
+                break
+            out_file.write(vigenere_transform_bytes(chunk, tables, bytes_read % len(tables)))
+            bytes_read += len(chunk)
+    return bytes_read
+
+
+# --- Параллельный режим: большой текст делится на части, которые шифруются в разных процессах ---
+
+# Минимальная длина части текста (в символах), ради которой стоит запускать отдельный процесс
+PARALLEL_MIN_CHUNK = 4 * 1024 * 1024
+
+def split_text_chunks(length, workers, min_chunk=PARALLEL_MIN_CHUNK):
+    """
+    Делит позиции текста [0, length) на части примерно равной длины, по одной на процесс.
+
+    :param length: Длина текста (целое число).
+    :param workers: Количество процессов (целое число).
+    :param min_chunk: Минимальная длина части (целое число).
+    :return: Список пар (начало, конец).
+    """
+    count = max(1, min(workers, length // max(min_chunk, 1)))
+    bounds = [length * part // count for part in range(count + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+def run_shared_chunks(data, width, chunks, worker, arguments, workers):
+    """
+    Копирует данные в общую память (multiprocessing.shared_memory) и обрабатывает части
+    в процессах ProcessPoolExecutor. Между процессами передаются только имена блоков
+    общей памяти и границы частей, а не сам текст.
+
+    Исполнитель вызывается как worker(input_name, output_name, width, start, end, phase, *arguments):
+    он читает символы [start, end) входного блока, записывает результат (не длиннее части)
+    в выходной блок с той же позиции и возвращает длину результата в байтах.
+
+    :param data: Текст в кодировке с постоянной шириной символа (bytes).
+    :param width: Количество байтов на символ (целое число).
+    :param chunks: Список троек (начало, конец, фаза) в символах.
+    :param worker: Функция-исполнитель (уровня модуля, чтобы её можно было передать в процесс).
+    :param arguments: Дополнительные аргументы исполнителя (кортеж).
+    :param workers: Количество процессов (целое число).
+    :return: Результаты частей, склеенные по порядку (bytes).
+    """
+    input_memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    output_memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        input_memory.buf[:len(data)] = data
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(worker, input_memory.name, output_memory.name, width, start, end, phase, *arguments)
+                       for start, end, phase in chunks]
+            lengths = [future.result() for future in futures]
+        return b"".join(output_memory.buf[start * width:start * width + length]
+                        for (start, _, _), length in zip(chunks, lengths))
+    finally:
+        input_memory.close()
+        input_memory.unlink()
+        output_memory.close()
+        output_memory.unlink()
+
+def vigenere_parallel_worker(input_name, output_name, width, start, end, phase, key, alphabet, decrypt, codec):
+    """
+    Исполнитель vigenere_transform_parallel: шифрует часть текста из общей памяти
+    с позиции ключа phase. При width == 1 часть шифруется прямо как байты VIGENERE_BYTE_CODEC.
+    """
+    input_memory = shared_memory.SharedMemory(name=input_name)
+    output_memory = shared_memory.SharedMemory(name=output_name)
+    try:
+        chunk = bytes(input_memory.buf[start * width:end * width])
+        compiled = compile_vigenere_key(key, alphabet)
+        if width == 1:
+            result = vigenere_transform_bytes(chunk, compiled['decrypt_byte_tables' if decrypt else 'encrypt_byte_tables'], phase)
         else:
-            decrypted_text += char
+            result = vigenere_transform_text(chunk.decode(codec), compiled, decrypt, phase).encode(codec)
+        output_memory.buf[start * width:start * width + len(result)] = result
+        return len(result)
+    finally:
+        input_memory.close()
+        output_memory.close()
+
+def vigenere_transform_parallel(text, key, alphabet, decrypt=False, workers=None, min_chunk=PARALLEL_MIN_CHUNK):
+    """
+    Шифрует (дешифрует) большой текст шифром Виженера в нескольких процессах.
+
+    Позиция ключа зависит только от номера символа по модулю длины ключа, поэтому текст
+    делится на части, и часть, начинающаяся с символа start, шифруется с позиции ключа
+    start mod len(key). Результат совпадает с vigenere_cipher / vigenere_decipher.
+
+    :param text: Исходный текст (строка).
+    :param key: Ключевое слово (строка).
+    :param alphabet: Алфавит (строка).
+    :param decrypt: Дешифровать вместо шифрования.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param min_chunk: Минимальная длина части текста в символах (целое число).
+    :return: Зашифрованный (дешифрованный) текст (строка).
+    """
+    compiled = compile_vigenere_key(key, alphabet)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = split_text_chunks(len(text), workers, min_chunk)
+    if len(chunks) == 1:
+        # Короткий текст не стоит запуска процессов
+        return vigenere_transform_text(text, compiled, decrypt)
+
+    try:
+        data = text.encode(VIGENERE_BYTE_CODEC)
+    except UnicodeEncodeError:
+        data = None
+    if data is not None and vigenere_byte_path_allowed(data, compiled):
+        codec, width = VIGENERE_BYTE_CODEC, 1
+    else:
+        if len(text.upper()) != len(text):
+            # Верхний регистр меняет длину текста (например, 'ß'): позиции ключа сдвигаются,
+            # и части нельзя шифровать независимо
+            return vigenere_transform_text(text, compiled, decrypt)
+        codec, width = 'utf-32-le', 4
+        data = text.encode(codec)
+
+    key_length = len(compiled['offsets'])
+    chunks = [(start, end, start % key_length) for start, end in chunks]
+    result = run_shared_chunks(data, width, chunks, vigenere_parallel_worker, (key, alphabet, decrypt, codec), workers)
+    return result.decode(codec)
+
+
+# --- Криптоанализ: метод Касиски, индекс совпадений (Фридман) и подбор ключа ---
+
+# Индекс совпадений русского текста
+RUSSIAN_INDEX_OF_COINCIDENCE = 0.0553
+
+# Длина повторяющихся фрагментов для метода Касиски
+KASISKI_NGRAM_SIZE = 3
+
+# Наибольшая проверяемая длина ключа
+MAX_KEY_LENGTH = 30
+
+# Длина ключа считается подходящей, если средний индекс совпадений её столбцов не меньше
+# этой доли от наибольшего: у делителей длины ключа столбцы смешивают несколько сдвигов
+# и индекс заметно ниже, у кратных - примерно тот же
+IC_PEAK_SHARE = 0.8
+
+# Штраф (в единицах натурального логарифма правдоподобия) за каждую букву ключа
+KEY_LETTER_PENALTY = math.log(len(alphabet))
+
+def kasiski_distances(text_upper, alphabet, ngram_size=KASISKI_NGRAM_SIZE):
+    """
+    Находит расстояния между соседними повторами n-грамм из букв алфавита.
 
-    return decrypted_text
+    Позиция ключа сдвигается на каждом символе текста, поэтому расстояния считаются
+    по позициям в исходном тексте (с пробелами и знаками). Каждая n-грамма букв
+    записывается числом в системе счисления по основанию N и обновляется скользящим
+    образом при сдвиге окна; словарь хранит последнее вхождение каждой n-граммы.
 
+    :param text_upper: Шифротекст в верхнем регистре.
+    :param alphabet: Алфавит (строка).
+    :param ngram_size: Длина n-граммы.
+    :return: Counter: расстояние -> количество повторов.
+    """
+    index_of = {letter: index for index, letter in enumerate(alphabet)}
+    alphabet_size = len(alphabet)
+    modulus = alphabet_size ** ngram_size
+    last_position = {}
+    distances = Counter()
+    code = 0
+    run_length = 0 # Сколько букв подряд заканчивается на текущей позиции
+    for position, char in enumerate(text_upper):
+        letter_index = index_of.get(char)
+        if letter_index is None:
+            run_length = 0
+            continue
+        code = (code * alphabet_size + letter_index) % modulus
+        run_length += 1
+        if run_length >= ngram_size:
+            previous = last_position.get(code)
+            if previous is not None:
+                distances[position - previous] += 1
+            last_position[code] = position
+    return distances
+
+def kasiski_period_scores(distances, max_period=MAX_KEY_LENGTH):
+    """
+    Для каждой длины ключа 1..max_period считает, сколько повторов находятся
+    на кратном ей расстоянии.
+
+    :return: Список длины max_period + 1 (элемент 0 не используется).
+    """
+    scores = [0] * (max_period + 1)
+    for distance, count in distances.items():
+        for period in range(2, max_period + 1):
+            if distance % period == 0:
+                scores[period] += count
+    return scores
+
+def index_of_coincidence(histogram):
+    """
+    Индекс совпадений: вероятность, что две случайно выбранные буквы текста совпадают.
+    """
+    total = sum(histogram)
+    if total < 2:
+        return 0.0
+    return sum(count * (count - 1) for count in histogram) / (total * (total - 1))
+
+def letter_codes(text_upper, alphabet):
+    """
+    Переводит текст в байты: буква алфавита - её номер + 1, прочие символы - 0.
+    """
+    letters_only = re.sub(f"[^{re.escape(alphabet)}]", "\0", text_upper)
+    return letters_only.translate({ord(letter): index + 1 for index, letter in enumerate(alphabet)}).encode('latin-1')
+
+def column_histograms(codes, period, alphabet_size):
+    """
+    Гистограммы букв столбцов codes[r::period] (символов, зашифрованных одной буквой ключа).
+    Каждая буква столбца считается bytes.count.
+
+    :param codes: Текст в виде байтов (результат letter_codes).
+    """
+    histograms = []
+    for column in range(period):
+        column_codes = codes[column::period]
+        histograms.append([column_codes.count(code) for code in range(1, alphabet_size + 1)])
+    return histograms
+
+def friedman_period_scores(codes, alphabet_size, max_period=MAX_KEY_LENGTH):
+    """
+    Для каждой длины ключа 1..max_period считает средний индекс совпадений её столбцов.
+    Если длина кратна длине ключа, каждый столбец зашифрован одним сдвигом и индекс
+    близок к индексу совпадений русского текста; иначе - ближе к 1/N.
+
+    :param codes: Текст в виде байтов (результат letter_codes).
+    :return: Список длины max_period + 1 (элемент 0 не используется).
+    """
+    scores = [0.0] * (max_period + 1)
+    for period in range(1, max_period + 1):
+        histograms = column_histograms(codes, period, alphabet_size)
+        scores[period] = sum(map(index_of_coincidence, histograms)) / period
+    return scores
+
+def friedman_key_length(histogram, alphabet_size):
+    """
+    Оценка длины ключа по формуле Фридмана (по индексу совпадений всего шифротекста).
+    """
+    total = sum(histogram)
+    ic = index_of_coincidence(histogram)
+    random_ic = 1 / alphabet_size
+    denominator = (total - 1) * ic - total * random_ic + RUSSIAN_INDEX_OF_COINCIDENCE
+    if total < 2 or denominator <= 0:
+        return None
+    return (RUSSIAN_INDEX_OF_COINCIDENCE - random_ic) * total / denominator
+
+def vigenere_recover_key(codes, period, alphabet, frequencies=RUSSIAN_LETTER_FREQUENCIES):
+    """
+    Подбирает ключ заданной длины: каждый столбец - шифр Цезаря, для него выбирается
+    сдвиг с наименьшим хи-квадрат.
+
+    :param codes: Текст в виде байтов (результат letter_codes).
+
+    :return: Кортеж (ключ, сумма хи-квадрат по столбцам, логарифм правдоподобия дешифрованного текста).
+    """
+    key_letters = []
+    total_chi_squared = 0.0
+    total_log_likelihood = 0.0
+    for histogram in column_histograms(codes, period, len(alphabet)):
+        shift, chi_squared, log_likelihood = min(caesar_score_shifts(histogram, alphabet, frequencies),
+                                                 key=lambda item: item[1])
+        key_letters.append(alphabet[shift])
+        total_chi_squared += chi_squared
+        total_log_likelihood += log_likelihood
+    return "".join(key_letters), total_chi_squared, total_log_likelihood
+
+def shortest_key_period(key):
+    """
+    Если ключ - повторение более короткого ключа (например, 'КОТКОТ'), возвращает длину этого ключа.
+    """
+    for period in range(1, len(key)):
+        if len(key) % period == 0 and key[:period] * (len(key) // period) == key:
+            return period
+    return len(key)
+
+def vigenere_analyze(text, alphabet, max_period=MAX_KEY_LENGTH, candidates=5, frequencies=RUSSIAN_LETTER_FREQUENCIES):
+    """
+    Анализ шифротекста Виженера: метод Касиски, индекс совпадений для каждой длины ключа,
+    оценка Фридмана и подбор ключа для лучших длин. Время работы линейно по длине текста.
+
+    Первой проверяется наименьшая длина, средний индекс совпадений столбцов которой ближе
+    к русскому тексту, чем к случайному, и не меньше доли IC_PEAK_SHARE от наибольшего;
+    затем - длины с наибольшим индексом совпадений и с наибольшим числом повторов Касиски.
+    Ключ, который оказался повторением более короткого, сокращается. Найденные ключи
+    упорядочиваются по правдоподобию дешифрованного текста за вычетом KEY_LETTER_PENALTY
+    на каждую букву ключа (более длинный ключ всегда подгоняется к частотам лучше).
+
+    :param text: Шифротекст (строка).
+    :param alphabet: Алфавит (строка).
+    :param max_period: Наибольшая проверяемая длина ключа.
+    :param candidates: Сколько длин ключа проверить подбором (не больше).
+    :return: Словарь с полями
+             'kasiski' - список числа повторов по длинам ключа,
+             'ic' - список средних индексов совпадений столбцов по длинам ключа,
+             'friedman' - оценка длины ключа по формуле Фридмана (или None),
+             'results' - список словарей {'period', 'key', 'chi_squared', 'log_likelihood', 'ic', 'kasiski'},
+                         лучший ключ - первый.
+    """
+    text_upper = text.upper()
+    letters_count = sum(letter_histogram(text_upper, alphabet))
+    if letters_count < 2:
+        raise ValueError("Шифротекст слишком короткий для анализа.")
+    max_period = max(1, min(max_period, len(text_upper) // 2))
+
+    kasiski = kasiski_period_scores(kasiski_distances(text_upper, alphabet), max_period)
+    codes = letter_codes(text_upper, alphabet)
+    ic = friedman_period_scores(codes, len(alphabet), max_period)
+    friedman = friedman_key_length(letter_histogram(text_upper, alphabet), len(alphabet))
+
+    periods = range(1, max_period + 1)
+    threshold = max((RUSSIAN_INDEX_OF_COINCIDENCE + 1 / len(alphabet)) / 2,
+                    IC_PEAK_SHARE * max(ic[period] for period in periods))
+    order = [period for period in periods if ic[period] >= threshold][:1]
+    order += sorted(periods, key=lambda period: ic[period], reverse=True)
+    order += sorted(periods, key=lambda period: kasiski[period], reverse=True)
+
+    results = []
+    tried = set()
+    for period in order:
+        if len(tried) >= candidates:
+            break
+        if period in tried:
+            continue
+        tried.add(period)
+        key, chi_squared, log_likelihood = vigenere_recover_key(codes, period, alphabet, frequencies)
+        period = shortest_key_period(key)
+        key = key[:period]
+        tried.add(period)
+        if any(result['key'] == key for result in results):
+            continue
+        results.append({'period': period, 'key': key, 'chi_squared': chi_squared, 'log_likelihood': log_likelihood,
+                        'ic': ic[period], 'kasiski': kasiski[period]})
+    results.sort(key=lambda result: result['log_likelihood'] - KEY_LETTER_PENALTY * result['period'], reverse=True)
+
+    return {'kasiski': kasiski, 'ic': ic, 'friedman': friedman, 'results': results}
 
 def encrypt_action():
     text = input_text.get()
@@ -120,44 +694,189 @@ def decrypt_action():
     output_text.insert(tk.END, f"Дешифрованное сообщение: {decrypted}\n")
 
 
+def break_action():
+    """Обработчик кнопки 'Взломать (Касиски и Фридман)'."""
+    text = input_text.get()
+
+    if not text:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите шифротекст для анализа.\n")
+        return
+
+    try:
+        analysis = vigenere_analyze(text, alphabet)
+    except ValueError as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при анализе: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Зашифрованное сообщение: {text}\n")
+    if analysis['friedman'] is not None:
+        output_text.insert(tk.END, f"Оценка длины ключа по формуле Фридмана: {analysis['friedman']:.1f}\n")
+    output_text.insert(tk.END, "Длина ключа: средний индекс совпадений столбцов / повторов Касиски:\n")
+    for period in range(1, len(analysis['ic'])):
+        output_text.insert(tk.END, f"  {period}: {analysis['ic'][period]:.4f} / {analysis['kasiski'][period]}\n")
+    output_text.insert(tk.END, "Найденные ключи (лучший - первый):\n")
+    for result in analysis['results']:
+        output_text.insert(tk.END, f"  '{result['key']}' (длина {result['period']}): "
+                                   f"хи-квадрат = {result['chi_squared']:.2f}, "
+                                   f"лог. правдоподобие = {result['log_likelihood']:.2f}\n")
+    best_key = analysis['results'][0]['key']
+    output_text.insert(tk.END, f"Дешифрованное сообщение: {vigenere_decipher(text, best_key, alphabet)}\n")
+
+def process_file_action(decrypt):
+    """Общая часть обработчиков кнопок шифрования и дешифрования файла (mod 256)."""
+    key = key_entry.get()
+    if not key:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите ключевое слово.\n")
+        return
+    for char in key:
+        if char.upper() not in alphabet:
+             output_text.delete(1.0, tk.END)
+             output_text.insert(tk.END, f"Ошибка: Ключ '{key}' содержит символы, отсутствующие в алфавите '{alphabet}'.\n")
+             return
+
+    input_path = filedialog.askopenfilename(title="Выберите исходный файл")
+    if not input_path:
+        return
+    output_path = filedialog.asksaveasfilename(title="Сохранить результат как")
+    if not output_path:
+        return
+
+    try:
+        processed = vigenere_transform_bytes_file(input_path, output_path, key, alphabet, decrypt)
+    except OSError as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при обработке файла: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Исходный файл: {input_path}\n")
+    output_text.insert(tk.END, f"Файл результата: {output_path}\n")
+    output_text.insert(tk.END, f"Ключ: {key}\n")
+    output_text.insert(tk.END, f"Сдвиги ключа: {vigenere_key_offsets(key, alphabet)}\n")
+    output_text.insert(tk.END, f"Режим: {'дешифрование' if decrypt else 'шифрование'} (двоичный, по модулю 256)\n")
+    output_text.insert(tk.END, f"Обработано байтов: {processed}\n")
+
+def encrypt_file_action():
+    """Обработчик кнопки 'Зашифровать файл (mod 256)...'."""
+    process_file_action(decrypt=False)
+
+def decrypt_file_action():
+    """Обработчик кнопки 'Дешифровать файл (mod 256)...'."""
+    process_file_action(decrypt=True)
+
+# --- Живой режим: результат шифрования обновляется по мере ввода текста ---
+
+def vigenere_live_patch(old_text, new_text, old_output_length, compiled):
+    """
+    Перешифровывает только изменённый участок текста с позиции ключа start mod len(key).
+    Если длина текста изменилась не на кратное длине ключа, позиции ключа всего хвоста
+    сдвигаются, и участок продолжается до конца текста.
+
+    :param compiled: Скомпилированный ключ (результат compile_vigenere_key).
+    :return: Кортеж (начало, конец, замена) участка результата или None, если
+             верхний регистр меняет длину текста и результат нужно вывести целиком.
+    """
+    # Длина результата отличается от длины текста, только если верхний регистр меняет длину
+    # (например, 'ß'); тогда позиции ключа сдвигаются, и участок не перешифровать отдельно
+    if old_output_length != len(old_text):
+        return None
+    start, old_end, new_end = live_mode.changed_span(old_text, new_text)
+    if len(new_text[start:new_end].upper()) != new_end - start:
+        return None
+    key_length = len(compiled['offsets'])
+    if (len(new_text) - len(old_text)) % key_length:
+        old_end, new_end = len(old_text), len(new_text)
+    return start, old_end, vigenere_transform_text(new_text[start:new_end], compiled, start_phase=start % key_length)
+
+def live_update():
+    """Обновляет результат живого режима по текущему тексту и ключу."""
+    text = input_text.get()
+    key = key_entry.get()
+    if not key:
+        live_mode.show_live_error(live_state, "Ошибка: Введите ключевое слово.\n")
+        return
+    if any(char.upper() not in alphabet for char in key):
+        live_mode.show_live_error(live_state, f"Ошибка: Ключ '{key}' содержит символы, отсутствующие в алфавите '{alphabet}'.\n")
+        return
+
+    try:
+        compiled = compile_vigenere_key(key, alphabet)
+        patch = None
+        if live_mode.live_patch_possible(live_state, text, key):
+            patch = vigenere_live_patch(live_state['text'], text, live_state['output_length'], compiled)
+        live_mode.show_live_output(live_state, text, key, patch, lambda: vigenere_transform_text(text, compiled))
+    except Exception as e:
+        live_mode.show_live_error(live_state, f"Ошибка при шифровании: {e}\n")
+
 # --- Создание графического интерфейса ---
-root = tk.Tk()
-root.title("Шифр Виженера (Шифрование и Дешифрование)")
-root.geometry("800x550")
+# Окно создаётся только при запуске файла как программы: процессы-исполнители
+# ProcessPoolExecutor импортируют этот модуль повторно и не должны открывать своё окно.
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Шифр Виженера (Шифрование и Дешифрование)")
+    root.geometry("800x550")
+
+    # --- Виджеты ---
+
+    # Ввод текста
+    input_label = ttk.Label(root, text="Введите текст:")
+    input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+    input_var = tk.StringVar()
+    input_text = ttk.Entry(root, width=70, textvariable=input_var)
+    input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+
+    # Ввод ключа
+    key_label = ttk.Label(root, text="Введите ключевое слово:")
+    key_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+
+    key_var = tk.StringVar()
+    key_entry = ttk.Entry(root, width=30, textvariable=key_var)
+    key_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+
+    # Кнопки
+    encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
+    encrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
 
-# --- Виджеты ---
+    decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
+    decrypt_button.grid(row=4, column=1, padx=10, pady=5, sticky="e")
 
-# Ввод текста
-input_label = ttk.Label(root, text="Введите текст:")
-input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+    # Кнопки для обработки файлов в двоичном режиме
+    file_buttons_frame = ttk.Frame(root)
+    file_buttons_frame.grid(row=4, column=0, padx=10, pady=5, sticky="w")
 
-input_text = ttk.Entry(root, width=70)
-input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    encrypt_file_button = ttk.Button(file_buttons_frame, text="Зашифровать файл (mod 256)...", command=encrypt_file_action)
+    encrypt_file_button.pack(side=tk.LEFT, padx=(0, 5))
 
-# Ввод ключа
-key_label = ttk.Label(root, text="Введите ключевое слово:")
-key_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+    decrypt_file_button = ttk.Button(file_buttons_frame, text="Дешифровать файл (mod 256)...", command=decrypt_file_action)
+    decrypt_file_button.pack(side=tk.LEFT, padx=(0, 5))
 
-key_entry = ttk.Entry(root, width=30)
-key_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+    break_button = ttk.Button(file_buttons_frame, text="Взломать (Касиски и Фридман)", command=break_action)
+    break_button.pack(side=tk.LEFT, padx=(0, 5))
 
-# Кнопки
-encrypt_button = ttk.Button(root, text="Зашифровать", command=encrypt_action)
-encrypt_button.grid(row=3, column=1, padx=10, pady=5, sticky="e")
+    # Флажок живого режима: при изменении текста или ключа результат обновляется с задержкой
+    live_var = tk.BooleanVar()
+    live_check = ttk.Checkbutton(file_buttons_frame, text="Шифровать при вводе", variable=live_var, command=lambda: live_mode.live_mode_action(live_state))
+    live_check.pack(side=tk.LEFT)
 
-decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt_action)
-decrypt_button.grid(row=4, column=1, padx=10, pady=5, sticky="e")
+    # Вывод результата
+    output_label = ttk.Label(root, text="Результат:")
+    output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
 
-# Вывод результата
-output_label = ttk.Label(root, text="Результат:")
-output_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+    output_text = scrolledtext.ScrolledText(root, width=90, height=25)
+    output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
 
-output_text = scrolledtext.ScrolledText(root, width=90, height=25)
-output_text.grid(row=6, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+    # Состояние живого режима (см. live_mode.py) и подписка на изменения полей ввода
+    live_state = live_mode.create_live_state(root, output_text, live_var, live_update)
+    live_mode.watch_variables(live_state, input_var, key_var)
 
-# --- Настройка сетки ---
-root.grid_rowconfigure(6, weight=1)
-root.grid_columnconfigure(0, weight=1)
+    # --- Настройка сетки ---
+    root.grid_rowconfigure(6, weight=1)
+    root.grid_columnconfigure(0, weight=1)
 
-# Запуск главного цикла
-root.mainloop()
+    # Запуск главного цикла
+    root.mainloop()
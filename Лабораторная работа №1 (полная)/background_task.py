@@ -0,0 +1,75 @@
+import threading
+import time
+import tkinter as tk
+
+# Общий код фоновых операций для заданий лабораторной работы №1: подбор ключа отжигом
+# и атака по словарю идут секунды и минуты, поэтому выполняются в отдельном потоке, а окно
+# опрашивает поток через root.after и выводит результат, когда он готов.
+
+# Период опроса фоновой операции, мс
+POLL_INTERVAL_MS = 250
+
+def create_task_state(root, output_text, buttons):
+    """
+    Создаёт состояние фоновых операций окна.
+
+    :param root: Главное окно (для root.after).
+    :param output_text: Окно вывода результата.
+    :param buttons: Кнопки долгих операций; пока идёт любая из них, все кнопки отключены.
+    :return: Словарь: виджеты, поток текущей операции, время её запуска, результат или текст ошибки.
+    """
+    return {'root': root, 'output_text': output_text, 'buttons': buttons,
+            'thread': None, 'started': 0.0, 'result': None, 'error': None}
+
+def run_in_background(state, work, show_result, progress_message, error_context):
+    """
+    Запускает work() в фоновом потоке и отключает кнопки долгих операций.
+    Если другая операция ещё не завершилась, ничего не делает.
+
+    :param work: Функция без аргументов, выполняющая операцию (вызывается в фоновом потоке).
+    :param show_result: Функция, выводящая результат work() (вызывается в потоке окна).
+    :param progress_message: Текст, показываемый пока операция идёт (например, "Идёт подбор таблицы").
+    :param error_context: Продолжение сообщения об ошибке (например, "при подборе таблицы").
+    """
+    if state['thread'] is not None:
+        return
+    state.update(result=None, error=None, started=time.monotonic())
+    state['thread'] = threading.Thread(target=background_worker, args=(state, work, error_context), daemon=True)
+    state['thread'].start()
+    for button in state['buttons']:
+        button.config(state=tk.DISABLED)
+    poll_background_task(state, show_result, progress_message)
+
+def background_worker(state, work, error_context):
+    """
+    Выполняет операцию в фоновом потоке. Результат или текст ошибки кладётся в state,
+    его забирает poll_background_task.
+    """
+    try:
+        state['result'] = work()
+    except ValueError as e:
+        state['error'] = f"Ошибка {error_context}: {e}"
+    except Exception as e:
+        state['error'] = f"Неизвестная ошибка {error_context}: {e}"
+
+def poll_background_task(state, show_result, progress_message):
+    """
+    Периодически (через root.after) проверяет фоновую операцию: пока она идёт, показывает
+    прошедшее время, а по завершении выводит результат или ошибку и снова включает кнопки.
+    """
+    output_text = state['output_text']
+    if state['thread'].is_alive():
+        elapsed = time.monotonic() - state['started']
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"{progress_message}... прошло {elapsed:.0f} с\n")
+        state['root'].after(POLL_INTERVAL_MS, poll_background_task, state, show_result, progress_message)
+        return
+
+    state['thread'] = None
+    for button in state['buttons']:
+        button.config(state=tk.NORMAL)
+    if state['error'] is not None:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"{state['error']}\n")
+        return
+    show_result(state['result'])
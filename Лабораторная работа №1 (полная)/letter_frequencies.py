@@ -0,0 +1,71 @@
+from collections import Counter
+import math
+
+# Общий частотный анализ для заданий лабораторной работы №1: взлом шифра Цезаря (задание 1)
+# и подбор букв ключа Виженера по столбцам (задание 7) оценивают сдвиги одной функцией.
+
+# Относительные частоты букв русского языка (в процентах)
+RUSSIAN_LETTER_FREQUENCIES = {
+    'А': 8.01, 'Б': 1.59, 'В': 4.54, 'Г': 1.70, 'Д': 2.98, 'Е': 8.45, 'Ё': 0.04,
+    'Ж': 0.94, 'З': 1.65, 'И': 7.35, 'Й': 1.21, 'К': 3.49, 'Л': 4.40, 'М': 3.21,
+    'Н': 6.70, 'О': 10.97, 'П': 2.81, 'Р': 4.73, 'С': 5.47, 'Т': 6.26, 'У': 2.62,
+    'Ф': 0.26, 'Х': 0.97, 'Ц': 0.48, 'Ч': 1.44, 'Ш': 0.73, 'Щ': 0.36, 'Ъ': 0.04,
+    'Ы': 1.90, 'Ь': 1.74, 'Э': 0.32, 'Ю': 0.64, 'Я': 2.01,
+}
+
+# Частота, которая подставляется для буквы алфавита, отсутствующей в таблице частот
+MIN_LETTER_FREQUENCY = 0.01
+
+def letter_histogram(text_parts, alphabet):
+    """
+    Подсчитывает количество каждой буквы алфавита за один проход по тексту.
+    Строчные буквы учитываются вместе с заглавными.
+
+    :param text_parts: Текст (строка) или последовательность фрагментов текста (например, прочитанных из файла).
+    :param alphabet: Алфавит (строка).
+    :return: Список количеств, индекс списка - индекс буквы в алфавите.
+    """
+    if isinstance(text_parts, str):
+        text_parts = [text_parts]
+
+    counts = Counter()
+    for part in text_parts:
+        counts.update(part)
+
+    return [counts[letter] + (counts[letter.lower()] if letter.lower() != letter else 0) for letter in alphabet]
+
+def caesar_score_shifts(histogram, alphabet, frequencies=RUSSIAN_LETTER_FREQUENCIES):
+    """
+    Оценивает все возможные сдвиги шифра Цезаря по гистограмме шифротекста.
+
+    Для сдвига s буква открытого текста с индексом j встречается столько же раз,
+    сколько буква шифротекста с индексом (j + s) mod N, поэтому для каждого сдвига
+    достаточно циклически сдвинуть гистограмму и сравнить её с эталонными частотами.
+    Сложность - O(N^2) по размеру алфавита и не зависит от длины текста.
+
+    :param histogram: Гистограмма шифротекста (результат letter_histogram).
+    :param alphabet: Алфавит (строка).
+    :param frequencies: Эталонные частоты букв (словарь буква -> частота).
+    :return: Список кортежей (сдвиг, хи-квадрат, логарифм правдоподобия) для всех сдвигов по порядку.
+    """
+    alphabet_size = len(alphabet)
+    total_letters = sum(histogram)
+
+    reference = [frequencies.get(letter, MIN_LETTER_FREQUENCY) for letter in alphabet]
+    reference_sum = sum(reference)
+    probabilities = [value / reference_sum for value in reference]
+    log_probabilities = [math.log(p) for p in probabilities]
+    expected = [total_letters * p for p in probabilities]
+
+    scores = []
+    for shift in range(alphabet_size):
+        rolled = histogram[shift:] + histogram[:shift]
+        chi_squared = 0.0
+        log_likelihood = 0.0
+        for j in range(alphabet_size):
+            observed = rolled[j]
+            if expected[j] > 0:
+                chi_squared += (observed - expected[j]) ** 2 / expected[j]
+            log_likelihood += observed * log_probabilities[j]
+        scores.append((shift, chi_squared, log_likelihood))
+    return scores
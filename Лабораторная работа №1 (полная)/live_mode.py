@@ -0,0 +1,142 @@
+import tkinter as tk
+
+# Общий код живого режима для заданий лабораторной работы №1: результат шифрования
+# обновляется по мере ввода текста. В файле задания остаются только функция live_update
+# (чтение ключа и вызов шифра) и функция *_live_patch, перешифровывающая изменённый участок.
+
+# Задержка (в миллисекундах) между последним изменением ввода и обновлением результата:
+# пока пользователь печатает или вставляет текст, шифрование откладывается
+LIVE_UPDATE_DELAY_MS = 150
+
+def create_live_state(root, output_text, live_var, update):
+    """
+    Создаёт состояние живого режима.
+
+    :param root: Главное окно (для root.after).
+    :param output_text: Окно вывода результата.
+    :param live_var: Переменная флажка 'Шифровать при вводе'.
+    :param update: Функция задания, обновляющая результат (live_update).
+    :return: Словарь: виджеты, текст и ключ, для которых показан результат, длина результата
+             и идентификатор отложенного обновления (root.after).
+    """
+    return {'root': root, 'output_text': output_text, 'live_var': live_var, 'update': update,
+            'text': None, 'key': None, 'output_length': 0, 'after_id': None}
+
+def watch_variables(state, *variables):
+    """
+    Подписывает живой режим на изменения переменных Tk (текста и параметров ключа).
+    """
+    for variable in variables:
+        variable.trace_add("write", lambda *args: schedule_live_update(state))
+
+def common_prefix_length(first, second, limit):
+    """
+    Возвращает длину общего начала двух строк (не больше limit).
+    Граница ищется двоичным поиском по срезам, без посимвольного цикла.
+    """
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[low:middle] == second[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def common_suffix_length(first, second, limit):
+    """
+    Возвращает длину общего конца двух строк (не больше limit).
+    """
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[len(first) - middle:len(first) - low] == second[len(second) - middle:len(second) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def changed_span(old_text, new_text):
+    """
+    Находит изменённый участок: old_text[start:old_end] заменён на new_text[start:new_end],
+    а всё до и после участка совпадает.
+
+    :return: Кортеж (start, old_end, new_end).
+    """
+    limit = min(len(old_text), len(new_text))
+    start = common_prefix_length(old_text, new_text, limit)
+    suffix = common_suffix_length(old_text, new_text, limit - start)
+    return start, len(old_text) - suffix, len(new_text) - suffix
+
+def live_output_span(old_text, start, end, output_length, measure):
+    """
+    Находит участок результата, соответствующий участку old_text[start:end], когда длина
+    результата не равна длине текста. Длина результата для части текста считается функцией
+    measure по более короткой из неизменённых частей (до участка или после него).
+
+    :return: Кортеж (начало, конец) участка результата.
+    """
+    changed_length = measure(old_text[start:end])
+    if start <= len(old_text) - end:
+        output_start = measure(old_text[:start])
+        return output_start, output_start + changed_length
+    output_end = output_length - measure(old_text[end:])
+    return output_end - changed_length, output_end
+
+def live_patch_possible(state, text, key):
+    """
+    Проверяет, можно ли заменить в окне вывода только изменённый участок: показан результат
+    живого режима для того же ключа, и окно вывода с тех пор не менялось.
+    """
+    if state['text'] is None or state['key'] != key or state['output_text'].edit_modified():
+        return False
+    # Tk считает символ вне BMP за два, и позиции в окне перестают совпадать с позициями в строке
+    return max(text, default="") <= "\uffff" and max(state['text'], default="") <= "\uffff"
+
+def show_live_output(state, text, key, patch, encrypt_all):
+    """
+    Выводит результат живого режима: заменяет только участок patch = (начало, конец, замена)
+    или, если patch равен None, выводит весь результат encrypt_all().
+    """
+    output_text = state['output_text']
+    if patch is None:
+        result = encrypt_all()
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, result)
+        state['output_length'] = len(result)
+    else:
+        start, end, replacement = patch
+        output_text.replace(f"1.0 + {start} chars", f"1.0 + {end} chars", replacement)
+        state['output_length'] += len(replacement) - (end - start)
+    output_text.edit_modified(False)
+    state['text'] = text
+    state['key'] = key
+
+def show_live_error(state, message):
+    """Выводит сообщение об ошибке и сбрасывает state['text'], чтобы следующее обновление вывело результат целиком."""
+    state['output_text'].delete(1.0, tk.END)
+    state['output_text'].insert(tk.END, message)
+    state['text'] = None
+
+def schedule_live_update(state):
+    """
+    Откладывает обновление живого режима на LIVE_UPDATE_DELAY_MS. Каждое новое изменение
+    ввода отменяет предыдущее отложенное обновление.
+    """
+    if not state['live_var'].get():
+        return
+    if state['after_id'] is not None:
+        state['root'].after_cancel(state['after_id'])
+    state['after_id'] = state['root'].after(LIVE_UPDATE_DELAY_MS, run_live_update, state)
+
+def run_live_update(state):
+    """Выполняет отложенное обновление, если живой режим всё ещё включён."""
+    state['after_id'] = None
+    if state['live_var'].get():
+        state['update']()
+
+def live_mode_action(state):
+    """Обработчик флажка 'Шифровать при вводе'."""
+    state['text'] = None
+    if state['live_var'].get():
+        state['update']()
@@ -0,0 +1,144 @@
+from collections import Counter
+import math
+
+# Общая модель квадграмм русского языка для заданий лабораторной работы №1: по ней
+# криптоанализ (подбор ключа, атака по словарю) оценивает варианты дешифрования.
+
+# Образец русского текста для построения модели n-грамм по умолчанию.
+# Для лучшего качества можно загрузить статистику из файла (см. load_ngram_model).
+RUSSIAN_SAMPLE_TEXT = """
+Осенним утром над рекой стоял густой туман, и старый деревянный мост казался висящим в воздухе.
+Рыбаки ещё с вечера приготовили лодки, но выходить на воду не торопились: ветер переменился, и по
+всему было видно, что к полудню начнётся дождь. В деревне просыпались медленно. Где-то скрипнула
+калитка, залаяла собака, хозяйка вынесла во двор ведро с водой. Дети собирались в школу, которая
+стояла на другом берегу, за берёзовой рощей. Учитель, человек немолодой и строгий, каждое утро
+встречал их у крыльца и спрашивал, выучили ли они заданные вчера стихи.
+Жизнь здесь шла своим чередом, и никто не думал о том, что происходит в больших городах. Новости
+приходили с опозданием, письма шли неделями, а газеты читали вслух по вечерам, собираясь у самовара.
+Старики вспоминали прежние времена, когда река была шире, а леса гуще, и спорили о том, какая зима
+будет в этом году. Молодые люди мечтали уехать учиться, но многие потом возвращались, потому что
+нигде не находили такого простора и такой тишины.
+Шифры и тайнопись известны людям с древнейших времён. Ещё полководцы античного мира отправляли
+донесения, в которых каждая буква была заменена другой, чтобы противник, перехватив гонца, не смог
+понять содержание письма. Позднее появились более сложные системы: таблицы, квадраты, ключевые слова
+и целые книги, по которым составлялись сообщения. Каждый новый способ защиты рождал новый способ
+нападения, и история криптографии стала историей непрерывного соперничества между теми, кто прячет
+смысл, и теми, кто стремится его раскрыть.
+Частотный анализ основан на простом наблюдении: в любом языке одни буквы встречаются чаще других. В
+русском тексте чаще всего попадаются буквы о, е, а, и, н, т, а реже всего твёрдый знак, буква ф и
+буква э. Если заменить каждую букву другой, частоты сохранятся, и внимательный исследователь сумеет
+по ним восстановить ключ. Ещё надёжнее работают сочетания из двух, трёх и четырёх букв, потому что
+их распределение гораздо богаче и лучше отражает строение языка.
+Вечером туман снова опустился на реку. В окнах зажглись огни, и над крышами потянулся дым. Мальчик,
+сидевший у окна, долго смотрел на тёмную воду и думал о дальних странах, о кораблях и о людях,
+которые пишут друг другу письма, понятные только им двоим. Он взял лист бумаги и начал придумывать
+свой собственный шифр, не зная ещё, что почти все такие шифры давно разгаданы.
+На следующий день он показал свою таблицу старшему брату. Брат внимательно посмотрел на неё,
+улыбнулся и сказал, что любую замену букв можно прочитать, если текст достаточно длинный. Мальчик не
+поверил и написал короткую записку, в которой не было ни одного знакомого слова. Брат долго сидел
+над ней, выписывал на полях столбики букв, считал, сколько раз встречается каждая, и к вечеру
+прочитал всё послание целиком.
+Тогда мальчик решил, что одной таблицы мало, и стал менять ключ для каждого нового слова. Теперь
+брату пришлось труднее, но и сам автор нередко путался, когда пытался прочитать собственные записи.
+Так он на своём опыте понял главное правило: надёжная система должна быть простой для того, кто
+знает ключ, и сложной для всех остальных.
+Прошли годы. Мальчик вырос, окончил университет и стал работать в большой лаборатории, где
+занимались защитой информации. Его товарищи разрабатывали новые алгоритмы, проверяли их стойкость и
+искали слабые места в чужих решениях. Иногда по вечерам он вспоминал туманную реку, старый мост и
+свою первую тетрадь с самодельным шифром, которую до сих пор хранил в ящике письменного стола.
+Однажды к ним пришло письмо от школьного учителя. Старик писал, что в деревне построили новую школу,
+что река по-прежнему широка и спокойна, а мост всё так же скрипит под телегами. В конце письма
+стояла строчка, набранная странными значками. Инженер улыбнулся, достал с полки старую тетрадь и без
+труда прочитал: учитель помнил его детскую игру и решил напомнить о ней своему бывшему ученику.
+Весной он приехал домой. Снег уже сошёл, на берегу зеленела трава, а в роще пели птицы. Учитель
+встретил его у крыльца, как когда-то встречал всех учеников, и спросил, выучил ли он заданные стихи.
+Они долго смеялись, потом пили чай и говорили о том, как изменился мир и как мало изменились люди,
+которые по-прежнему хотят делиться тайнами только с теми, кому доверяют.
+"""
+
+# Длина n-граммы, по которой оценивается текст (квадграммы)
+NGRAM_SIZE = 4
+
+def text_to_indices(text, original_alphabet):
+    """
+    Переводит текст в список индексов букв алфавита, пропуская все остальные символы.
+
+    :param text: Текст (строка).
+    :param original_alphabet: Алфавит (строка).
+    :return: Список индексов (целые числа).
+    """
+    index_of = {letter: index for index, letter in enumerate(original_alphabet)}
+    return [index_of[char] for char in text.upper() if char in index_of]
+
+def build_ngram_model(corpus_text, original_alphabet):
+    """
+    Строит модель квадграмм (логарифмы вероятностей) по образцу текста.
+
+    :param corpus_text: Образец текста на русском языке (строка).
+    :param original_alphabet: Алфавит (строка).
+    :return: Словарь с полями 'log_probs' (квадграмма -> log10 вероятности) и 'floor'
+             (значение для квадграмм, не встретившихся в образце).
+    """
+    letters = "".join(original_alphabet[index] for index in text_to_indices(corpus_text, original_alphabet))
+    counts = Counter(letters[i:i + NGRAM_SIZE] for i in range(len(letters) - NGRAM_SIZE + 1))
+    return ngram_model_from_counts(counts)
+
+def load_ngram_model(file_path, original_alphabet):
+    """
+    Загружает статистику квадграмм из текстового файла.
+    Каждая строка файла: квадграмма и её количество через пробел (например, "СТВО 12345").
+
+    :param file_path: Путь к файлу (строка).
+    :param original_alphabet: Алфавит (строка).
+    :return: Модель в том же формате, что и у build_ngram_model.
+    """
+    counts = Counter()
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) != 2:
+                continue
+            gram = parts[0].upper()
+            if len(gram) == NGRAM_SIZE and all(char in original_alphabet for char in gram):
+                counts[gram] += int(parts[1])
+    return ngram_model_from_counts(counts)
+
+def ngram_model_from_counts(counts):
+    """
+    Переводит количества квадграмм в логарифмы вероятностей.
+
+    :param counts: Количества квадграмм (Counter или словарь).
+    :return: Словарь с полями 'log_probs' и 'floor'.
+    """
+    total = sum(counts.values())
+    if total == 0:
+        raise ValueError("Статистика n-грамм пуста.")
+    log_probs = {gram: math.log10(count / total) for gram, count in counts.items()}
+    return {'log_probs': log_probs, 'floor': math.log10(0.01 / total)}
+
+def build_ngram_table(model, original_alphabet):
+    """
+    Раскладывает модель квадграмм в плоский список длины N^4,
+    где квадграмма (a, b, c, d) хранится по индексу ((a * N + b) * N + c) * N + d.
+
+    :param model: Модель квадграмм (результат build_ngram_model или load_ngram_model).
+    :param original_alphabet: Алфавит (строка).
+    :return: Список логарифмов вероятностей.
+    """
+    alphabet_size = len(original_alphabet)
+    table = [model['floor']] * alphabet_size ** NGRAM_SIZE
+    index_of = {letter: index for index, letter in enumerate(original_alphabet)}
+    for gram, log_prob in model['log_probs'].items():
+        code = 0
+        for char in gram:
+            code = code * alphabet_size + index_of[char]
+        table[code] = log_prob
+    return table
+
+def score_indices(plain_indices, table, alphabet_size):
+    """
+    Оценивает текст (в виде индексов букв) суммой логарифмов вероятностей всех его квадграмм.
+    """
+    w1, w2, w3 = alphabet_size ** 3, alphabet_size ** 2, alphabet_size
+    p = plain_indices
+    return sum(table[p[i] * w1 + p[i + 1] * w2 + p[i + 2] * w3 + p[i + 3]] for i in range(len(p) - 3))
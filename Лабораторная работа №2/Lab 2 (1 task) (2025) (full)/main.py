@@ -1,5 +1,130 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+from collections import OrderedDict
+
+# --- Табличный движок перестановки ---
+# Дополненный текст - это таблица num_rows x n, записанная по строкам, поэтому столбец j
+# таблицы - это срез текста с шагом n: padded_text[j::n]. Шифрование выбирает столбцы
+# в порядке ключа и записывает их подряд (считывание по столбцам), дешифрование
+# симметрично - возвращает каждый столбец на его место срезом с шагом n.
+# Срезы выполняются целиком на уровне C, без обхода таблицы в циклах Python.
+
+# Максимальное число скомпилированных ключей в кэше (вытесняются давно не использованные)
+PERMUTATION_CACHE_SIZE = 32
+
+# Кэш скомпилированных ключей: (шифр, ключ) -> ключ
+permutations_cache = OrderedDict()
+
+def lru_get(cache, key):
+    """
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении PERMUTATION_CACHE_SIZE.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > PERMUTATION_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def parse_permutation_key(key):
+    """
+    Преобразует ключ перестановки в список новых позиций символов (0-based).
+
+    Поддерживаются три формата ключа:
+    - строка цифр, по одной цифре на позицию: "2417653" (ширина таблицы до 9);
+    - номера позиций (1-индекс) через запятую: "12,3,1,...,2" (ширина таблицы не ограничена);
+    - ключевое слово из букв: "ДЯДИНА". Символ j переходит на позицию, равную месту
+      j-й буквы ключа в алфавитном порядке (одинаковые буквы - слева направо),
+      для "ДЯДИНА" это [1, 5, 2, 3, 4, 0].
+
+    :param key: Ключ перестановки (str).
+    :return: Список новых позиций символов (0-based).
+    :raises ValueError: Если ключ пустой или не является перестановкой позиций.
+    """
+    if key.isdigit():
+        # Преобразуем строку в список целых чисел
+        key_indices = [int(k) - 1 for k in key]
+        # Проверяем, что все индексы уникальны и не выходят за пределы [0, len(key)-1]
+        if len(set(key_indices)) != len(key_indices) or any(k < 0 or k >= len(key_indices) for k in key_indices):
+            raise ValueError("Ключ должен содержать только уникальные цифры от 1 до длины ключа.")
+        return key_indices
+    if "," in key:
+        try:
+            key_indices = [int(k) - 1 for k in key.split(",")]
+        except ValueError:
+            raise ValueError("Номера позиций в ключе должны быть целыми числами через запятую.")
+        if len(set(key_indices)) != len(key_indices) or any(k < 0 or k >= len(key_indices) for k in key_indices):
+            raise ValueError("Ключ должен содержать уникальные номера позиций от 1 до длины ключа.")
+        return key_indices
+    if key.isalpha():
+        # Место каждой буквы в алфавитном порядке ключа (сортировка устойчива)
+        sorted_indices = sorted(range(len(key)), key=lambda k: key[k])
+        key_indices = [0] * len(key)
+        for new_pos, j in enumerate(sorted_indices):
+            key_indices[j] = new_pos
+        return key_indices
+    if not key:
+        raise ValueError("Ключ не может быть пустым.")
+    raise ValueError("Ключ должен содержать только цифры, номера позиций через запятую или буквы.")
+
+def compile_simple_permutation(key_indices):
+    """
+    Компилирует ключ простой одинарной перестановки в порядок считывания столбцов.
+
+    Символ из столбца j переходит в столбец key_indices[j], поэтому c-й столбец
+    шифротекста - это столбец columns[c] исходной таблицы, где key_indices[columns[c]] = c.
+
+    :param key_indices: Ключ - список новых позиций символов (0-based).
+    :return: Словарь с полями 'key_indices' и 'columns' (списки целых чисел).
+    """
+    cache_key = ('simple', tuple(key_indices))
+    compiled = lru_get(permutations_cache, cache_key)
+    if compiled is None:
+        columns = [0] * len(key_indices)
+        for j, new_pos in enumerate(key_indices):
+            columns[new_pos] = j
+        compiled = {'key_indices': list(key_indices), 'columns': columns}
+        lru_put(permutations_cache, cache_key, compiled)
+    return compiled
+
+def permute_columns(padded_text, compiled):
+    """
+    Переставляет столбцы таблицы, записанной по строкам, и считывает её по столбцам.
+
+    :param padded_text: Текст, длина которого кратна ширине таблицы (строка).
+    :param compiled: Скомпилированный ключ (см. compile_simple_permutation).
+    :return: Столбцы таблицы в порядке ключа, записанные подряд (строка).
+    """
+    n = len(compiled['columns'])
+    return "".join([padded_text[col_idx::n] for col_idx in compiled['columns']])
+
+def unpermute_columns(ciphertext, compiled):
+    """
+    Обратная к permute_columns операция: шифротекст разбивается на столбцы по num_rows
+    символов, и каждый столбец записывается на своё место в таблице срезом с шагом n.
+
+    :param ciphertext: Шифротекст, длина которого кратна ширине таблицы (строка).
+    :param compiled: Скомпилированный ключ (см. compile_simple_permutation).
+    :return: Таблица, считанная по строкам (строка).
+    """
+    key_indices = compiled['key_indices']
+    n = len(key_indices)
+    num_rows = len(ciphertext) // n
+    # Столбцы собираются в буфер UTF-32 (по 4 байта на символ) через память с шагом n
+    source = memoryview(ciphertext.encode('utf-32-le')).cast('I')
+    buffer = bytearray(4 * len(ciphertext))
+    code_points = memoryview(buffer).cast('I')
+    for j, new_pos in enumerate(key_indices):
+        start = new_pos * num_rows
+        code_points[j::n] = source[start:start + num_rows]
+    return buffer.decode('utf-32-le')
 
 def simple_permutation_encrypt(text, key):
     """
@@ -25,6 +150,8 @@ def simple_permutation_encrypt(text, key):
                 Длина ключа определяет ширину "виртуальной таблицы".
                 Каждая цифра в ключе - это номер позиции (1-инддекс), куда перейдет
                 символ из исходной позиции.
+                Для таблиц шире 9 столбцов номера позиций перечисляются через запятую,
+                также ключом может быть слово (см. parse_permutation_key).
     :return: tuple:
              - encrypted_text (str): Зашифрованный текст.
              - encrypted_table (list of lists): Виртуальная таблица после перестановки
@@ -33,21 +160,7 @@ def simple_permutation_encrypt(text, key):
     """
     # Преобразуем ключ в список индексов (0-based), чтобы использовать для индексации списков.
     # Например, ключ "2417653" становится [1, 3, 0, 6, 5, 4, 2] (1-2 -> 0-1, 4-1 -> 3-0 и т.д.)
-    try:
-        # Проверяем, что ключ состоит только из цифр
-        if not key.isdigit():
-            raise ValueError("Ключ должен содержать только цифры.")
-        # Преобразуем строку в список целых чисел
-        key_indices = [int(k) - 1 for k in key]
-        # Проверяем, что ключ не пустой
-        if len(key_indices) == 0:
-            raise ValueError("Ключ не может быть пустым.")
-        # Проверяем, что все индексы уникальны и не выходят за пределы [0, len(key)-1]
-        if len(set(key_indices)) != len(key_indices) or any(k < 0 or k >= len(key_indices) for k in key_indices):
-            raise ValueError("Ключ должен содержать только уникальные цифры от 1 до длины ключа.")
-    except ValueError as e:
-        # Если возникла ошибка при обработке ключа, поднимаем её дальше
-        raise e
+    key_indices = parse_permutation_key(key)
 
     n = len(key_indices) # n - ширина виртуальной таблицы, определяется длиной ключа
 
@@ -56,38 +169,18 @@ def simple_permutation_encrypt(text, key):
     original_length = len(text)
     padding_needed = (n - (original_length % n)) % n
     padded_text = text + ' ' * padding_needed
-    padded_length = len(padded_text)
-
-    # Создаем виртуальную таблицу, разбивая дополненный текст на строки длины n.
-    # Каждая строка таблицы будет подвергаться перестановке по ключу.
-    table = []
-    for i in range(0, padded_length, n):
-        row = list(padded_text[i:i+n]) # Берем n символов и создаем из них список (строку)
-        table.append(row)
-
-    # Применяем перестановку к каждой строке таблицы в соответствии с ключом.
-    # Новый символ на позиции new_pos берется из старой позиции j.
-    encrypted_table = []
-    for row in table:
-        # Создаем новую строку той же длины
-        encrypted_row = [''] * n
-        # Проходим по индексам из ключа (new_pos) и заполняем новую строку
-        # символами из старой строки (row) по правилу ключа (j -> new_pos)
-        for j, new_pos in enumerate(key_indices):
-            # j - старая позиция символа в строке
-            # new_pos - новая позиция символа в строке после перестановки
-            encrypted_row[new_pos] = row[j]
-        encrypted_table.append(encrypted_row)
-
-    # Формируем зашифрованный текст, считывая символы по столбцам из виртуальной таблицы.
-    # Это стандартный способ формирования итогового шифротекста для этого типа перестановки.
-    encrypted_chars = []
-    for col_idx in range(n): # Проходим по всем столбцам (от 0 до n-1)
-        for row in encrypted_table: # Проходим по всем строкам в таблице
-            encrypted_chars.append(row[col_idx]) # Добавляем символ из текущего столбца
+    num_rows = len(padded_text) // n
+
+    # Перестановка символов в строках и считывание по столбцам - выборка столбцов
+    # таблицы срезами с шагом n в порядке ключа (см. permute_columns)
+    encrypted_text = permute_columns(padded_text, compile_simple_permutation(key_indices))
+
+    # Шифротекст записан по столбцам, поэтому строка r таблицы после перестановки -
+    # это каждый num_rows-й символ шифротекста, начиная с r-го
+    encrypted_table = [list(encrypted_text[r::num_rows]) for r in range(num_rows)]
 
     # Возвращаем зашифрованный текст в виде строки и таблицу после перестановки строк
-    return ''.join(encrypted_chars), encrypted_table
+    return encrypted_text, encrypted_table
 
 def simple_permutation_decrypt(ciphertext, key):
     """
@@ -110,16 +203,7 @@ def simple_permutation_decrypt(ciphertext, key):
     :return: str: Восстановленный (дешифрованный) текст.
     """
     # Преобразуем ключ в список индексов (0-based), как и в encrypt
-    try:
-        if not key.isdigit():
-            raise ValueError("Ключ должен содержать только цифры.")
-        key_indices = [int(k) - 1 for k in key]
-        if len(key_indices) == 0:
-            raise ValueError("Ключ не может быть пустым.")
-        if len(set(key_indices)) != len(key_indices) or any(k < 0 or k >= len(key_indices) for k in key_indices):
-            raise ValueError("Ключ должен содержать только уникальные цифры от 1 до длины ключа.")
-    except ValueError as e:
-        raise e
+    key_indices = parse_permutation_key(key)
 
     n = len(key_indices)
     if n == 0:
@@ -130,49 +214,13 @@ def simple_permutation_decrypt(ciphertext, key):
     # Количество "строк" в виртуальной таблице при считывании по столбцам
     num_rows = ct_len // n if n != 0 else 0
 
-    # Создаем "столбцы" из зашифрованного текста
-    # Сначала разбиваем текст на n частей (столбцов)
-    columns = []
-    for i in range(n):
-        start_idx = i * num_rows
-        end_idx = start_idx + num_rows
-        col = list(ciphertext[start_idx:end_idx])
-        columns.append(col)
-
-    # Создаем обратный ключ
-    # Если key_indices[j] = new_pos, то inverse_key[new_pos] = j
-    inverse_key = [0] * n
-    for j, new_pos in enumerate(key_indices):
-        inverse_key[new_pos] = j
-
-    # Создаем пустую таблицу для восстановления строк
-    restored_table = [['' for _ in range(n)] for _ in range(num_rows)]
-
-    # Распределяем столбцы по *оригинальным* позициям, определяемым обратным ключом
-    for col_idx, col_data in enumerate(columns):
-        original_pos = inverse_key[col_idx]
-        for row_idx, char in enumerate(col_data):
-            restored_table[row_idx][original_pos] = char
-
-    # Формируем дешифрованный текст, считывая строки таблицы
-    decrypted_chars = []
-    for row in restored_table:
-        decrypted_chars.extend(row)
-
-    # Удаляем пробелы, которые были добавлены для выравнивания
-    decrypted_text = ''.join(decrypted_chars)
-    # Удаляем пробелы в конце, которые были добавлены при шифровании
-    original_len = ct_len # Длина исходного сообщения равна длине шифротекста в этом методе (без учета padding)
-    # Однако, на этапе шифрования мы не знаем оригинальную длину.
-    # Обычно, для восстановления оригинальной длины, нужно передавать её отдельно.
-    # В рамках этой задачи, будем удалять пробелы в конце.
-    # Если исходный текст действительно заканчивался на пробел, это может быть утеряно.
-    # Это компромисс для простоты реализации без дополнительной информации.
-    # Более надежно - передавать оригинальную длину.
-    # Для демонстрации, удаляем все пробелы в конце.
-    # original_len = len(text) передавалась бы как аргумент.
-    # decrypted_text = decrypted_text[:original_len]
-    # Вместо этого, удаляем пробелы в конце, полагая, что они были добавлены.
+    # Обратная перестановка столбцов и считывание по строкам - запись столбцов на их места
+    # срезами с шагом n. Символы сверх num_rows * n в таблицу не попадают и не используются.
+    decrypted_text = unpermute_columns(ciphertext[:num_rows * n], compile_simple_permutation(key_indices))
+
+    # Удаляем пробелы в конце, которые были добавлены при шифровании.
+    # Если исходный текст действительно заканчивался на пробел, это может быть утеряно:
+    # для точного восстановления исходную длину нужно передавать отдельно.
     return decrypted_text.rstrip(' ')
 
 
@@ -290,7 +338,7 @@ input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
 input_text.insert(0, "Колосов")
 
 # Метка для поля ввода ключа
-key_label = ttk.Label(root, text="Введите ключ перестановки (например, 2417653):")
+key_label = ttk.Label(root, text="Введите ключ перестановки (например, 2417653, 2,4,1,7,6,5,3 или ДЯДИНА):")
 # Размещаем метку (строка 2, столбец 0)
 key_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
 
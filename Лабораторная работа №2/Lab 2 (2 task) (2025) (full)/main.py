@@ -1,5 +1,54 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+import os
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from permutation_engine import apply_permutation, compile_permutation, inverse_permutation
+
+def compile_block_permutation(key_indices, length):
+    """
+    Компилирует ключ блочной одинарной перестановки для дополненного текста длины length.
+
+    Символ с позиции j блока переходит на позицию key_indices[j] того же блока, поэтому
+    позиция b * n + c результата берётся из позиции b * n + j, где key_indices[j] = c.
+
+    :param key_indices: Ключ - список новых позиций символов в блоке (0-based).
+    :param length: Длина дополненного текста (кратна длине ключа).
+    :return: Скомпилированная перестановка (см. compile_permutation).
+    """
+    n = len(key_indices)
+
+    def build_gather():
+        inverse_key = [0] * n
+        for j, new_pos in enumerate(key_indices):
+            inverse_key[new_pos] = j
+        return [start + source for start in range(0, length, n) for source in inverse_key]
+
+    return compile_permutation(('block', tuple(key_indices), length), build_gather)
+
+def parse_permutation_key(key):
+    """
+    Преобразует ключ перестановки в список новых позиций символов в блоке (0-based).
+    Например, ключ "2413" становится [1, 3, 0, 2].
+
+    :param key: Ключ перестановки (str) - строка цифр, по одной цифре на позицию.
+    :return: Список новых позиций символов (0-based).
+    :raises ValueError: Если ключ не является перестановкой цифр от 1 до длины ключа.
+    """
+    # Проверяем, что ключ состоит только из цифр
+    if not key.isdigit():
+        raise ValueError("Ключ должен содержать только цифры.")
+    # Преобразуем строку в список целых чисел
+    key_indices = [int(k) - 1 for k in key]
+    # Проверяем, что ключ не пустой
+    if len(key_indices) == 0:
+        raise ValueError("Ключ не может быть пустым.")
+    # Проверяем, что все индексы уникальны и не выходят за пределы [0, len(key)-1]
+    if len(set(key_indices)) != len(key_indices) or any(k < 0 or k >= len(key_indices) for k in key_indices):
+        raise ValueError("Ключ должен содержать только уникальные цифры от 1 до длины ключа.")
+    return key_indices
 
 def block_permutation_encrypt(text, key):
     """
@@ -33,21 +82,7 @@ def block_permutation_encrypt(text, key):
     """
     # Преобразуем ключ в список индексов (0-based), чтобы использовать для индексации списков.
     # Например, ключ "2413" становится [1, 3, 0, 2] (1-2 -> 0-1, 4-1 -> 3-0 и т.д.)
-    try:
-        # Проверяем, что ключ состоит только из цифр
-        if not key.isdigit():
-            raise ValueError("Ключ должен содержать только цифры.")
-        # Преобразуем строку в список целых чисел
-        key_indices = [int(k) - 1 for k in key]
-        # Проверяем, что ключ не пустой
-        if len(key_indices) == 0:
-            raise ValueError("Ключ не может быть пустым.")
-        # Проверяем, что все индексы уникальны и не выходят за пределы [0, len(key)-1]
-        if len(set(key_indices)) != len(key_indices) or any(k < 0 or k >= len(key_indices) for k in key_indices):
-            raise ValueError("Ключ должен содержать только уникальные цифры от 1 до длины ключа.")
-    except ValueError as e:
-        # Если возникла ошибка при обработке ключа, поднимаем её дальше
-        raise e
+    key_indices = parse_permutation_key(key)
 
     n = len(key_indices) # n - размер блока, определяется длиной ключа
 
@@ -58,34 +93,16 @@ def block_permutation_encrypt(text, key):
     padded_text = text + ' ' * padding_needed
     padded_length = len(padded_text)
 
-    # Разбиваем дополненный текст на блоки длины n.
-    # Каждый блок будет подвергаться перестановке по ключу.
-    blocks = []
-    for i in range(0, padded_length, n):
-        block = list(padded_text[i:i+n]) # Берем n символов и создаем из них список (блок)
-        blocks.append(block)
-
-    # Применяем перестановку к каждому блоку в соответствии с ключом.
-    # Новый символ на позиции new_pos берется из старой позиции j.
-    encrypted_blocks = []
-    for block in blocks:
-        # Создаем новый блок той же длины
-        encrypted_block = [''] * n
-        # Проходим по индексам из ключа (new_pos) и заполняем новый блок
-        # символами из старого блока по правилу ключа (j -> new_pos)
-        for j, new_pos in enumerate(key_indices):
-            # j - старая позиция символа в блоке
-            # new_pos - новая позиция символа в блоке после перестановки
-            encrypted_block[new_pos] = block[j]
-        encrypted_blocks.append(encrypted_block)
+    # Перестановка символов внутри всех блоков - одна выборка по скомпилированной
+    # перестановке позиций (см. compile_block_permutation)
+    compiled = compile_block_permutation(key_indices, padded_length)
+    encrypted_text = apply_permutation(padded_text, compiled['encrypt'])
 
-    # Формируем зашифрованный текст, объединяя все переставленные блоки.
-    encrypted_chars = []
-    for block in encrypted_blocks:
-        encrypted_chars.extend(block) # Добавляем все символы из переставленного блока
+    # Переставленные блоки - последовательные срезы шифротекста длины n
+    encrypted_blocks = [list(encrypted_text[i:i+n]) for i in range(0, padded_length, n)]
 
     # Возвращаем зашифрованный текст в виде строки и список переставленных блоков
-    return ''.join(encrypted_chars), encrypted_blocks
+    return encrypted_text, encrypted_blocks
 
 def block_permutation_decrypt(ciphertext, key):
     """
@@ -108,16 +125,7 @@ def block_permutation_decrypt(ciphertext, key):
     :return: str: Восстановленный (дешифрованный) текст.
     """
     # Преобразуем ключ в список индексов (0-based), как и в encrypt
-    try:
-        if not key.isdigit():
-            raise ValueError("Ключ должен содержать только цифры.")
-        key_indices = [int(k) - 1 for k in key]
-        if len(key_indices) == 0:
-            raise ValueError("Ключ не может быть пустым.")
-        if len(set(key_indices)) != len(key_indices) or any(k < 0 or k >= len(key_indices) for k in key_indices):
-            raise ValueError("Ключ должен содержать только уникальные цифры от 1 до длины ключа.")
-    except ValueError as e:
-        raise e
+    key_indices = parse_permutation_key(key)
 
     n = len(key_indices)
     if n == 0:
@@ -131,40 +139,135 @@ def block_permutation_decrypt(ciphertext, key):
         # Но добавим проверку на всякий случай.
         raise ValueError("Длина зашифрованного текста не кратна размеру блока.")
 
-    # Разбиваем зашифрованный текст на блоки
-    encrypted_blocks = []
-    for i in range(0, ct_len, n):
-        block = list(ciphertext[i:i+n])
-        encrypted_blocks.append(block)
-
-    # Создаем обратный ключ
-    # Если key_indices[j] = new_pos, то inverse_key[new_pos] = j
-    inverse_key = [0] * n
-    for j, new_pos in enumerate(key_indices):
-        inverse_key[new_pos] = j
-
-    # Применяем обратную перестановку к каждому блоку
-    decrypted_blocks = []
-    for encrypted_block in encrypted_blocks:
-        # Создаем новый блок для восстановления
-        decrypted_block = [''] * n
-        # Проходим по индексам из обратного ключа
-        for j, original_pos in enumerate(inverse_key):
-            # Символ из позиции j в зашифрованном блоке
-            # должен вернуться на позицию original_pos в исходном
-            decrypted_block[original_pos] = encrypted_block[j]
-        decrypted_blocks.append(decrypted_block)
-
-    # Формируем дешифрованный текст, объединяя восстановленные блоки
-    decrypted_chars = []
-    for block in decrypted_blocks:
-        decrypted_chars.extend(block)
-
-    # Восстановленный текст (включая добавленные пробелы)
-    decrypted_text_with_padding = ''.join(decrypted_chars)
+    # Обратная перестановка внутри всех блоков - одна выборка по обратной перестановке
+    compiled = compile_block_permutation(key_indices, ct_len)
+    decrypted_text_with_padding = apply_permutation(ciphertext, inverse_permutation(compiled))
+
     # Удаляем пробелы в конце, которые были добавлены при шифровании
     return decrypted_text_with_padding.rstrip(' ')
 
+# --- Потоковый режим: блочная перестановка над байтами файла ---
+# Блоки независимы, поэтому файл обрабатывается частями, кратными размеру блока n.
+# Часть файла - это таблица (блоки x n), записанная по строкам: столбец j - срез с шагом n.
+# Перестановка внутри всех блоков части - n присваиваний срезов с шагом n между двумя
+# буферами, которые создаются один раз, поэтому расход памяти не зависит от размера файла.
+# Последний блок дополняется по схеме PKCS#7 (k байтов со значением k, от 1 до n),
+# чтобы дешифрование точно восстанавливало любые двоичные данные.
+
+# Размер части (в байтах) при потоковой обработке файлов
+FILE_CHUNK_SIZE = 1024 * 1024
+
+def read_into_buffer(file, view):
+    """
+    Заполняет буфер данными из файла, пока он не заполнится или файл не закончится.
+
+    :param file: Файл, открытый в двоичном режиме.
+    :param view: Буфер для чтения (memoryview над bytearray).
+    :return: Количество прочитанных байтов (меньше размера буфера только в конце файла).
+    """
+    filled = 0
+    while filled < len(view):
+        count = file.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+def permute_block_columns(source, target, length, order):
+    """
+    Переставляет байты внутри всех блоков: столбец c таблицы (блоки x n) в target
+    получает столбец order[c] из source.
+
+    :param source: Исходные байты (bytearray).
+    :param target: Буфер результата (bytearray не короче length).
+    :param length: Количество обрабатываемых байтов (кратно n).
+    :param order: order[c] - позиция в блоке, из которой берётся байт c (список целых чисел).
+    """
+    n = len(order)
+    for c, j in enumerate(order):
+        target[c:length:n] = source[j:length:n]
+
+def block_permutation_transform_file(input_path, output_path, key, decrypt=False, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Применяет блочную перестановку к байтам файла потоково и записывает результат в другой файл.
+
+    :param input_path: Путь к исходному файлу (строка).
+    :param output_path: Путь к файлу результата (строка).
+    :param key: Ключ перестановки (str), например, "2413".
+    :param decrypt: Дешифровать (обратная перестановка и снятие дополнения) вместо шифрования.
+    :param chunk_size: Размер части чтения в байтах (округляется вниз до кратного длине ключа).
+    :return: Количество прочитанных байтов (целое число).
+    :raises ValueError: Если ключ некорректен, длина зашифрованного файла не кратна
+                        размеру блока или дополнение последнего блока повреждено.
+    """
+    key_indices = parse_permutation_key(key)
+    n = len(key_indices)
+    if decrypt:
+        # При дешифровании байт c блока возвращается на позицию j, где key_indices[j] = c
+        order = key_indices
+    else:
+        order = [0] * n
+        for j, new_pos in enumerate(key_indices):
+            order[new_pos] = j
+    chunk_size = max(n, chunk_size // n * n)
+
+    # Буферы создаются один раз; запас в n байтов - под дополнение последнего блока
+    source = bytearray(chunk_size + n)
+    target = bytearray(chunk_size + n)
+    source_view = memoryview(source)
+    target_view = memoryview(target)
+
+    bytes_read = 0
+    # При дешифровании последний блок придерживается до конца файла: из него снимается дополнение
+    pending = b""
+    with open(input_path, "rb") as in_file, open(output_path, "wb") as out_file:
+        while True:
+            filled = read_into_buffer(in_file, source_view[:chunk_size])
+            bytes_read += filled
+            if decrypt:
+                if filled % n != 0:
+                    raise ValueError("Длина зашифрованного файла не кратна размеру блока.")
+                if filled:
+                    permute_block_columns(source, target, filled, order)
+                    out_file.write(pending)
+                    out_file.write(target_view[:filled - n])
+                    pending = bytes(target_view[filled - n:filled])
+                if filled < chunk_size:
+                    break
+            elif filled < chunk_size:
+                # Конец файла: дополняем последний (возможно, пустой) блок
+                padding = n - filled % n
+                source[filled:filled + padding] = bytes([padding]) * padding
+                permute_block_columns(source, target, filled + padding, order)
+                out_file.write(target_view[:filled + padding])
+                break
+            else:
+                permute_block_columns(source, target, filled, order)
+                out_file.write(target_view[:filled])
+
+        if decrypt:
+            padding = pending[-1] if pending else 0
+            if not 1 <= padding <= n or pending[-padding:] != bytes([padding]) * padding:
+                raise ValueError("Некорректное дополнение последнего блока.")
+            out_file.write(pending[:-padding])
+    return bytes_read
+
+def block_permutation_encrypt_file(input_path, output_path, key, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Шифрует файл блочной перестановкой байтов (потоково, частями).
+
+    :return: Количество обработанных байтов (целое число).
+    """
+    return block_permutation_transform_file(input_path, output_path, key, False, chunk_size)
+
+def block_permutation_decrypt_file(input_path, output_path, key, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Дешифрует файл, зашифрованный блочной перестановкой байтов (потоково, частями).
+
+    :return: Количество обработанных байтов (целое число).
+    """
+    return block_permutation_transform_file(input_path, output_path, key, True, chunk_size)
+
 
 def encrypt_action():
     """
@@ -256,6 +359,46 @@ def decrypt_action():
         output_text.delete(1.0, tk.END)
         output_text.insert(tk.END, f"Ошибка: {e}\n")
 
+def process_file_action(decrypt):
+    """Общая часть обработчиков кнопок 'Зашифровать файл...' и 'Дешифровать файл...'."""
+    key = key_entry.get()
+    if not key:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, "Ошибка: Введите ключ перестановки.\n")
+        return
+
+    input_path = filedialog.askopenfilename(title="Выберите исходный файл")
+    if not input_path:
+        return
+    output_path = filedialog.asksaveasfilename(title="Сохранить результат как")
+    if not output_path:
+        return
+
+    try:
+        if decrypt:
+            processed = block_permutation_decrypt_file(input_path, output_path, key)
+        else:
+            processed = block_permutation_encrypt_file(input_path, output_path, key)
+    except (OSError, ValueError) as e:
+        output_text.delete(1.0, tk.END)
+        output_text.insert(tk.END, f"Ошибка при обработке файла: {e}\n")
+        return
+
+    output_text.delete(1.0, tk.END)
+    output_text.insert(tk.END, f"Исходный файл: {input_path}\n")
+    output_text.insert(tk.END, f"Файл результата: {output_path}\n")
+    output_text.insert(tk.END, f"Ключ перестановки: {key}\n")
+    output_text.insert(tk.END, f"Режим: {'дешифрование' if decrypt else 'шифрование'} (двоичный, по блокам)\n")
+    output_text.insert(tk.END, f"Обработано байтов: {processed}\n")
+
+def encrypt_file_action():
+    """Обработчик кнопки 'Зашифровать файл...'."""
+    process_file_action(decrypt=False)
+
+def decrypt_file_action():
+    """Обработчик кнопки 'Дешифровать файл...'."""
+    process_file_action(decrypt=True)
+
 
 # --- Создание графического интерфейса ---
 # Создаем главное окно приложения
@@ -300,6 +443,17 @@ decrypt_button = ttk.Button(root, text="Дешифровать", command=decrypt
 # Размещаем кнопку (строка 4, столбец 1), прижимаем к востоку
 decrypt_button.grid(row=4, column=1, padx=5, pady=5, sticky="e")
 
+# Кнопки для потоковой обработки файлов (байты файла переставляются по блокам)
+file_buttons_frame = ttk.Frame(root)
+# Размещаем рамку (строка 4, столбец 0)
+file_buttons_frame.grid(row=4, column=0, padx=10, pady=5, sticky="w")
+
+encrypt_file_button = ttk.Button(file_buttons_frame, text="Зашифровать файл...", command=encrypt_file_action)
+encrypt_file_button.pack(side=tk.LEFT, padx=(0, 5))
+
+decrypt_file_button = ttk.Button(file_buttons_frame, text="Дешифровать файл...", command=decrypt_file_action)
+decrypt_file_button.pack(side=tk.LEFT)
+
 # Метка для поля вывода результата
 output_label = ttk.Label(root, text="Результат:")
 # Размещаем метку (строка 5, столбец 0)
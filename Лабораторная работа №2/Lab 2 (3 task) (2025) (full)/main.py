@@ -1,5 +1,88 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+import os
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from permutation_engine import apply_permutation, compile_permutation, inverse_permutation
+
+def route_write_cells(rows, cols, write_route):
+    """
+    Возвращает последовательность ячеек таблицы для маршрута вписывания.
+    Ячейка (r, c) задаётся плоским номером r * cols + c.
+
+    :param rows: Количество строк таблицы (int).
+    :param cols: Количество столбцов таблицы (int).
+    :param write_route: Маршрут вписывания (str). Неизвестный маршрут считается "по_строкам".
+    :return: Список номеров ячеек в порядке вписывания.
+    """
+    if write_route == "змейка_сверху":
+        # Строки поочередно: четные слева направо, нечетные справа налево
+        cells = []
+        for r in range(rows):
+            row = range(r * cols, (r + 1) * cols)
+            cells.extend(row if r % 2 == 0 else reversed(row))
+        return cells
+    # "по_строкам" (и стандартный маршрут): строка за строкой сверху вниз
+    return list(range(rows * cols))
+
+def route_read_cells(rows, cols, read_route):
+    """
+    Возвращает последовательность ячеек таблицы для маршрута выписывания.
+    Ячейка (r, c) задаётся плоским номером r * cols + c.
+
+    :param rows: Количество строк таблицы (int).
+    :param cols: Количество столбцов таблицы (int).
+    :param read_route: Маршрут выписывания (str). Неизвестный маршрут считается "по_столбцам".
+    :return: Список номеров ячеек в порядке выписывания.
+    """
+    if read_route == "снизу_по_столбцам":
+        # По столбцам, внутри столбца - снизу вверх
+        return [r * cols + c for c in range(cols) for r in range(rows - 1, -1, -1)]
+    if read_route == "по_диагонали":
+        # Сначала диагонали, начинающиеся в верхней строке, затем - в левом столбце
+        cells = []
+        for start_col in range(cols):
+            cells.extend(r * cols + start_col + r for r in range(min(rows, cols - start_col)))
+        for start_row in range(1, rows):
+            cells.extend((start_row + c) * cols + c for c in range(min(rows - start_row, cols)))
+        return cells
+    # "по_столбцам" (и стандартный маршрут): по столбцам, внутри столбца - сверху вниз
+    return [r * cols + c for c in range(cols) for r in range(rows)]
+
+def compile_route_write(rows, cols, write_route):
+    """
+    Компилирует маршрут вписывания: i-я ячейка таблицы (в порядке по строкам) получает
+    символ текста с номером, под которым эта ячейка стоит в маршруте вписывания.
+    Строки таблицы после вписывания - срезы результата выборки длины cols.
+
+    :return: Скомпилированная перестановка (см. compile_permutation).
+    """
+    def build_gather():
+        write_cells = route_write_cells(rows, cols, write_route)
+        write_order = [0] * (rows * cols)
+        for i, cell in enumerate(write_cells):
+            write_order[cell] = i
+        return write_order
+
+    return compile_permutation(('route_write', write_route, rows, cols), build_gather)
+
+def compile_route_permutation(rows, cols, write_route, read_route):
+    """
+    Компилирует ключ табличной маршрутной перестановки (размеры таблицы и два маршрута).
+
+    k-й символ шифротекста выписывается из ячейки read_cells[k], а в эту ячейку вписан
+    символ текста с номером write_order[read_cells[k]], поэтому
+    gather[k] = write_order[read_cells[k]].
+
+    :return: Скомпилированная перестановка (см. compile_permutation).
+    """
+    def build_gather():
+        write_order = compile_route_write(rows, cols, write_route)['gather']
+        return [write_order[cell] for cell in route_read_cells(rows, cols, read_route)]
+
+    return compile_permutation(('route', write_route, read_route, rows, cols), build_gather)
 
 def route_table_permutation_encrypt(text, rows, cols, write_route, read_route):
     """
@@ -35,88 +118,21 @@ def route_table_permutation_encrypt(text, rows, cols, write_route, read_route):
     total_cells = rows * cols
 
     # Дополняем текст пробелами до размера таблицы (total_cells).
-    # Это гарантирует, что текст можно будет полностью разместить в таблице.
-    padded_text = text.ljust(total_cells)
+    # Это гарантирует, что текст можно будет полностью разместить в таблице;
+    # символы сверх размера таблицы в неё не попадают.
+    padded_text = text.ljust(total_cells)[:total_cells]
 
-    # Создаем пустую виртуальную таблицу (список списков), заполненную пустыми строками
-    table = [['' for _ in range(cols)] for _ in range(rows)]
+    # Вписывание и выписывание по маршрутам - одна выборка по скомпилированной
+    # перестановке позиций (см. compile_route_permutation)
+    compiled = compile_route_permutation(rows, cols, write_route, read_route)
+    encrypted_text = apply_permutation(padded_text, compiled['encrypt'])
 
-    # --- Определяем последовательность координат (r, c) для вписывания ---
-    # Эта последовательность зависит от выбранного маршрута вписывания.
-    write_coords = []
-    if write_route == "змейка_сверху":
-        # Пример маршрута: строки поочередно, направление чередуется
-        # r=0: c=0->cols-1 (слева направо)
-        # r=1: c=cols-1->0 (справа налево)
-        # r=2: c=0->cols-1 (слева направо) и т.д.
-        for r in range(rows):
-            if r % 2 == 0:  # Четная строка - слева направо
-                for c in range(cols):
-                    write_coords.append((r, c))
-            else:  # Нечетная строка - справа налево
-                for c in range(cols - 1, -1, -1):
-                    write_coords.append((r, c))
-    elif write_route == "по_строкам":
-        # Простой маршрут: заполняем строку за строкой сверху вниз
-        for r in range(rows):
-            for c in range(cols):
-                write_coords.append((r, c))
-    # Можно добавить другие маршруты вписывания по аналогии
-    else:
-        # Если маршрут неизвестен, используем "по_строкам" как стандартный
-        for r in range(rows):
-            for c in range(cols):
-                write_coords.append((r, c))
-
-    # Заполняем таблицу по рассчитанному маршруту вписывания
-    # Проходим по индексам символов в дополненном тексте и координатам в таблице
-    for i, (r, c) in enumerate(write_coords):
-        if i < len(padded_text):
-            table[r][c] = padded_text[i]
-
-    # --- Определяем последовательность координат (r, c) для выписывания ---
-    # Эта последовательность зависит от выбранного маршрута выписывания.
-    read_coords = []
-    if read_route == "снизу_по_столбцам":
-        # Пример маршрута: проходим по столбцам, но внутри столбца - снизу вверх
-        for c in range(cols): # Проходим по всем столбцам (от 0 до cols-1)
-            for r in range(rows - 1, -1, -1): # Проходим по строкам столбца (от rows-1 до 0)
-                read_coords.append((r, c))
-    elif read_route == "по_столбцам":
-        # Простой маршрут: проходим по столбцам, внутри столбца - сверху вниз
-        for c in range(cols): # Проходим по всем столбцам
-            for r in range(rows): # Проходим по строкам столбца (от 0 до rows-1)
-                read_coords.append((r, c))
-    elif read_route == "по_диагонали":
-        # Пример сложного маршрута: диагонали слева-сверх вниз-вправо
-        # Сначала диагонали, начинающиеся в верхней строке (c=0, c=1, ...)
-        for start_col in range(cols):
-            r, c = 0, start_col # Начинаем с верхней строки, текущего столбца
-            while r < rows and c < cols: # Пока не вышли за границы таблицы
-                read_coords.append((r, c))
-                r += 1 # Переходим на следующую строку
-                c += 1 # Переходим на следующий столбец
-        # Потом диагонали, начинающиеся в левом столбце (r=1, r=2, ...), кроме первой (уже прошли)
-        for start_row in range(1, rows):
-            r, c = start_row, 0 # Начинаем с текущей строки, левого столбца
-            while r < rows and c < cols: # Пока не вышли за границы таблицы
-                read_coords.append((r, c))
-                r += 1 # Переходим на следующую строку
-                c += 1 # Переходим на следующий столбец
-    # Можно добавить другие маршруты выписывания по аналогии
-    else:
-        # Если маршрут неизвестен, используем "по_столбцам" как стандартный
-        for c in range(cols):
-            for r in range(rows):
-                read_coords.append((r, c))
-
-    # Формируем зашифрованный текст, считывая символы из таблицы по маршруту выписывания
-    encrypted_chars = []
-    for r, c in read_coords:
-        encrypted_chars.append(table[r][c]) # Добавляем символ из текущей ячейки
+    # Таблица после вписывания: текст, переставленный по маршруту вписывания, по строкам
+    written_text = apply_permutation(padded_text, compile_route_write(rows, cols, write_route)['encrypt'])
+    table = [list(written_text[r * cols:(r + 1) * cols]) for r in range(rows)]
 
     # Возвращаем зашифрованный текст в виде строки и таблицу после вписывания
-    return ''.join(encrypted_chars), table
+    return encrypted_text, table
 
 def route_table_permutation_decrypt(ciphertext, rows, cols, write_route, read_route):
     """
@@ -143,71 +159,10 @@ def route_table_permutation_decrypt(ciphertext, rows, cols, write_route, read_ro
         # Если не совпадает, это ошибка или некорректный ввод
         raise ValueError("Длина зашифрованного текста не соответствует размеру таблицы.")
 
-    # Создаем пустую виртуальную таблицу (список списков), заполненную пустыми строками
-    table = [['' for _ in range(cols)] for _ in range(rows)]
-
-    # --- Определяем последовательность координат (r, c) для выписывания (как при шифровании) ---
-    # Это маршрут, по которому мы будем *заполнять* таблицу из зашифрованного текста.
-    read_coords = []
-    if read_route == "снизу_по_столбцам":
-        for c in range(cols):
-            for r in range(rows - 1, -1, -1):
-                read_coords.append((r, c))
-    elif read_route == "по_столбцам":
-        for c in range(cols):
-            for r in range(rows):
-                read_coords.append((r, c))
-    elif read_route == "по_диагонали":
-        for start_col in range(cols):
-            r, c = 0, start_col
-            while r < rows and c < cols:
-                read_coords.append((r, c))
-                r += 1
-                c += 1
-        for start_row in range(1, rows):
-            r, c = start_row, 0
-            while r < rows and c < cols:
-                read_coords.append((r, c))
-                r += 1
-                c += 1
-    else:
-        for c in range(cols):
-            for r in range(rows):
-                read_coords.append((r, c))
-
-    # Заполняем таблицу по маршруту выписывания из зашифрованного текста
-    for i, (r, c) in enumerate(read_coords):
-        if i < len(ciphertext):
-            table[r][c] = ciphertext[i]
-
-    # --- Определяем последовательность координат (r, c) для вписывания (как при шифровании) ---
-    # Это маршрут, по которому мы будем *считывать* символы из таблицы,
-    # чтобы восстановить исходный текст.
-    write_coords = []
-    if write_route == "змейка_сверху":
-        for r in range(rows):
-            if r % 2 == 0:
-                for c in range(cols):
-                    write_coords.append((r, c))
-            else:
-                for c in range(cols - 1, -1, -1):
-                    write_coords.append((r, c))
-    elif write_route == "по_строкам":
-        for r in range(rows):
-            for c in range(cols):
-                write_coords.append((r, c))
-    else:
-        for r in range(rows):
-            for c in range(cols):
-                write_coords.append((r, c))
-
-    # Считываем символы из таблицы по маршруту вписывания
-    decrypted_chars = []
-    for r, c in write_coords:
-        decrypted_chars.append(table[r][c])
-
-    # Восстановленный текст (включая добавленные пробелы)
-    decrypted_text_with_padding = ''.join(decrypted_chars)
+    # Запись шифротекста в таблицу по маршруту выписывания и считывание по маршруту
+    # вписывания - одна выборка по обратной скомпилированной перестановке
+    compiled = compile_route_permutation(rows, cols, write_route, read_route)
+    decrypted_text_with_padding = apply_permutation(ciphertext, inverse_permutation(compiled))
     # Удаляем пробелы в конце, которые были добавлены при шифровании
     return decrypted_text_with_padding.rstrip(' ')
 
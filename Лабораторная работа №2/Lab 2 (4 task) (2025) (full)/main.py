@@ -1,5 +1,31 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+import os
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from permutation_engine import apply_permutation, compile_permutation, inverse_permutation
+
+def compile_vertical_permutation(key_word, length):
+    """
+    Компилирует ключ вертикальной перестановки для дополненного текста длины length.
+
+    Столбцы считываются в порядке sorted_indices, поэтому позиция k * num_rows + r
+    шифротекста берётся из позиции r * n + sorted_indices[k] дополненного текста.
+
+    :param key_word: Ключевое слово (str).
+    :param length: Длина дополненного текста (кратна длине ключа).
+    :return: Скомпилированная перестановка (см. compile_permutation).
+    """
+    n = len(key_word)
+    num_rows = length // n
+
+    def build_gather():
+        sorted_indices = sorted(range(n), key=lambda k: key_word[k])
+        return [r * n + col_idx for col_idx in sorted_indices for r in range(num_rows)]
+
+    return compile_permutation(('vertical', key_word, length), build_gather)
 
 def vertical_permutation_encrypt(text, key_word):
     """
@@ -39,38 +65,21 @@ def vertical_permutation_encrypt(text, key_word):
     n = len(key_word) # n - количество столбцов в виртуальной таблице
     original_length = len(text)
 
-    # Создаем виртуальную таблицу, заполняя её по строкам
-    # Количество строк зависит от длины текста и количества столбцов.
-    table = []
-    current_index = 0
-    while current_index < original_length:
-        row = []
-        for j in range(n): # Проходим по количеству столбцов
-            if current_index < original_length:
-                # Если в тексте ещё есть символы, добавляем их в строку
-                row.append(text[current_index])
-                current_index += 1
-            else:
-                # Если текст закончился, заполняем пробелами
-                row.append(' ')
-        table.append(row)
-
-    # Определяем порядок столбцов для считывания на основе ключевого слова.
-    # Сортируем индексы по алфавиту символов ключевого слова.
-    # sorted(range(n), key=lambda k: key_word[k]) возвращает список индексов
-    # столбцов в порядке, в котором они должны быть считаны.
-    # Например, для "ДЯДИНА" -> [5, 0, 2, 3, 4, 1]
-    sorted_indices = sorted(range(n), key=lambda k: key_word[k])
-
-    # Формируем зашифрованный текст, считывая символы из таблицы по столбцам
-    # в порядке, определенном отсортированными индексами.
-    encrypted_chars = []
-    for col_idx in sorted_indices: # Проходим по индексам столбцов в нужном порядке
-        for row in table: # Проходим по всем строкам таблицы
-            encrypted_chars.append(row[col_idx]) # Добавляем символ из текущего столбца
+    # Дополняем текст пробелами до целого числа строк таблицы
+    num_rows = -(-original_length // n)
+    padded_text = text.ljust(num_rows * n)
+
+    # Виртуальная таблица, заполненная по строкам
+    table = [list(padded_text[r * n:(r + 1) * n]) for r in range(num_rows)]
+
+    # Считывание столбцов в порядке, определенном алфавитным порядком символов ключа
+    # (например, для "ДЯДИНА" -> [5, 0, 2, 3, 4, 1]), - одна выборка по скомпилированной
+    # перестановке позиций (см. compile_vertical_permutation)
+    compiled = compile_vertical_permutation(key_word, len(padded_text))
+    encrypted_text = apply_permutation(padded_text, compiled['encrypt'])
 
     # Возвращаем зашифрованный текст в виде строки и таблицу после вписывания
-    return ''.join(encrypted_chars), table
+    return encrypted_text, table
 
 def vertical_permutation_decrypt(ciphertext, key_word):
     """
@@ -106,39 +115,11 @@ def vertical_permutation_decrypt(ciphertext, key_word):
     # Проверяем, делится ли длина шифротекста на количество столбцов
     if len(ciphertext) % n != 0:
         raise ValueError("Длина зашифрованного текста не кратна длине ключа.")
-    num_rows = len(ciphertext) // n
-
-    # Создаем пустую виртуальную таблицу
-    table = [['' for _ in range(n)] for _ in range(num_rows)]
-
-    # Определяем порядок столбцов, в котором они были *считаны* при шифровании
-    sorted_indices = sorted(range(n), key=lambda k: key_word[k])
-
-    # Создаем обратный порядок: индекс в отсортированном списке -> индекс столбца в таблице
-    # inverse_order[i] = j означает, что i-й столбец в порядке чтения (sorted_indices[i])
-    # соответствует j-му столбцу в таблице (с индексом j).
-    inverse_order = [0] * n
-    for i, col_idx in enumerate(sorted_indices):
-        inverse_order[i] = col_idx
-
-    # Разбиваем шифротекст на столбцы
-    # Длина каждого столбца равна num_rows
-    for i in range(n): # i - индекс столбца в порядке чтения (от 0 до n-1)
-        start_idx = i * num_rows
-        end_idx = start_idx + num_rows
-        col_data = ciphertext[start_idx:end_idx]
-        # Записываем данные в столбец с индексом inverse_order[i] в таблице
-        table_col_idx = inverse_order[i]
-        for row_idx, char in enumerate(col_data):
-            table[row_idx][table_col_idx] = char
-
-    # Формируем дешифрованный текст, считывая таблицу по строкам
-    decrypted_chars = []
-    for row in table:
-        decrypted_chars.extend(row)
-
-    # Восстановленный текст (включая добавленные пробелы)
-    decrypted_text_with_padding = ''.join(decrypted_chars)
+
+    # Запись столбцов в таблицу в порядке чтения и считывание по строкам -
+    # одна выборка по обратной скомпилированной перестановке
+    compiled = compile_vertical_permutation(key_word, len(ciphertext))
+    decrypted_text_with_padding = apply_permutation(ciphertext, inverse_permutation(compiled))
     # Удаляем пробелы в конце, которые были добавлены при шифровании
     return decrypted_text_with_padding.rstrip(' ')
 
@@ -1,5 +1,53 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+import os
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from permutation_engine import apply_permutation, compile_permutation, inverse_permutation
+
+def grille_hole_cells(initial_holes, size):
+    """
+    Возвращает ячейки таблицы под вырезами решетки во всех 4 позициях (0°, 90°, 180°, 270°)
+    в порядке вписывания. Ячейка (r, c) задаётся плоским номером r * size + c.
+    Поворот на 90 градусов по часовой стрелке: (r, c) -> (c, size-1-r).
+
+    :param initial_holes: Позиции вырезов в исходной ориентации (список пар (r, c)).
+    :param size: Размер решетки (int).
+    :return: Список номеров ячеек длины 4 * len(initial_holes).
+    """
+    cells = []
+    holes = initial_holes
+    for rotation in range(4): # 4 позиции решетки
+        cells.extend(r_h * size + c_h for r_h, c_h in holes)
+        holes = [(c_h, size - 1 - r_h) for r_h, c_h in holes]
+    return cells
+
+def compile_grille_permutation(initial_holes, size):
+    """
+    Компилирует ключ поворотной решетки (набор вырезов).
+
+    i-й символ текста вписывается в ячейку hole_cells[i], а шифротекст считывается
+    из таблицы по строкам, поэтому gather - обратная к hole_cells перестановка.
+    Дешифрование - выборка по самой hole_cells (обратная к gather перестановка).
+
+    :param initial_holes: Позиции вырезов в исходной ориентации (список пар (r, c)).
+    :param size: Размер решетки (int).
+    :return: Скомпилированная перестановка (см. compile_permutation).
+    :raises ValueError: Если решетка не покрывает все ячейки при 4 поворотах.
+    """
+    def build_gather():
+        hole_cells = grille_hole_cells(initial_holes, size)
+        # Если общее количество уникальных позиций не равно размеру таблицы, решетка некорректна
+        if len(hole_cells) != size * size or len(set(hole_cells)) != size * size:
+            raise ValueError("Выбранная решетка не покрывает все ячейки при 4 поворотах.")
+        gather = [0] * (size * size)
+        for i, cell in enumerate(hole_cells):
+            gather[cell] = i
+        return gather
+
+    return compile_permutation(('grille', tuple(initial_holes), size), build_gather)
 
 def grille_cipher_encrypt(text, size=4):
     """
@@ -32,8 +80,9 @@ def grille_cipher_encrypt(text, size=4):
     if size != 4:
         raise ValueError("Для данной реализации размер решетки фиксирован на 4x4.")
 
-    # Дополняем текст пробелами до длины 16 (размер таблицы 4x4)
-    padded_text = text.ljust(size * size)
+    # Дополняем текст пробелами до длины 16 (размер таблицы 4x4);
+    # символы сверх размера таблицы в неё не попадают
+    padded_text = text.ljust(size * size)[:size * size]
 
     # --- Определяем позиции вырезов в начальной ориентации решетки ---
     # Ключом является сама решетка, т.е. набор позиций вырезов.
@@ -41,62 +90,20 @@ def grille_cipher_encrypt(text, size=4):
     # Позиции вырезов в исходной ориентации (индексы строк и столбцов от 0 до 3)
     # Например, [(0, 0), (0, 2), (1, 1), (2, 0)] - это просто пример.
     # Для корректной решетки, при 4 поворотах на 90 градусов,
-    # все 16 ячеек (0,0) .. (3,3) должны быть покрыты ровно один раз.
-    # Проверим это вручную для выбранного примера:
-    # Поворот на 90: (r, c) -> (c, size-1-r)
-    # Поворот на 180: (r, c) -> (size-1-r, size-1-c)
-    # Поворот на 270: (r, c) -> (size-1-c, r)
+    # все 16 ячеек (0,0) .. (3,3) должны быть покрыты ровно один раз
+    # (проверяется при компиляции решетки, см. compile_grille_permutation).
     initial_holes = [(0, 0), (0, 2), (1, 1), (2, 0)] # Выбранный набор вырезов
 
-    # Проверка уникальности покрытия (вручную для 4x4)
-    all_positions_covered = set()
-    current_holes = initial_holes[:]
-    for rotation in range(4): # 4 позиции решетки (0°, 90°, 180°, 270°)
-        for r_h, c_h in current_holes:
-            all_positions_covered.add((r_h, c_h))
-        # Рассчитываем новые позиции вырезов после поворота на 90 градусов
-        new_holes = []
-        for r_h, c_h in current_holes:
-            new_r = c_h
-            new_c = size - 1 - r_h
-            new_holes.append((new_r, new_c))
-        current_holes = new_holes
-    # Если общее количество уникальных позиций не равно размеру таблицы, решетка некорректна
-    if len(all_positions_covered) != size * size:
-        raise ValueError("Выбранная решетка не покрывает все ячейки при 4 поворотах.")
-
-    # Создаем пустую виртуальную таблицу (список списков), заполненную пустыми строками
-    table = [['' for _ in range(size)] for _ in range(size)]
-
-    # --- Заполняем таблицу через решетку ---
-    # Проходим 4 раза, соответствующие 4 позициям решетки
-    text_index = 0 # Индекс текущего символа в дополненном тексте
-    holes = initial_holes[:] # Начинаем с исходного набора вырезов
-    for rotation in range(4): # 4 позиции решетки
-        # Проходим по текущим позициям вырезов и заполняем таблицу
-        for r_h, c_h in holes:
-            # Проверяем, не закончился ли текст (хотя он должен быть дополнен)
-            if text_index < len(padded_text):
-                table[r_h][c_h] = padded_text[text_index]
-                text_index += 1
-        # Рассчитываем новые позиции вырезов после поворота на 90 градусов
-        # для следующей итерации цикла
-        new_holes = []
-        for r_h, c_h in holes:
-            new_r = c_h
-            new_c = size - 1 - r_h
-            new_holes.append((new_r, new_c))
-        holes = new_holes # Обновляем список вырезов для следующего "наложения" решетки
-
-    # --- Считываем зашифрованный текст из заполненной таблицы ---
-    # Обычно считывается по строкам, но может быть и по столбцам.
-    encrypted_chars = []
-    for r in range(size): # Проходим по строкам
-        for c in range(size): # Проходим по столбцам в строке
-            encrypted_chars.append(table[r][c]) # Добавляем символ
+    # Заполнение таблицы через решетку и считывание по строкам - одна выборка
+    # по скомпилированной перестановке позиций
+    compiled = compile_grille_permutation(initial_holes, size)
+    encrypted_text = apply_permutation(padded_text, compiled['encrypt'])
+
+    # Таблица после заполнения - строки зашифрованного текста
+    table = [list(encrypted_text[r * size:(r + 1) * size]) for r in range(size)]
 
     # Возвращаем зашифрованный текст в виде строки и таблицу после заполнения
-    return ''.join(encrypted_chars), table
+    return encrypted_text, table
 
 def grille_cipher_decrypt(ciphertext, size=4):
     """
@@ -127,31 +134,10 @@ def grille_cipher_decrypt(ciphertext, size=4):
     # --- Используем ту же решетку, что и при шифровании ---
     initial_holes = [(0, 0), (0, 2), (1, 1), (2, 0)]
 
-    # Заполняем таблицу из зашифрованного текста (по строкам)
-    table = [['' for _ in range(size)] for _ in range(size)]
-    text_index = 0
-    for r in range(size):
-        for c in range(size):
-            table[r][c] = ciphertext[text_index]
-            text_index += 1
-
-    # --- Извлекаем символы из таблицы по порядку, определяемому решеткой и поворотами ---
-    decrypted_chars = []
-    holes = initial_holes[:]
-    for rotation in range(4): # 4 позиции решетки
-        # Проходим по текущим позициям вырезов и извлекаем символы из таблицы
-        for r_h, c_h in holes:
-            decrypted_chars.append(table[r_h][c_h])
-        # Рассчитываем новые позиции вырезов после поворота на 90 градусов
-        new_holes = []
-        for r_h, c_h in holes:
-            new_r = c_h
-            new_c = size - 1 - r_h
-            new_holes.append((new_r, new_c))
-        holes = new_holes
-
-    # Восстановленный текст (включая добавленные пробелы)
-    decrypted_text_with_padding = ''.join(decrypted_chars)
+    # Запись шифротекста в таблицу по строкам и извлечение символов по вырезам решетки
+    # во всех поворотах - одна выборка по обратной скомпилированной перестановке
+    compiled = compile_grille_permutation(initial_holes, size)
+    decrypted_text_with_padding = apply_permutation(ciphertext, inverse_permutation(compiled))
     # Удаляем пробелы в конце, которые были добавлены при шифровании
     return decrypted_text_with_padding.rstrip(' ')
 
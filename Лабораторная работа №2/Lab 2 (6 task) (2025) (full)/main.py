@@ -1,5 +1,32 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+import os
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from permutation_engine import apply_permutation, compile_permutation, inverse_permutation
+
+def compile_magic_square_permutation(magic_square_indices, size):
+    """
+    Компилирует порядок заполнения таблицы по магическому квадрату.
+
+    i-й символ текста записывается в ячейку magic_square_indices[i], а шифротекст
+    считывается из таблицы по строкам, поэтому позиция r * size + c шифротекста
+    берётся из позиции i дополненного текста, где magic_square_indices[i] = (r, c).
+    Дешифрование - выборка по самим ячейкам magic_square_indices (обратная перестановка).
+
+    :param magic_square_indices: Ячейки таблицы в порядке заполнения (список пар (r, c)).
+    :param size: Размер квадрата (int).
+    :return: Скомпилированная перестановка (см. compile_permutation).
+    """
+    def build_gather():
+        gather = [0] * (size * size)
+        for i, (r, c) in enumerate(magic_square_indices):
+            gather[r * size + c] = i
+        return gather
+
+    return compile_permutation(('magic_square', tuple(magic_square_indices), size), build_gather)
 
 def magic_square_encrypt(text, size=4):
     """
@@ -76,27 +103,20 @@ def magic_square_encrypt(text, size=4):
         (3, 3)  # 1
     ]
 
-    # Дополняем текст пробелами до длины 16 (размер таблицы 4x4)
-    padded_text = text.ljust(size * size)
-
-    # Создаем пустую виртуальную таблицу (список списков), заполненную пустыми строками
-    table = [['' for _ in range(size)] for _ in range(size)]
+    # Дополняем текст пробелами до длины 16 (размер таблицы 4x4);
+    # символы сверх размера таблицы в неё не попадают
+    padded_text = text.ljust(size * size)[:size * size]
 
-    # Заполняем таблицу по индексам, соответствующим убывающим значениям магического квадрата.
-    # Проходим по индексам из списка и индексам символов в дополненном тексте.
-    for i, (r, c) in enumerate(magic_square_indices):
-        # Проверяем, не закончился ли текст (хотя он должен быть дополнен)
-        if i < len(padded_text):
-            table[r][c] = padded_text[i]
+    # Заполнение таблицы по убывающим значениям магического квадрата и считывание
+    # по строкам - одна выборка по скомпилированной перестановке позиций
+    compiled = compile_magic_square_permutation(magic_square_indices, size)
+    encrypted_text = apply_permutation(padded_text, compiled['encrypt'])
 
-    # Формируем зашифрованный текст, считывая заполненную таблицу по строкам.
-    encrypted_chars = []
-    for r in range(size): # Проходим по строкам
-        for c in range(size): # Проходим по столбцам в строке
-            encrypted_chars.append(table[r][c]) # Добавляем символ
+    # Таблица после заполнения - строки зашифрованного текста
+    table = [list(encrypted_text[r * size:(r + 1) * size]) for r in range(size)]
 
     # Возвращаем зашифрованный текст в виде строки и таблицу после заполнения
-    return ''.join(encrypted_chars), table
+    return encrypted_text, table
 
 def magic_square_decrypt(ciphertext, size=4):
     """
@@ -143,23 +163,10 @@ def magic_square_decrypt(ciphertext, size=4):
         (3, 3)  # 1
     ]
 
-    # Заполняем таблицу из зашифрованного текста (по строкам)
-    table = [['' for _ in range(size)] for _ in range(size)]
-    text_index = 0
-    for r in range(size):
-        for c in range(size):
-            table[r][c] = ciphertext[text_index]
-            text_index += 1
-
-    # --- Извлекаем символы из таблицы в порядке, определяемом магическим квадратом ---
-    # Проходим по индексам в том же порядке, что и при шифровании
-    # и собираем символы из таблицы в том порядке, в котором они были туда помещены.
-    decrypted_chars = []
-    for r, c in magic_square_indices:
-        decrypted_chars.append(table[r][c])
-
-    # Восстановленный текст (включая добавленные пробелы)
-    decrypted_text_with_padding = ''.join(decrypted_chars)
+    # Запись шифротекста в таблицу по строкам и извлечение символов в порядке,
+    # определяемом магическим квадратом, - одна выборка по обратной скомпилированной перестановке
+    compiled = compile_magic_square_permutation(magic_square_indices, size)
+    decrypted_text_with_padding = apply_permutation(ciphertext, inverse_permutation(compiled))
     # Удаляем пробелы в конце, которые были добавлены при шифровании
     return decrypted_text_with_padding.rstrip(' ')
 
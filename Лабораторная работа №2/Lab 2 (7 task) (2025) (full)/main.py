@@ -1,5 +1,37 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+import os
+import sys
+
+# Общие модули лабораторной работы лежат в её папке, на уровень выше папки задания
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from permutation_engine import apply_permutation, compile_permutation, inverse_permutation
+
+def compile_double_permutation(col_key_word, row_key_word):
+    """
+    Компилирует пару ключей двойной перестановки в одну перестановку позиций таблицы
+    n_rows x n_cols.
+
+    Ячейка (new_r, new_c) финальной таблицы берётся из ячейки
+    (sorted_row_indices[new_r], sorted_col_indices[new_c]) исходной, поэтому
+    gather[new_r * n_cols + new_c] = sorted_row_indices[new_r] * n_cols + sorted_col_indices[new_c].
+    Обе перестановки (столбцов и строк) сливаются в одну выборку.
+
+    :param col_key_word: Ключевое слово для перестановки столбцов (str).
+    :param row_key_word: Ключевое слово для перестановки строк (str).
+    :return: Скомпилированная перестановка (см. compile_permutation).
+    """
+    n_cols = len(col_key_word)
+    n_rows = len(row_key_word)
+
+    def build_gather():
+        sorted_col_indices = sorted(range(n_cols), key=lambda k: col_key_word[k])
+        sorted_row_indices = sorted(range(n_rows), key=lambda k: row_key_word[k])
+        return [old_row_idx * n_cols + old_col_idx
+                for old_row_idx in sorted_row_indices
+                for old_col_idx in sorted_col_indices]
+
+    return compile_permutation(('double', col_key_word, row_key_word), build_gather)
 
 def double_permutation_encrypt(text, col_key_word, row_key_word):
     """
@@ -53,51 +85,20 @@ def double_permutation_encrypt(text, col_key_word, row_key_word):
     # Это гарантирует, что текст можно будет полностью разместить в таблице размером n_rows x n_cols.
     original_length = len(text)
     total_cells = n_rows * n_cols
-    padded_text = text.ljust(total_cells)
-
-    # Создаем виртуальную таблицу, заполняя её по строкам из дополненного текста
-    table = [['' for _ in range(n_cols)] for _ in range(n_rows)]
-    index = 0
-    for r in range(n_rows):
-        for c in range(n_cols):
-            if index < len(padded_text):
-                table[r][c] = padded_text[index]
-                index += 1
-
-    # --- Первая перестановка: столбцов ---
-    # Определяем порядок столбцов для перестановки на основе col_key_word.
-    # sorted(range(n_cols), key=lambda k: col_key_word[k]) возвращает список индексов
-    # столбцов в порядке, в котором они должны быть переставлены.
-    sorted_col_indices = sorted(range(n_cols), key=lambda k: col_key_word[k])
-
-    # Создаем новую таблицу с переставленными столбцами
-    table_after_col_perm = [['' for _ in range(n_cols)] for _ in range(n_rows)]
-    for new_col_idx, old_col_idx in enumerate(sorted_col_indices):
-        # Копируем столбец old_col_idx из исходной таблицы в позицию new_col_idx новой таблицы
-        for r in range(n_rows):
-            table_after_col_perm[r][new_col_idx] = table[r][old_col_idx]
-
-    # --- Вторая перестановка: строк ---
-    # Определяем порядок строк для перестановки на основе row_key_word.
-    # sorted(range(n_rows), key=lambda k: row_key_word[k]) возвращает список индексов
-    # строк в порядке, в котором они должны быть переставлены.
-    sorted_row_indices = sorted(range(n_rows), key=lambda k: row_key_word[k])
-
-    # Создаем финальную таблицу с переставленными строками
-    final_table = [['' for _ in range(n_cols)] for _ in range(n_rows)]
-    for new_row_idx, old_row_idx in enumerate(sorted_row_indices):
-        # Копируем строку old_row_idx из таблицы после перестановки столбцов
-        # в позицию new_row_idx финальной таблицы
-        final_table[new_row_idx] = table_after_col_perm[old_row_idx][:] # [:] - копируем список
-
-    # Формируем зашифрованный текст, считывая символы из финальной таблицы по строкам
-    encrypted_chars = []
-    for r in range(n_rows): # Проходим по строкам финальной таблицы
-        for c in range(n_cols): # Проходим по столбцам строки
-            encrypted_chars.append(final_table[r][c]) # Добавляем символ
+    # Символы сверх размера таблицы в неё не попадают
+    padded_text = text.ljust(total_cells)[:total_cells]
+
+    # Перестановка столбцов по алфавиту символов col_key_word, затем строк по алфавиту
+    # символов row_key_word - одна выборка по скомпилированной перестановке позиций
+    # (см. compile_double_permutation)
+    compiled = compile_double_permutation(col_key_word, row_key_word)
+    encrypted_text = apply_permutation(padded_text, compiled['encrypt'])
+
+    # Финальная таблица после обеих перестановок - строки зашифрованного текста
+    final_table = [list(encrypted_text[r * n_cols:(r + 1) * n_cols]) for r in range(n_rows)]
 
     # Возвращаем зашифрованный текст в виде строки и финальную таблицу после обеих перестановок
-    return ''.join(encrypted_chars), final_table
+    return encrypted_text, final_table
 
 def double_permutation_decrypt(ciphertext, col_key_word, row_key_word):
     """
@@ -136,49 +137,10 @@ def double_permutation_decrypt(ciphertext, col_key_word, row_key_word):
     if len(ciphertext) != n_rows * n_cols:
         raise ValueError("Длина зашифрованного текста не соответствует размеру таблицы (n_rows * n_cols).")
 
-    # --- Восстанавливаем финальную таблицу из шифротекста (по строкам) ---
-    table = [['' for _ in range(n_cols)] for _ in range(n_rows)]
-    index = 0
-    for r in range(n_rows):
-        for c in range(n_cols):
-            table[r][c] = ciphertext[index]
-            index += 1
-
-    # --- Обратная перестановка строк ---
-    # Определяем порядок, в котором строки были переставлены при шифровании
-    sorted_row_indices = sorted(range(n_rows), key=lambda k: row_key_word[k])
-    # Создаем обратный порядок: индекс в отсортированном списке -> индекс строки в таблице
-    inverse_row_order = [0] * n_rows
-    for i, original_row_idx in enumerate(sorted_row_indices):
-        inverse_row_order[original_row_idx] = i
-
-    # Создаем таблицу после обратной перестановки строк
-    table_after_row_unperm = [['' for _ in range(n_cols)] for _ in range(n_rows)]
-    for new_row_idx, old_row_idx in enumerate(inverse_row_order):
-        table_after_row_unperm[new_row_idx] = table[old_row_idx][:]
-
-    # --- Обратная перестановка столбцов ---
-    # Определяем порядок, в котором столбцы были переставлены при шифровании
-    sorted_col_indices = sorted(range(n_cols), key=lambda k: col_key_word[k])
-    # Создаем обратный порядок: индекс в отсортированном списке -> индекс столбца в таблице
-    inverse_col_order = [0] * n_cols
-    for i, original_col_idx in enumerate(sorted_col_indices):
-        inverse_col_order[original_col_idx] = i
-
-    # Создаем таблицу после обратной перестановки столбцов (исходная таблица до шифрования)
-    original_table = [['' for _ in range(n_cols)] for _ in range(n_rows)]
-    for r in range(n_rows):
-        for new_col_idx, old_col_idx in enumerate(inverse_col_order):
-            original_table[r][new_col_idx] = table_after_row_unperm[r][old_col_idx]
-
-    # --- Формируем восстановленный текст из исходной таблицы (по строкам) ---
-    decrypted_chars = []
-    for r in range(n_rows):
-        for c in range(n_cols):
-            decrypted_chars.append(original_table[r][c])
-
-    # Восстановленный текст (включая добавленные пробелы)
-    decrypted_text_with_padding = ''.join(decrypted_chars)
+    # Обратная перестановка строк, затем столбцов - одна выборка по обратной
+    # скомпилированной перестановке
+    compiled = compile_double_permutation(col_key_word, row_key_word)
+    decrypted_text_with_padding = apply_permutation(ciphertext, inverse_permutation(compiled))
     # Удаляем пробелы в конце, которые были добавлены при шифровании
     return decrypted_text_with_padding.rstrip(' ')
 
@@ -0,0 +1,92 @@
+from array import array
+from collections import OrderedDict
+from operator import itemgetter
+
+# Общий компилятор перестановок для заданий лабораторной работы №2 (задания 2-7).
+# При заданных ключе и длине текста шифр перестановки всегда переносит символы одинаково,
+# поэтому ключ компилируется в плоскую перестановку позиций gather: i-й символ результата -
+# это символ дополненного текста с номером gather[i]. Шифрование - одна выборка по gather,
+# дешифрование - выборка по обратной перестановке (argsort от gather). В файле задания
+# остаётся только функция compile_*_permutation, строящая gather по ключу своего шифра.
+
+# Однобайтовая кодировка: текст из её символов переставляется как байты
+GATHER_CODEC = "cp1251"
+
+# Максимальное число скомпилированных перестановок в кэше (вытесняются давно не использованные)
+PERMUTATION_CACHE_SIZE = 32
+
+# Кэш скомпилированных перестановок: (шифр, ключ, длина) -> перестановка
+permutations_cache = OrderedDict()
+
+def lru_get(cache, key):
+    """
+    Возвращает значение из кэша (или None) и отмечает его как недавно использованное.
+    """
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def lru_put(cache, key, value):
+    """
+    Кладёт значение в кэш, вытесняя самое давно использованное при превышении PERMUTATION_CACHE_SIZE.
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > PERMUTATION_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def make_gather(positions):
+    """
+    Строит функцию выборки символов по позициям: operator.itemgetter выбирает все позиции
+    одним вызовом. Перестановка длины меньше 2 тождественна, для неё возвращается None.
+    """
+    return itemgetter(*positions) if len(positions) > 1 else None
+
+def compile_permutation(cache_key, build_gather):
+    """
+    Возвращает скомпилированную перестановку из кэша или строит её.
+
+    :param cache_key: Ключ кэша - (шифр, ключ, длина) (кортеж).
+    :param build_gather: Функция без аргументов, возвращающая позиции gather (список целых чисел).
+    :return: Словарь с полями
+             'gather' - позиции выборки (array('I')),
+             'encrypt' - функция выборки по gather (результат make_gather),
+             'inverse' / 'decrypt' - обратная перестановка и её функция выборки
+             (строятся при первом дешифровании, см. inverse_permutation).
+    """
+    compiled = lru_get(permutations_cache, cache_key)
+    if compiled is None:
+        gather = array('I', build_gather())
+        compiled = {'gather': gather, 'encrypt': make_gather(gather), 'inverse': None, 'decrypt': None}
+        lru_put(permutations_cache, cache_key, compiled)
+    return compiled
+
+def inverse_permutation(compiled):
+    """
+    Возвращает функцию выборки обратной перестановки. Обратная перестановка - argsort
+    от gather - строится один раз и хранится вместе с прямой.
+    """
+    if compiled['inverse'] is None:
+        gather = compiled['gather']
+        compiled['inverse'] = array('I', sorted(range(len(gather)), key=gather.__getitem__))
+        compiled['decrypt'] = make_gather(compiled['inverse'])
+    return compiled['decrypt']
+
+def apply_permutation(text, gather):
+    """
+    Переставляет символы текста одной выборкой. Текст из символов GATHER_CODEC
+    переставляется как байты, любой другой - как строка.
+
+    :param text: Текст, длина которого равна длине перестановки (строка).
+    :param gather: Функция выборки (результат make_gather) или None.
+    :return: Переставленный текст (строка).
+    """
+    if gather is None:
+        return text
+    try:
+        data = text.encode(GATHER_CODEC)
+    except UnicodeEncodeError:
+        return "".join(gather(text))
+    return bytes(gather(data)).decode(GATHER_CODEC)
+
@@ -1,5 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import re
 
 # Определяем русский алфавит
 # Включает все буквы от 'А' до 'Я', включая 'Ё'
@@ -118,6 +122,173 @@ def gamma_decipher_modN(encrypted_text, gamma, alphabet):
     decrypted_text = numbers_to_text(decrypted_numbers, alphabet)
     return decrypted_text, decrypted_numbers
 
+# --- Параллельный режим гаммирования по модулю N для больших текстов ---
+
+# Однобайтовая кодировка, в которой текст передаётся через общую память, если он в ней представим
+SHARED_TEXT_CODEC = "cp1251"
+
+# Минимальная длина части текста (в символах), ради которой стоит запускать отдельный процесс
+PARALLEL_MIN_CHUNK = 4 * 1024 * 1024
+
+def split_text_chunks(length, workers, min_chunk=PARALLEL_MIN_CHUNK):
+    """
+    Делит позиции текста [0, length) на части примерно равной длины, по одной на процесс.
+
+    :param length: Длина текста (целое число).
+    :param workers: Количество процессов (целое число).
+    :param min_chunk: Минимальная длина части (целое число).
+    :return: Список пар (начало, конец).
+    """
+    count = max(1, min(workers, length // max(min_chunk, 1)))
+    bounds = [length * part // count for part in range(count + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+def encode_shared_text(text, result_chars):
+    """
+    Кодирует текст с постоянной шириной символа для передачи через общую память:
+    в SHARED_TEXT_CODEC (1 байт на символ), если в ней представимы и текст, и символы
+    результата, иначе в UTF-32 (4 байта на символ).
+
+    :return: Кортеж (данные, кодировка, байтов на символ).
+    """
+    try:
+        result_chars.encode(SHARED_TEXT_CODEC)
+        return text.encode(SHARED_TEXT_CODEC), SHARED_TEXT_CODEC, 1
+    except UnicodeEncodeError:
+        return text.encode('utf-32-le'), 'utf-32-le', 4
+
+def gamma_phase_tables(gamma, alphabet, decrypt=False):
+    """
+    Строит по одной таблице str.translate на каждый элемент гаммы:
+    буква с индексом PLi переходит в букву с индексом (PLi + KGi) mod N при шифровании
+    и (PLi - KGi) mod N при дешифровании - те же формулы (5.1) и (5.2).
+
+    :param gamma: Гамма (list of int).
+    :param alphabet: Алфавит (строка).
+    :param decrypt: Строить таблицы для дешифрования.
+    :return: Список таблиц перевода (по одной на позицию гаммы).
+    """
+    sign = -1 if decrypt else 1
+    tables_by_value = {}
+    tables = []
+    for value in gamma:
+        # Одинаковые элементы гаммы используют одну и ту же таблицу
+        if value not in tables_by_value:
+            tables_by_value[value] = {ord(char): alphabet[(index + sign * value) % len(alphabet)]
+                                      for index, char in enumerate(alphabet)}
+        tables.append(tables_by_value[value])
+    return tables
+
+def gamma_apply_phase_tables(letters, phase_tables, start_phase=0):
+    """
+    Применяет таблицы гаммы к срезам letters[position::len(gamma)] и собирает срезы обратно
+    в исходном порядке. Первой букве соответствует элемент гаммы с номером start_phase.
+
+    :param letters: Текст только из букв алфавита (строка).
+    :param phase_tables: Таблицы перевода (результат gamma_phase_tables).
+    :param start_phase: Номер элемента гаммы для первой буквы (целое число).
+    :return: Зашифрованный (дешифрованный) текст (строка).
+    """
+    period = len(phase_tables)
+    # Срезы собираются в буфер UTF-32 (по 4 байта на символ) через память с шагом period
+    buffer = bytearray(4 * len(letters))
+    code_points = memoryview(buffer).cast('I')
+    for position in range(min(period, len(letters))):
+        translated = letters[position::period].translate(phase_tables[(start_phase + position) % period])
+        code_points[position::period] = memoryview(translated.encode('utf-32-le')).cast('I')
+    return buffer.decode('utf-32-le')
+
+def gamma_letters_worker(input_name, output_name, width, start, end, codec, alphabet):
+    """
+    Первый проход параллельного режима: оставляет в части текста из общей памяти только буквы
+    алфавита (как text_to_numbers), записывает их в выходной блок с позиции начала части
+    и возвращает их количество. По этим количествам определяется номер элемента гаммы
+    для первой буквы каждой части.
+    """
+    input_memory = shared_memory.SharedMemory(name=input_name)
+    output_memory = shared_memory.SharedMemory(name=output_name)
+    try:
+        chunk = bytes(input_memory.buf[start * width:end * width]).decode(codec)
+        letters = re.sub("[^" + re.escape(alphabet) + "]+", "", chunk.upper()).encode(codec)
+        output_memory.buf[start * width:start * width + len(letters)] = letters
+        return len(letters) // width
+    finally:
+        input_memory.close()
+        output_memory.close()
+
+def gamma_transform_worker(output_name, width, start, count, phase, codec, gamma, alphabet, decrypt):
+    """
+    Второй проход параллельного режима: шифрует на месте count букв, записанных первым
+    проходом с позиции start, начиная с элемента гаммы номер phase.
+    """
+    output_memory = shared_memory.SharedMemory(name=output_name)
+    try:
+        letters = bytes(output_memory.buf[start * width:(start + count) * width]).decode(codec)
+        result = gamma_apply_phase_tables(letters, gamma_phase_tables(gamma, alphabet, decrypt), phase).encode(codec)
+        output_memory.buf[start * width:(start + count) * width] = result
+    finally:
+        output_memory.close()
+
+def gamma_transform_modN_parallel(text, gamma, alphabet, decrypt=False, workers=None, min_chunk=PARALLEL_MIN_CHUNK):
+    """
+    Гаммирование по модулю N большого текста в нескольких процессах.
+
+    Элемент гаммы зависит только от номера буквы по модулю длины гаммы, но символы
+    вне алфавита пропускаются, поэтому номер элемента гаммы для первой буквы части -
+    это количество букв во всех предыдущих частях. Текст передаётся процессам через
+    общую память (multiprocessing.shared_memory) и обрабатывается в два прохода:
+    сначала каждая часть оставляет только свои буквы и сообщает их количество,
+    затем буквы шифруются на месте с нужного элемента гаммы и склеиваются по порядку.
+    Результат совпадает с gamma_cipher_modN / gamma_decipher_modN.
+
+    :param text: Исходный текст (строка).
+    :param gamma: Гамма (list of int).
+    :param alphabet: Алфавит (строка).
+    :param decrypt: Дешифровать вместо шифрования.
+    :param workers: Количество процессов (по умолчанию - число ядер).
+    :param min_chunk: Минимальная длина части текста в символах (целое число).
+    :return: Кортеж из текста (str) и списка его чисел (list of int), как у gamma_cipher_modN.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = split_text_chunks(len(text), workers, min_chunk)
+    if len(chunks) == 1:
+        # Короткий текст не стоит запуска процессов
+        return (gamma_decipher_modN if decrypt else gamma_cipher_modN)(text, gamma, alphabet)
+
+    data, codec, width = encode_shared_text(text, alphabet)
+    input_memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    output_memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        input_memory.buf[:len(data)] = data
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Первый проход: буквы каждой части и их количество
+            futures = [executor.submit(gamma_letters_worker, input_memory.name, output_memory.name,
+                                       width, start, end, codec, alphabet) for start, end in chunks]
+            counts = [future.result() for future in futures]
+
+            # Номер элемента гаммы для первой буквы части = число букв в предыдущих частях
+            futures = []
+            letters_before = 0
+            for (start, _), count in zip(chunks, counts):
+                if count:
+                    futures.append(executor.submit(gamma_transform_worker, output_memory.name, width, start, count,
+                                                   letters_before % len(gamma), codec, gamma, alphabet, decrypt))
+                letters_before += count
+            for future in futures:
+                future.result()
+        result_text = b"".join(output_memory.buf[start * width:(start + count) * width]
+                               for (start, _), count in zip(chunks, counts)).decode(codec)
+    finally:
+        input_memory.close()
+        input_memory.unlink()
+        output_memory.close()
+        output_memory.unlink()
+
+    # Числа результата - индексы его букв в алфавите
+    indices = {char: index for index, char in enumerate(alphabet)}
+    return result_text, list(map(indices.__getitem__, result_text))
+
 def gamma_cipher_mod2(text, gamma_bits):
     """
     Шифрует текст с помощью гаммирования по модулю 2 (XOR).
@@ -435,57 +606,60 @@ def decrypt_mod2_action():
 
 
 # --- Создание графического интерфейса ---
-root = tk.Tk()
-root.title("Шифры гаммирования (Лабораторная работа 3, Задание 1)")
-root.geometry("800x600") # Устанавливаем начальный размер окна
+# Окно создаётся только при запуске файла как программы: процессы-исполнители
+# ProcessPoolExecutor импортируют этот модуль повторно и не должны открывать своё окно.
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Шифры гаммирования (Лабораторная работа 3, Задание 1)")
+    root.geometry("800x600") # Устанавливаем начальный размер окна
 
-# --- Виджеты ---
+    # --- Виджеты ---
 
-# Ввод текста (фамилии)
-input_label = ttk.Label(root, text="Введите фамилию (или биты для Mod2):")
-input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+    # Ввод текста (фамилии)
+    input_label = ttk.Label(root, text="Введите фамилию (или биты для Mod2):")
+    input_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
 
-input_text = ttk.Entry(root, width=50)
-input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    input_text = ttk.Entry(root, width=50)
+    input_text.grid(row=1, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
 
-# Ввод гаммы для Mod N
-gamma_label_modN = ttk.Label(root, text="Введите гамму (Mod N, числа через запятую):")
-gamma_label_modN.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+    # Ввод гаммы для Mod N
+    gamma_label_modN = ttk.Label(root, text="Введите гамму (Mod N, числа через запятую):")
+    gamma_label_modN.grid(row=2, column=0, padx=10, pady=5, sticky="w")
 
-gamma_entry_modN = ttk.Entry(root, width=50)
-gamma_entry_modN.grid(row=3, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    gamma_entry_modN = ttk.Entry(root, width=50)
+    gamma_entry_modN.grid(row=3, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
 
-# Ввод гаммы для Mod 2
-gamma_label_mod2 = ttk.Label(root, text="Введите гамму (Mod 2, 8-битные строки через запятую):")
-gamma_label_mod2.grid(row=4, column=0, padx=10, pady=5, sticky="w")
+    # Ввод гаммы для Mod 2
+    gamma_label_mod2 = ttk.Label(root, text="Введите гамму (Mod 2, 8-битные строки через запятую):")
+    gamma_label_mod2.grid(row=4, column=0, padx=10, pady=5, sticky="w")
 
-gamma_entry_mod2 = ttk.Entry(root, width=50)
-gamma_entry_mod2.grid(row=5, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
+    gamma_entry_mod2 = ttk.Entry(root, width=50)
+    gamma_entry_mod2.grid(row=5, column=0, padx=10, pady=5, sticky="ew", columnspan=2)
 
-# Кнопки для Mod N
-encrypt_button_modN = ttk.Button(root, text="Зашифровать (Mod N)", command=encrypt_modN_action)
-encrypt_button_modN.grid(row=6, column=0, padx=10, pady=5, sticky="ew")
+    # Кнопки для Mod N
+    encrypt_button_modN = ttk.Button(root, text="Зашифровать (Mod N)", command=encrypt_modN_action)
+    encrypt_button_modN.grid(row=6, column=0, padx=10, pady=5, sticky="ew")
 
-decrypt_button_modN = ttk.Button(root, text="Дешифровать (Mod N)", command=decrypt_modN_action)
-decrypt_button_modN.grid(row=6, column=1, padx=10, pady=5, sticky="ew")
+    decrypt_button_modN = ttk.Button(root, text="Дешифровать (Mod N)", command=decrypt_modN_action)
+    decrypt_button_modN.grid(row=6, column=1, padx=10, pady=5, sticky="ew")
 
-# Кнопки для Mod 2
-encrypt_button_mod2 = ttk.Button(root, text="Зашифровать (Mod 2)", command=encrypt_mod2_action)
-encrypt_button_mod2.grid(row=7, column=0, padx=10, pady=5, sticky="ew")
+    # Кнопки для Mod 2
+    encrypt_button_mod2 = ttk.Button(root, text="Зашифровать (Mod 2)", command=encrypt_mod2_action)
+    encrypt_button_mod2.grid(row=7, column=0, padx=10, pady=5, sticky="ew")
 
-decrypt_button_mod2 = ttk.Button(root, text="Дешифровать (Mod 2)", command=decrypt_mod2_action)
-decrypt_button_mod2.grid(row=7, column=1, padx=10, pady=5, sticky="ew")
+    decrypt_button_mod2 = ttk.Button(root, text="Дешифровать (Mod 2)", command=decrypt_mod2_action)
+    decrypt_button_mod2.grid(row=7, column=1, padx=10, pady=5, sticky="ew")
 
-# Вывод результата
-output_label = ttk.Label(root, text="Результат:")
-output_label.grid(row=8, column=0, padx=10, pady=5, sticky="w")
+    # Вывод результата
+    output_label = ttk.Label(root, text="Результат:")
+    output_label.grid(row=8, column=0, padx=10, pady=5, sticky="w")
 
-output_text = scrolledtext.ScrolledText(root, width=90, height=25)
-output_text.grid(row=9, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
+    output_text = scrolledtext.ScrolledText(root, width=90, height=25)
+    output_text.grid(row=9, column=0, padx=10, pady=5, sticky="nsew", columnspan=2)
 
-# --- Настройка сетки ---
-root.grid_rowconfigure(9, weight=1) # Ряд с выводом растягивается
-root.grid_columnconfigure(0, weight=1) # Колонка с вводом растягивается
+    # --- Настройка сетки ---
+    root.grid_rowconfigure(9, weight=1) # Ряд с выводом растягивается
+    root.grid_columnconfigure(0, weight=1) # Колонка с вводом растягивается
 
-# Запуск главного цикла
-root.mainloop()
+    # Запуск главного цикла
+    root.mainloop()